@@ -286,6 +286,7 @@ export default function NewClaimForm() {
         other: []
     });
     const [isSubmitting, setIsSubmitting] = useState(false);
+    const [progress, setProgress] = useState("");
     const commentRef = useRef(null);
 
     // Keyboard shortcut handler
@@ -366,6 +367,17 @@ export default function NewClaimForm() {
             });
 
             const result = await api.submitClaim(data);
+            if (result.job_id && result.status !== "COMPLETED") {
+                // Queued for background processing: the details page has nothing to show until it finishes.
+                setProgress("Queued for AI review...");
+                const job = await api.waitForClaim(result.claim_id, (event) => {
+                    if (event.event === "node_started") setProgress(`Running ${event.node}...`);
+                    if (event.event === "retry_scheduled") setProgress("Retrying shortly...");
+                });
+                if (job.status === "FAILED") {
+                    throw new Error(job.error || "Claim processing failed");
+                }
+            }
             alert("Claim submitted successfully! ID: " + result.claim_id);
             navigate(`/claim-details/${result.claim_id}`);
         } catch (error) {
@@ -373,6 +385,7 @@ export default function NewClaimForm() {
             alert("Failed to submit claim: " + error.message);
         } finally {
             setIsSubmitting(false);
+            setProgress("");
         }
     };
 
@@ -519,7 +532,7 @@ export default function NewClaimForm() {
                                 opacity: isSubmitting ? 0.7 : 1
                             }}
                         >
-                            {isSubmitting ? "Processing Claim..." : "🚀 Submit Claim for AI Review"}
+                            {isSubmitting ? (progress || "Processing Claim...") : "🚀 Submit Claim for AI Review"}
                         </button>
                     </div>
                 </div>
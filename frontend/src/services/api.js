@@ -20,6 +20,83 @@ const api = {
         return response.json();
     },
 
+    /**
+     * Subscribe to live per-node progress events for a submitted claim.
+     * @param {string} claimId - The claim ID returned by submitClaim.
+     * @param {Function} onEvent - Called with each progress event object.
+     * @returns {WebSocket} The open socket; call close() to unsubscribe.
+     */
+    subscribeClaimProgress(claimId, onEvent) {
+        const wsUrl = BASE_URL.replace(/^http/, 'ws');
+        const socket = new WebSocket(`${wsUrl}/ws/claims/${encodeURIComponent(claimId)}`);
+        socket.onmessage = (message) => onEvent(JSON.parse(message.data));
+        return socket;
+    },
+
+    /**
+     * Get the background processing job of a submitted claim.
+     * @param {string} claimId - The claim ID returned by submitClaim.
+     */
+    async getClaimJob(claimId) {
+        const response = await fetch(`${BASE_URL}/claims/${encodeURIComponent(claimId)}/job`);
+        if (!response.ok) {
+            const error = await response.json();
+            throw new Error(error.detail || 'Failed to fetch claim job');
+        }
+        return response.json();
+    },
+
+    /**
+     * Wait until a queued claim has finished processing. Progress events come
+     * over the WebSocket; the job is also polled in case the socket drops.
+     * Rejects once the deadline passes or the job cannot be fetched several times in a row.
+     * @param {string} claimId - The claim ID returned by submitClaim.
+     * @param {Function} onEvent - Called with each progress event object.
+     * @param {number} pollMs - Interval between job polls.
+     * @param {number} timeoutMs - Give up after this long.
+     * @param {number} maxFailedPolls - Give up after this many consecutive failed polls.
+     * @returns {Promise<Object>} The final job status (COMPLETED or FAILED).
+     */
+    waitForClaim(claimId, onEvent = () => {}, pollMs = 3000, timeoutMs = 15 * 60 * 1000, maxFailedPolls = 5) {
+        return new Promise((resolve, reject) => {
+            let done = false;
+            let failedPolls = 0;
+            let timer = null;
+            let deadline = null;
+            let socket = null;
+            const finish = (settle, value) => {
+                if (done) return;
+                done = true;
+                clearInterval(timer);
+                clearTimeout(deadline);
+                if (socket) socket.close();
+                settle(value);
+            };
+            const check = async () => {
+                try {
+                    const job = await api.getClaimJob(claimId);
+                    failedPolls = 0;
+                    if (job.status === 'COMPLETED' || job.status === 'FAILED') finish(resolve, job);
+                } catch (error) {
+                    failedPolls += 1;
+                    console.warn('Claim job poll failed:', error);
+                    if (failedPolls >= maxFailedPolls) {
+                        finish(reject, new Error(`Could not get the status of claim ${claimId}: ${error.message}`));
+                    }
+                }
+            };
+            socket = api.subscribeClaimProgress(claimId, (event) => {
+                onEvent(event);
+                if (event.event === 'claim_completed' || event.event === 'claim_failed') check();
+            });
+            timer = setInterval(check, pollMs);
+            deadline = setTimeout(
+                () => finish(reject, new Error(`Claim ${claimId} is still processing; check its status later`)),
+                timeoutMs,
+            );
+        });
+    },
+
     /**
      * Get claimer dashboard stats and recent claims.
      * @param {string} email - Claimer's email.
@@ -43,7 +120,13 @@ const api = {
             const error = await response.json();
             throw new Error(error.detail || 'Failed to fetch claim details');
         }
-        return response.json();
+        const data = await response.json();
+        if (data.job_id) {
+            // No stored claim yet: the API answered with its background job instead.
+            if (data.status === 'FAILED') throw new Error(data.error || 'Claim processing failed');
+            throw new Error(`Claim is still being processed (${data.stage || data.status})`);
+        }
+        return data;
     },
 
     /**
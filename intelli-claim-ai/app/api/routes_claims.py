@@ -1,27 +1,36 @@
 from __future__ import annotations
 
-import os
 import uuid
 from datetime import datetime
 from typing import Any
 
 from fastapi import APIRouter, File, Form, HTTPException, Query, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from pymongo.errors import DuplicateKeyError
 
-from app.core.langgraph_builder import run_claim_workflow
+from app.core.langgraph_builder import run_claim_workflow, run_claim_workflow_async
 from app.database.claim_repository import (
+	CLAIMS_ORDER,
 	create_claim_record,
 	get_claim_by_id,
 	get_claimer_stats,
 	list_claims,
 )
+from app.database.pagination import InvalidCursorError
 from app.models.api_schemas import (
 	ClaimDetailsResponse,
+	ClaimJobStatus,
 	ClaimReasoningItem,
 	ClaimSubmitRequest,
 	ClaimSummary,
 	ClaimerDashboardResponse,
 	DashboardStats,
 )
+from app.services.claim_jobs import enqueue_claim_job, get_job, get_job_for_claim
+from app.services.document_store import document_store
+from app.services.progress_bus import progress_bus
+from app.services.uploads import UploadRejectedError, UploadSession
 
 router = APIRouter(prefix="/api/claims", tags=["claims"])
 
@@ -231,32 +240,167 @@ def _build_reasoning(doc: dict[str, Any]) -> list[ClaimReasoningItem]:
 	return items
 
 
+def _claim_exists(claim_id: str) -> HTTPException:
+	return HTTPException(status_code=409, detail=f"Claim {claim_id} already exists")
+
+
+def _stored_claim_result(claim_id: str) -> dict[str, Any]:
+	"""Job result for a claim id that is already stored, e.g. by an earlier run of the same job."""
+	doc = get_claim_by_id(claim_id) or {}
+	status = doc.get("status", "PENDING_REVIEW")
+	return {"claim_id": claim_id, "status": status, "badge": _badge_for_status(status), "already_stored": True}
+
+
 @router.post("/submit")
-def submit_claim(payload: ClaimSubmitRequest):
+async def submit_claim(payload: ClaimSubmitRequest):
 	if not payload.document_paths:
 		raise HTTPException(status_code=400, detail="document_paths is required to run the LangGraph workflow")
 
 	claim_id = payload.claim_id or _make_claim_id()
+	# claim_id is unique; fail before the workflow spends a full LLM run on a duplicate.
+	if payload.claim_id and await run_in_threadpool(get_claim_by_id, claim_id):
+		raise _claim_exists(claim_id)
 
 	try:
-		final_state = run_claim_workflow(claim_id=claim_id, document_paths=payload.document_paths)
+		final_state = await run_claim_workflow_async(claim_id=claim_id, document_paths=payload.document_paths)
 	except Exception as exc:  # noqa: BLE001
 		raise HTTPException(status_code=500, detail=f"Claim workflow failed: {exc}") from exc
 
+	try:
+		await run_in_threadpool(
+			_persist_claim,
+			{
+				"claim_type": payload.claim_type,
+				"claim_amount": payload.claim_amount,
+				"policy_number": payload.policy_number,
+				"claimer": payload.claimer.model_dump(),
+				"form_data": payload.form_data,
+				"document_paths": payload.document_paths,
+			},
+			final_state,
+			claim_id,
+		)
+	except DuplicateKeyError as exc:
+		raise _claim_exists(claim_id) from exc
+
+	return _build_submit_response(claim_id, final_state)
+
+
+def _finalize_upload_claim(claim_id: str, final_state: dict[str, Any], form: dict[str, Any]) -> dict[str, Any]:
+	saved_paths = form["document_paths"]
+	claim_type = form["claim_type"]
+	claimer_phone = form.get("claimer_phone")
+
+	inferred = _infer_claim_data_from_node1(final_state.get("node1_output", {}))
+	final_policy_number = inferred.get("policy_number") or "UNKNOWN"
+
+	# Robust float parsing
+	raw_amount = inferred.get("claim_amount")
+	final_claim_amount = 0.0
+	if raw_amount:
+		try:
+			# Remove non-numeric chars except decimal
+			if isinstance(raw_amount, str):
+				clean_amt = "".join(c for c in raw_amount if c.isdigit() or c == ".")
+				final_claim_amount = float(clean_amt) if clean_amt else 0.0
+			else:
+				final_claim_amount = float(raw_amount)
+		except (ValueError, TypeError):
+			final_claim_amount = 0.0
+
+	# Extracted data takes precedence over login/form data as per user request
+	final_claimer_name = inferred.get("claimer_name") or form.get("claimer_name") or "Unknown Claimer"
+	final_claimer_address = inferred.get("claimer_address") or form.get("claimer_address")
+	final_claimer_email = inferred.get("claimer_email") or form.get("claimer_email") or "unknown@example.com"
+
+	# Metadata exposure for frontend
+	extraction_metadata = {
+		"field_confidence": final_state.get("node1_output", {}).get("field_confidence"),
+		"policy_match_confidence": final_state.get("node3_output", {}).get("policy_match_confidence"),
+		"document_consistency_score": final_state.get("node2_output", {}).get("consistency_score")
+	}
+
+	# Prepare final form_data including metadata for gauges
+	final_form_data = {
+		"auto_extracted": True,
+		"node1_output": final_state.get("node1_output", {}),
+		**extraction_metadata
+	}
+
 	_persist_claim(
 		{
-			"claim_type": payload.claim_type,
-			"claim_amount": payload.claim_amount,
-			"policy_number": payload.policy_number,
-			"claimer": payload.claimer.model_dump(),
-			"form_data": payload.form_data,
-			"document_paths": payload.document_paths,
+			"claim_type": claim_type,
+			"claim_amount": final_claim_amount,
+			"policy_number": final_policy_number,
+			"claimer": {
+				"name": final_claimer_name,
+				"email": final_claimer_email,
+				"phone": claimer_phone or inferred.get("claimer_phone"),
+				"address": final_claimer_address,
+				"aadhaar_id": inferred.get("aadhaar_id"),
+			},
+			"medical": {
+				"hospital": inferred.get("hospital_name"),
+				"admission_date": inferred.get("admission_date"),
+				"diagnosis": inferred.get("diagnosis"),
+			},
+			"form_data": final_form_data,
+			"document_paths": saved_paths,
 		},
 		final_state,
 		claim_id,
 	)
 
-	return _build_submit_response(claim_id, final_state)
+	response = _build_submit_response(claim_id, final_state)
+	response["extracted_claim_data"] = {
+		"claim_type": claim_type,
+		"claim_amount": final_claim_amount,
+		"policy_number": final_policy_number,
+		"claimer": {
+			"name": final_claimer_name,
+			"email": final_claimer_email,
+			"phone": claimer_phone,
+			"address": final_claimer_address,
+		},
+		"document_paths": saved_paths,
+	}
+	return response
+
+
+def process_claim_job(job: dict[str, Any], on_event) -> dict[str, Any]:
+	"""Background worker entry point for claims queued by /submit-upload."""
+	form = job["payload"]
+	# A re-run after a crash or lease expiry may find the claim stored by the earlier run.
+	if get_claim_by_id(job["claim_id"]):
+		return _stored_claim_result(job["claim_id"])
+	final_state = run_claim_workflow(
+		claim_id=job["claim_id"],
+		document_paths=form["document_paths"],
+		on_event=on_event,
+	)
+	try:
+		return _finalize_upload_claim(job["claim_id"], final_state, form)
+	except DuplicateKeyError:
+		return _stored_claim_result(job["claim_id"])
+
+
+def _release_uploads(claim_id: str, shas: list[str]) -> None:
+	"""Drop the upload refs one failed request added, unless a stored claim already uses them."""
+	if get_claim_by_id(claim_id):
+		return
+	document_store.release_refs(claim_id, shas)
+
+
+def release_failed_claim(job: dict[str, Any]) -> None:
+	_release_uploads(job["claim_id"], job["payload"].get("upload_refs", []))
+
+
+def _job_response(job: dict[str, Any]) -> JSONResponse:
+	in_progress = job["status"] in {"QUEUED", "RUNNING"}
+	return JSONResponse(
+		status_code=202 if in_progress else 200,
+		content=ClaimJobStatus(**job).model_dump(mode="json"),
+	)
 
 
 @router.post("/submit-upload")
@@ -268,6 +412,7 @@ async def submit_claim_with_upload(
 	claimer_address: str | None = Form(default=None),
 	claimer_name: str | None = Form(default=None),
 	claim_id: str | None = Form(default=None),
+	wait: bool = Query(default=False, description="Process inline instead of queueing a background job"),
 ):
 	if not files:
 		raise HTTPException(status_code=400, detail="At least one document is required")
@@ -276,107 +421,60 @@ async def submit_claim_with_upload(
 	if claim_type not in allowed_claim_types:
 		raise HTTPException(status_code=400, detail="claim_type must be one of Health, Motor, Property")
 
-	upload_root = os.path.join("temp_images", "uploads")
-	os.makedirs(upload_root, exist_ok=True)
-
-	saved_paths: list[str] = []
-	for file in files:
-		if not file.filename:
-			continue
-		safe_name = os.path.basename(file.filename)
-		ext = os.path.splitext(safe_name)[1].lower()
-		if ext not in {".pdf", ".png", ".jpg", ".jpeg", ".webp"}:
-			raise HTTPException(status_code=400, detail=f"Unsupported file type for {safe_name}")
-
-		unique_name = f"{datetime.utcnow().strftime('%Y%m%d%H%M%S')}_{uuid.uuid4().hex[:8]}_{safe_name}"
-		dest = os.path.join(upload_root, unique_name)
-		content = await file.read()
-		with open(dest, "wb") as out:
-			out.write(content)
-		saved_paths.append(dest)
-
+	if claim_id and not wait:
+		# Resubmitting a claim id that is already queued or done is a no-op.
+		existing = await run_in_threadpool(get_job_for_claim, claim_id)
+		if existing and existing["status"] != "FAILED":
+			return _job_response(existing)
+	if claim_id and await run_in_threadpool(get_claim_by_id, claim_id):
+		raise _claim_exists(claim_id)
+
+	# Streams each file to disk in chunks; identical content reuses the stored copy.
+	# Blobs of a rejected request stay unreferenced and are reclaimed by the compactor.
+	session = UploadSession()
+	try:
+		for file in files:
+			if not file.filename:
+				continue
+			await session.store(file)
+	except UploadRejectedError as exc:
+		raise HTTPException(status_code=exc.status_code, detail=exc.detail) from exc
+
+	saved_paths = [stored.path for stored in session.stored]
 	if not saved_paths:
 		raise HTTPException(status_code=400, detail="No valid files were uploaded")
 
 	resolved_claim_id = claim_id or _make_claim_id()
-	try:
-		final_state = run_claim_workflow(claim_id=resolved_claim_id, document_paths=saved_paths)
-
-		inferred = _infer_claim_data_from_node1(final_state.get("node1_output", {}))
-		final_policy_number = inferred.get("policy_number") or "UNKNOWN"
-		
-		# Robust float parsing
-		raw_amount = inferred.get("claim_amount")
-		final_claim_amount = 0.0
-		if raw_amount:
-			try:
-				# Remove non-numeric chars except decimal
-				if isinstance(raw_amount, str):
-					clean_amt = "".join(c for c in raw_amount if c.isdigit() or c == ".")
-					final_claim_amount = float(clean_amt) if clean_amt else 0.0
-				else:
-					final_claim_amount = float(raw_amount)
-			except (ValueError, TypeError):
-				final_claim_amount = 0.0
-
-		# Extracted data takes precedence over login/form data as per user request
-		final_claimer_name = inferred.get("claimer_name") or claimer_name or "Unknown Claimer"
-		final_claimer_address = inferred.get("claimer_address") or claimer_address
-		final_claimer_email = inferred.get("claimer_email") or claimer_email or "unknown@example.com"
-		
-		# Metadata exposure for frontend
-		extraction_metadata = {
-			"field_confidence": final_state.get("node1_output", {}).get("field_confidence"),
-			"policy_match_confidence": final_state.get("node3_output", {}).get("policy_match_confidence"),
-			"document_consistency_score": final_state.get("node2_output", {}).get("consistency_score")
-		}
+	added_refs = await run_in_threadpool(document_store.add_refs, resolved_claim_id, session.refs())
+	form = {
+		"document_paths": saved_paths,
+		"upload_refs": added_refs,
+		"claim_type": claim_type,
+		"claimer_email": claimer_email,
+		"claimer_phone": claimer_phone,
+		"claimer_address": claimer_address,
+		"claimer_name": claimer_name,
+	}
 
-		# Prepare final form_data including metadata for gauges
-		final_form_data = {
-			"auto_extracted": True,
-			"node1_output": final_state.get("node1_output", {}),
-			**extraction_metadata
-		}
+	if not wait:
+		job = await run_in_threadpool(enqueue_claim_job, resolved_claim_id, form)
+		return _job_response(job)
 
-		_persist_claim(
-			{
-				"claim_type": claim_type,
-				"claim_amount": final_claim_amount,
-				"policy_number": final_policy_number,
-				"claimer": {
-					"name": final_claimer_name,
-					"email": final_claimer_email,
-					"phone": claimer_phone or inferred.get("claimer_phone"),
-					"address": final_claimer_address,
-					"aadhaar_id": inferred.get("aadhaar_id"),
-				},
-				"medical": {
-					"hospital": inferred.get("hospital_name"),
-					"admission_date": inferred.get("admission_date"),
-					"diagnosis": inferred.get("diagnosis"),
-				},
-				"form_data": final_form_data,
-				"document_paths": saved_paths,
-			},
-			final_state,
-			resolved_claim_id,
+	try:
+		final_state = await run_claim_workflow_async(
+			claim_id=resolved_claim_id,
+			document_paths=saved_paths,
+			on_event=lambda event: progress_bus.publish(resolved_claim_id, event),
 		)
-
-		response = _build_submit_response(resolved_claim_id, final_state)
-		response["extracted_claim_data"] = {
-			"claim_type": claim_type,
-			"claim_amount": final_claim_amount,
-			"policy_number": final_policy_number,
-			"claimer": {
-				"name": final_claimer_name,
-				"email": final_claimer_email,
-				"phone": claimer_phone,
-				"address": final_claimer_address,
-			},
-			"document_paths": saved_paths,
-		}
+		response = await run_in_threadpool(_finalize_upload_claim, resolved_claim_id, final_state, form)
+		progress_bus.publish(resolved_claim_id, {"event": "claim_completed", "status": response["status"]})
 		return response
+	except DuplicateKeyError as exc:
+		progress_bus.publish(resolved_claim_id, {"event": "claim_failed", "error": "claim already exists"})
+		raise _claim_exists(resolved_claim_id) from exc
 	except Exception as exc:  # noqa: BLE001
+		progress_bus.publish(resolved_claim_id, {"event": "claim_failed", "error": str(exc)})
+		await run_in_threadpool(_release_uploads, resolved_claim_id, added_refs)
 		import traceback
 		print(f"CRITICAL ERROR in submit-upload: {exc}")
 		traceback.print_exc()
@@ -406,25 +504,51 @@ def get_claims(
 	claim_type: str | None = Query(default=None),
 	search: str | None = Query(default=None),
 	limit: int = Query(default=50, ge=1, le=200),
+	cursor: str | None = Query(default=None, description="next_cursor from the previous page"),
 ):
-	rows = list_claims(
-		claimer_email=claimer_email,
-		status=status,
-		claim_type=claim_type,
-		search=search,
-		limit=limit,
-	)
+	try:
+		rows = list_claims(
+			claimer_email=claimer_email,
+			status=status,
+			claim_type=claim_type,
+			search=search,
+			limit=limit,
+			cursor=cursor,
+		)
+	except InvalidCursorError as exc:
+		raise HTTPException(status_code=400, detail=str(exc)) from exc
 	return {
 		"count": len(rows),
 		"claims": [_to_summary(row).model_dump() for row in rows],
+		"next_cursor": None if search else CLAIMS_ORDER.next_cursor(rows, limit),
 	}
 
 
+@router.get("/jobs/{job_id}", response_model=ClaimJobStatus)
+def get_claim_job(job_id: str):
+	job = get_job(job_id)
+	if not job:
+		raise HTTPException(status_code=404, detail="Job not found")
+	return ClaimJobStatus(**job)
+
+
+@router.get("/{claim_id}/job", response_model=ClaimJobStatus)
+def get_claim_job_for_claim(claim_id: str):
+	job = get_job_for_claim(claim_id)
+	if not job:
+		raise HTTPException(status_code=404, detail="Job not found")
+	return ClaimJobStatus(**job)
+
+
 @router.get("/{claim_id}", response_model=ClaimDetailsResponse)
 def get_claim_details(claim_id: str):
 	doc = get_claim_by_id(claim_id)
 	if not doc:
-		raise HTTPException(status_code=404, detail="Claim not found")
+		# A claim still in the background queue has no details yet; report its stage instead.
+		job = get_job_for_claim(claim_id)
+		if not job:
+			raise HTTPException(status_code=404, detail="Claim not found")
+		return _job_response(job)
 
 	claimer = doc.get("claimer") or {}
 	medical = doc.get("medical") or {}
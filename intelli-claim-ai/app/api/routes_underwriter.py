@@ -1,20 +1,24 @@
 from __future__ import annotations
 
-from collections import Counter
 from typing import Any
 
 from fastapi import APIRouter, HTTPException, Query
 
+from app.core.langgraph_builder import reload_claim_workflow
 from app.database.claim_repository import (
+	REVIEWER_HISTORY_ORDER,
+	REVIEWER_QUEUE_ORDER,
 	get_admin_metrics,
 	get_claim_by_id,
 	get_claimer_stats,
+	get_metrics_trend,
 	list_claims,
 	list_processed_claims,
 	list_reviewer_queue,
 	search_user_claims,
 	update_claim_review,
 )
+from app.database.pagination import InvalidCursorError
 from app.models.api_schemas import (
 	AdminDashboardResponse,
 	ClaimSummary,
@@ -59,17 +63,31 @@ def _to_summary(row: dict[str, Any]) -> ClaimSummary:
 def get_reviewer_queue(
 	fraud_threshold: float = Query(default=0.6, ge=0.0, le=1.0),
 	limit: int = Query(default=50, ge=1, le=200),
+	cursor: str | None = Query(default=None, description="next_cursor from the previous page"),
 ):
-	rows = list_reviewer_queue(fraud_threshold=fraud_threshold, limit=limit)
-	return ReviewerQueueResponse(claims=[_to_summary(row) for row in rows])
+	try:
+		rows = list_reviewer_queue(fraud_threshold=fraud_threshold, limit=limit, cursor=cursor)
+	except InvalidCursorError as exc:
+		raise HTTPException(status_code=400, detail=str(exc)) from exc
+	return ReviewerQueueResponse(
+		claims=[_to_summary(row) for row in rows],
+		next_cursor=REVIEWER_QUEUE_ORDER.next_cursor(rows, limit),
+	)
 
 
 @router.get("/reviewer/history")
-def get_reviewer_history(limit: int = Query(default=100, ge=1, le=300)):
-	rows = list_processed_claims(limit=limit)
+def get_reviewer_history(
+	limit: int = Query(default=100, ge=1, le=300),
+	cursor: str | None = Query(default=None, description="next_cursor from the previous page"),
+):
+	try:
+		rows = list_processed_claims(limit=limit, cursor=cursor)
+	except InvalidCursorError as exc:
+		raise HTTPException(status_code=400, detail=str(exc)) from exc
 	return {
 		"count": len(rows),
 		"claims": [_to_summary(row).model_dump() for row in rows],
+		"next_cursor": REVIEWER_HISTORY_ORDER.next_cursor(rows, limit),
 	}
 
 
@@ -132,13 +150,12 @@ def search_user(query: str = Query(..., min_length=1), limit: int = Query(defaul
 @router.get("/admin/dashboard", response_model=AdminDashboardResponse)
 def get_admin_dashboard():
 	metrics = get_admin_metrics()
-	claims = list_claims(limit=1000)
 
 	total = int(metrics.get("total_claims", 0))
 	approved = int(metrics.get("approved", 0))
 	flagged = int(metrics.get("flagged", 0))
 
-	by_type = Counter((row.get("claim_type") or "Unknown") for row in claims)
+	by_type = metrics.get("by_type", {})
 	claims_by_type = {
 		"Health": 0.0,
 		"Motor": 0.0,
@@ -162,6 +179,11 @@ def get_admin_dashboard():
 	)
 
 
+@router.get("/admin/metrics/trend")
+def get_admin_metrics_trend(days: int = Query(default=30, ge=1, le=366)):
+	return {"days": get_metrics_trend(days)}
+
+
 @router.get("/admin/users/activity")
 def get_user_activity(limit: int = Query(default=100, ge=1, le=500)):
 	rows = list_claims(limit=limit)
@@ -205,3 +227,8 @@ def get_user_activity(limit: int = Query(default=100, ge=1, le=500)):
 	activity.sort(key=lambda item: item["claims"], reverse=True)
 	return {"count": len(activity), "users": activity}
 
+
+@router.post("/admin/workflow/reload")
+def reload_workflow():
+	workflow = reload_claim_workflow()
+	return {"workflow_version": workflow.version, "compiled_at": workflow.compiled_at}
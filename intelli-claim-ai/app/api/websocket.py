@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import asyncio
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+
+from app.services.progress_bus import TERMINAL_EVENTS, progress_bus
+
+router = APIRouter(prefix="/api/ws", tags=["progress"])
+
+
+async def _wait_for_disconnect(websocket: WebSocket) -> None:
+	# Clients never send anything meaningful; this only notices them leaving.
+	try:
+		while True:
+			await websocket.receive_text()
+	except WebSocketDisconnect:
+		return
+
+
+@router.websocket("/claims/{claim_id}")
+async def claim_progress(websocket: WebSocket, claim_id: str):
+	"""
+	Streams node_started / node_finished events (with durations and a short
+	output summary) for a claim until it completes or fails.
+	"""
+	await websocket.accept()
+	queue = progress_bus.subscribe(claim_id)
+	disconnected = asyncio.create_task(_wait_for_disconnect(websocket))
+	try:
+		while True:
+			next_event = asyncio.create_task(queue.get())
+			done, _ = await asyncio.wait({next_event, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+			if next_event not in done:
+				next_event.cancel()
+				return
+
+			event = next_event.result()
+			await websocket.send_json(event)
+			if event.get("event") in TERMINAL_EVENTS:
+				await websocket.close()
+				return
+	except WebSocketDisconnect:
+		return
+	finally:
+		disconnected.cancel()
+		progress_bus.unsubscribe(claim_id, queue)
@@ -0,0 +1,63 @@
+import asyncio
+import contextvars
+import functools
+import os
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+
+OCR_WORKERS_ENV = "CLAIM_OCR_WORKERS"
+IO_WORKERS_ENV = "CLAIM_IO_WORKERS"
+MAX_CONCURRENT_CLAIMS_ENV = "CLAIM_MAX_CONCURRENCY"
+
+
+def _workers_from_env(env_name: str, default: int) -> int:
+	try:
+		return max(int(os.getenv(env_name, default)), 1)
+	except ValueError:
+		return default
+
+
+# OCR/rasterization is CPU bound, so it gets a pool sized to the machine.
+# LLM and Mongo calls mostly wait on the network and can use a wider pool.
+_executors = {
+	"ocr": ThreadPoolExecutor(
+		max_workers=_workers_from_env(OCR_WORKERS_ENV, os.cpu_count() or 2),
+		thread_name_prefix="claim-ocr",
+	),
+	"io": ThreadPoolExecutor(
+		max_workers=_workers_from_env(IO_WORKERS_ENV, 16),
+		thread_name_prefix="claim-io",
+	),
+}
+
+
+def get_executor(pool: str) -> ThreadPoolExecutor:
+	return _executors[pool]
+
+
+async def run_blocking(pool: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+	"""Run a blocking callable on a bounded pool without stalling the event loop."""
+	loop = asyncio.get_running_loop()
+	# Carry contextvars (tracing, request-scoped state) into the worker thread.
+	context = contextvars.copy_context()
+	call = functools.partial(context.run, fn, *args, **kwargs)
+	return await loop.run_in_executor(_executors[pool], call)
+
+
+_claim_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+
+def claim_slots() -> asyncio.Semaphore:
+	"""
+	The semaphore capping claims in flight on the running loop. It is created
+	on first use in each loop: an asyncio primitive binds to the loop that first
+	waits on it, so one made at import time breaks when another loop (a test,
+	a CLI run, a restarted server) uses it.
+	"""
+	loop = asyncio.get_running_loop()
+	slots = _claim_slots.get(loop)
+	if slots is None:
+		slots = _claim_slots[loop] = asyncio.Semaphore(_workers_from_env(MAX_CONCURRENT_CLAIMS_ENV, 8))
+	return slots
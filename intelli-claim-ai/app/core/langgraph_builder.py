@@ -1,24 +1,28 @@
+import inspect
 import os
-from typing import Any
+import time
+from typing import Any, Callable
 
 from langchain_core.runnables import RunnableConfig
 from langgraph.graph import END, START, StateGraph
 from langsmith import traceable
 
+from app.core.executors import claim_slots, run_blocking
 from app.core.state_schema import ClaimGraphState
+from app.core.workflow_registry import CompiledWorkflow, WorkflowRegistry
 from app.nodes.node1_extraction.extractor import extract_documents
 from app.nodes.node2_cross_validation.validator import cross_validate
 from app.nodes.node3_policy_coverage.policy_agent import (
 	extract_claim_context,
 	verify_policy_coverage,
 )
-from app.nodes.node3_policy_coverage.policy_fetcher import fetch_policy
 from app.nodes.node4_fraud_detection.fraud_agent import fraud_detection
 from app.nodes.node5_predictive.predictive_agent import predictive_analysis
 from app.nodes.node6_explanation.explanation_generator import generate_explanation
 from app.nodes.node7_decision.decision_agent import make_claim_decision
 from app.nodes.node8_subrogation.subrogation_agent import analyze_subrogation
 from app.services.hitl_service import store_high_risk_claim
+from app.services.policy_cache import policy_request_scope, resolve_policy
 
 
 os.environ.setdefault("LANGSMITH_PROJECT", "insurance-claim-ai")
@@ -46,7 +50,8 @@ def node3_policy_coverage(state: ClaimGraphState):
 def node4_fraud_detection(state: ClaimGraphState):
 	context = extract_claim_context(state["node1_output"])
 	policy_number = context.get("policy_number")
-	policy = fetch_policy(policy_number) if policy_number else {}
+	# Same claim-scoped lookup as node3, which runs in parallel: one MongoDB read between them.
+	policy = resolve_policy(policy_number) if policy_number else {}
 	return {"node4_output": fraud_detection(state["node1_output"], policy or {})}
 
 
@@ -113,29 +118,71 @@ def automated_final_decision(state: ClaimGraphState):
 	return {}
 
 
+PARALLEL_BRANCHES = (
+	"node2_cross_validation",
+	"node3_policy_coverage",
+	"node4_fraud_detection",
+	"node8_subrogation",
+)
+
+
+# Which bounded executor each node runs on in the async graph.
+NODE_POOLS = {
+	"node1_document_ingestion": "ocr",
+	"node2_cross_validation": "io",
+	"node3_policy_coverage": "io",
+	"node4_fraud_detection": "io",
+	"node5_predictive": "io",
+	"node6_explanation": "io",
+	"node8_subrogation": "io",
+	"node7_decision": "io",
+	"hitl_storage": "io",
+	"automated_final_decision": "io",
+}
+
+
+def _offload(node, pool: str):
+	"""Wrap a blocking node so the async graph awaits it on a bounded executor."""
+	accepts_config = "config" in inspect.signature(node).parameters
+
+	async def _run(state: ClaimGraphState, config: RunnableConfig):
+		if accepts_config:
+			return await run_blocking(pool, node, state, config=config)
+		return await run_blocking(pool, node, state)
+
+	_run.__name__ = getattr(node, "__name__", "node")
+	return _run
+
+
 @traceable(name="build_claim_workflow")
-def build_claim_workflow():
+def build_claim_workflow(asynchronous: bool = False):
 	graph = StateGraph(ClaimGraphState)
 
-	graph.add_node("node1_document_ingestion", node1_document_ingestion)
-	graph.add_node("node2_cross_validation", node2_cross_validation)
-	graph.add_node("node3_policy_coverage", node3_policy_coverage)
-	graph.add_node("node4_fraud_detection", node4_fraud_detection)
-	graph.add_node("node5_predictive", node5_predictive)
-	graph.add_node("node6_explanation", node6_explanation)
-	graph.add_node("node8_subrogation", node8_subrogation)
-	graph.add_node("node7_decision", node7_decision)
-	graph.add_node("hitl_storage", hitl_storage)
-	graph.add_node("automated_final_decision", automated_final_decision)
+	nodes = {
+		"node1_document_ingestion": node1_document_ingestion,
+		"node2_cross_validation": node2_cross_validation,
+		"node3_policy_coverage": node3_policy_coverage,
+		"node4_fraud_detection": node4_fraud_detection,
+		"node5_predictive": node5_predictive,
+		"node6_explanation": node6_explanation,
+		"node8_subrogation": node8_subrogation,
+		"node7_decision": node7_decision,
+		"hitl_storage": hitl_storage,
+		"automated_final_decision": automated_final_decision,
+	}
+	for name, node in nodes.items():
+		graph.add_node(name, _offload(node, NODE_POOLS[name]) if asynchronous else node)
 
 	graph.add_edge(START, "node1_document_ingestion")
-	graph.add_edge("node1_document_ingestion", "node2_cross_validation")
-	graph.add_edge("node2_cross_validation", "node3_policy_coverage")
-	graph.add_edge("node3_policy_coverage", "node4_fraud_detection")
-	graph.add_edge("node4_fraud_detection", "node5_predictive")
+
+	# Nodes 2, 3, 4 and 8 only read node1_output, so they fan out in parallel
+	# and the claim waits on the slowest branch instead of the sum of all four.
+	for branch in PARALLEL_BRANCHES:
+		graph.add_edge("node1_document_ingestion", branch)
+
+	graph.add_edge(["node2_cross_validation", "node3_policy_coverage", "node4_fraud_detection"], "node5_predictive")
 	graph.add_edge("node5_predictive", "node6_explanation")
-	graph.add_edge("node6_explanation", "node8_subrogation")
-	graph.add_edge("node8_subrogation", "node7_decision")
+	graph.add_edge(["node6_explanation", "node8_subrogation"], "node7_decision")
 
 	graph.add_conditional_edges(
 		"node7_decision",
@@ -152,11 +199,27 @@ def build_claim_workflow():
 	return graph.compile()
 
 
-@traceable(name="run_claim_workflow")
-def run_claim_workflow(claim_id: str, document_paths: list[str]):
-	app = build_claim_workflow()
+def _compile_workflows() -> tuple[Any, Any]:
+	return build_claim_workflow(), build_claim_workflow(asynchronous=True)
+
+
+_registry = WorkflowRegistry(_compile_workflows)
 
-	initial_state: ClaimGraphState = {
+
+def get_claim_workflow() -> CompiledWorkflow:
+	return _registry.get()
+
+
+def reload_claim_workflow() -> CompiledWorkflow:
+	return _registry.reload()
+
+
+def warm_up_claim_workflow() -> int:
+	return get_claim_workflow().version
+
+
+def _initial_state(claim_id: str) -> ClaimGraphState:
+	return {
 		"claim_id": claim_id,
 		"node1_output": {},
 		"node2_output": {},
@@ -168,7 +231,92 @@ def run_claim_workflow(claim_id: str, document_paths: list[str]):
 		"node8_output": {},
 	}
 
-	return app.invoke(
-		initial_state,
-		config={"configurable": {"document_paths": document_paths}},
-	)
+
+NodeEventHandler = Callable[[dict[str, Any]], None]
+
+
+def _summarize_result(result: Any) -> dict[str, Any]:
+	"""Small, JSON-friendly view of a node update for progress events."""
+	summary: dict[str, Any] = {}
+	for key, output in (result or {}).items():
+		if not isinstance(output, dict):
+			continue
+		fields: dict[str, Any] = {}
+		for name, value in output.items():
+			if isinstance(value, (bool, int, float)) or value is None:
+				fields[name] = value
+			elif isinstance(value, str) and len(value) <= 120:
+				fields[name] = value
+			elif isinstance(value, (list, dict)):
+				fields[f"{name}_count"] = len(value)
+			if len(fields) >= 8:
+				break
+		summary[key] = fields
+	return summary
+
+
+def _node_event(task: dict[str, Any], started_at: dict[str, float]) -> dict[str, Any]:
+	"""Turn a LangGraph "tasks" stream chunk into a node started/finished event."""
+	if "result" not in task:
+		started_at[task["id"]] = time.perf_counter()
+		return {"event": "node_started", "node": task["name"]}
+
+	started = started_at.pop(task["id"], None)
+	event = {
+		"event": "node_failed" if task.get("error") else "node_finished",
+		"node": task["name"],
+		"duration_ms": round((time.perf_counter() - started) * 1000, 1) if started else None,
+	}
+	if task.get("error"):
+		event["error"] = str(task["error"])
+	else:
+		event["summary"] = _summarize_result(task.get("result"))
+	return event
+
+
+@traceable(name="run_claim_workflow")
+def run_claim_workflow(
+	claim_id: str,
+	document_paths: list[str],
+	on_event: NodeEventHandler | None = None,
+):
+	app = get_claim_workflow().graph
+	config = {"configurable": {"document_paths": document_paths}}
+
+	with policy_request_scope():
+		if on_event is None:
+			return app.invoke(_initial_state(claim_id), config=config)
+
+		final_state = None
+		started_at: dict[str, float] = {}
+		for mode, chunk in app.stream(_initial_state(claim_id), config=config, stream_mode=["tasks", "values"]):
+			if mode == "values":
+				final_state = chunk
+			else:
+				on_event(_node_event(chunk, started_at))
+		return final_state
+
+
+@traceable(name="run_claim_workflow_async")
+async def run_claim_workflow_async(
+	claim_id: str,
+	document_paths: list[str],
+	on_event: NodeEventHandler | None = None,
+):
+	app = get_claim_workflow().async_graph
+	config = {"configurable": {"document_paths": document_paths}}
+
+	# Cap claims in flight per worker; blocking node work is bounded by the executors.
+	async with claim_slots():
+		with policy_request_scope():
+			if on_event is None:
+				return await app.ainvoke(_initial_state(claim_id), config=config)
+
+			final_state = None
+			started_at: dict[str, float] = {}
+			async for mode, chunk in app.astream(_initial_state(claim_id), config=config, stream_mode=["tasks", "values"]):
+				if mode == "values":
+					final_state = chunk
+				else:
+					on_event(_node_event(chunk, started_at))
+			return final_state
@@ -1,13 +1,25 @@
-from typing import Any, TypedDict
+from typing import Annotated, Any, TypedDict
+
+
+def merge_node_output(current: dict[str, Any], update: dict[str, Any]) -> dict[str, Any]:
+	"""Fan-in reducer: parallel branches merge into a node output instead of racing to overwrite it."""
+	if not current:
+		return update or {}
+	if not update:
+		return current
+	return {**current, **update}
+
+
+NodeOutput = Annotated[dict[str, Any], merge_node_output]
 
 
 class ClaimGraphState(TypedDict):
 	claim_id: str
-	node1_output: dict[str, Any]
-	node2_output: dict[str, Any]
-	node3_output: dict[str, Any]
-	node4_output: dict[str, Any]
-	node5_output: dict[str, Any]
-	node6_output: dict[str, Any]
-	node7_output: dict[str, Any]
-	node8_output: dict[str, Any]
+	node1_output: NodeOutput
+	node2_output: NodeOutput
+	node3_output: NodeOutput
+	node4_output: NodeOutput
+	node5_output: NodeOutput
+	node6_output: NodeOutput
+	node7_output: NodeOutput
+	node8_output: NodeOutput
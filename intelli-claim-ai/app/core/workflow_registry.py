@@ -0,0 +1,41 @@
+import threading
+import time
+from typing import Any, Callable, NamedTuple
+
+
+class CompiledWorkflow(NamedTuple):
+	version: int
+	graph: Any
+	async_graph: Any
+	compiled_at: float
+
+
+class WorkflowRegistry:
+	"""Process-wide holder for the compiled claim graph.
+
+	Readers take a single attribute snapshot, so a reload swaps the
+	(version, graph) pair atomically while in-flight claims keep running
+	on the graph they started with.
+	"""
+
+	def __init__(self, builder: Callable[[], tuple[Any, Any]]):
+		self._builder = builder
+		self._lock = threading.Lock()
+		self._current: CompiledWorkflow | None = None
+
+	def get(self) -> CompiledWorkflow:
+		current = self._current
+		if current is not None:
+			return current
+		with self._lock:
+			if self._current is None:
+				self._current = CompiledWorkflow(1, *self._builder(), time.time())
+			return self._current
+
+	def reload(self) -> CompiledWorkflow:
+		# Compile outside the lock so readers are never blocked on graph construction.
+		graphs = self._builder()
+		with self._lock:
+			version = self._current.version + 1 if self._current else 1
+			self._current = CompiledWorkflow(version, *graphs, time.time())
+			return self._current
@@ -3,7 +3,18 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Any
 
+from pymongo import ReturnDocument
+
 from app.database.mongo import claims_collection
+from app.database.pagination import InvalidCursorError, KeysetOrder
+from app.database.projections import SUMMARY_PROJECTION, ClaimSummaryRow
+from app.services.claim_metrics import claim_metrics
+from app.services.claim_search import search_claims, search_fields
+
+
+CLAIMS_ORDER = KeysetOrder("claims", "created_at")
+REVIEWER_QUEUE_ORDER = KeysetOrder("reviewer_queue", "fraud_score")
+REVIEWER_HISTORY_ORDER = KeysetOrder("reviewer_history", "updated_at")
 
 
 def _utcnow() -> datetime:
@@ -14,7 +25,9 @@ def create_claim_record(claim_document: dict[str, Any]) -> str:
 	now = _utcnow()
 	claim_document.setdefault("created_at", now)
 	claim_document.setdefault("updated_at", now)
+	claim_document.update(search_fields(claim_document))
 	result = claims_collection.insert_one(claim_document)
+	claim_metrics.record_created(claim_document)
 	return str(result.inserted_id)
 
 
@@ -29,7 +42,11 @@ def list_claims(
 	claim_type: str | None = None,
 	search: str | None = None,
 	limit: int = 50,
-) -> list[dict[str, Any]]:
+	cursor: str | None = None,
+) -> list[ClaimSummaryRow]:
+	"""Newest first, a page at a time from ``cursor``. Searches are ranked and return a single page."""
+	if search and cursor:
+		raise InvalidCursorError("cursor cannot be combined with search")
 	query: dict[str, Any] = {}
 
 	if claimer_email:
@@ -39,42 +56,37 @@ def list_claims(
 	if claim_type:
 		query["claim_type"] = claim_type
 	if search:
-		query["$or"] = [
-			{"claim_id": {"$regex": search, "$options": "i"}},
-			{"claim_type": {"$regex": search, "$options": "i"}},
-			{"claimer.name": {"$regex": search, "$options": "i"}},
-			{"claimer.email": {"$regex": search, "$options": "i"}},
-		]
-
-	cursor = claims_collection.find(query, {"_id": 0}).sort("created_at", -1).limit(limit)
-	return list(cursor)
-
-
-def list_reviewer_queue(fraud_threshold: float = 0.6, limit: int = 50) -> list[dict[str, Any]]:
-	cursor = (
-		claims_collection.find(
-			{
-				"status": {"$in": ["PENDING_REVIEW", "FLAGGED_FOR_REVIEW", "ESCALATED_FRAUD_REVIEW"]},
-				"fraud_score": {"$gte": fraud_threshold},
-			},
-			{"_id": 0},
-		)
-		.sort("fraud_score", -1)
+		return search_claims(claims_collection, search, filters=query, limit=limit, projection=SUMMARY_PROJECTION)
+
+	rows = (
+		claims_collection.find(CLAIMS_ORDER.filter(query, cursor), SUMMARY_PROJECTION)
+		.sort(CLAIMS_ORDER.sort)
+		.limit(limit)
+	)
+	return list(rows)
+
+
+def list_reviewer_queue(fraud_threshold: float = 0.6, limit: int = 50, cursor: str | None = None) -> list[ClaimSummaryRow]:
+	query = {
+		"status": {"$in": ["PENDING_REVIEW", "FLAGGED_FOR_REVIEW", "ESCALATED_FRAUD_REVIEW"]},
+		"fraud_score": {"$gte": fraud_threshold},
+	}
+	rows = (
+		claims_collection.find(REVIEWER_QUEUE_ORDER.filter(query, cursor), SUMMARY_PROJECTION)
+		.sort(REVIEWER_QUEUE_ORDER.sort)
 		.limit(limit)
 	)
-	return list(cursor)
+	return list(rows)
 
 
-def list_processed_claims(limit: int = 100) -> list[dict[str, Any]]:
-	cursor = (
-		claims_collection.find(
-			{"status": {"$in": ["APPROVED", "REJECTED", "REQUESTED_MORE_INFO"]}},
-			{"_id": 0},
-		)
-		.sort("updated_at", -1)
+def list_processed_claims(limit: int = 100, cursor: str | None = None) -> list[ClaimSummaryRow]:
+	query = {"status": {"$in": ["APPROVED", "REJECTED", "REQUESTED_MORE_INFO"]}}
+	rows = (
+		claims_collection.find(REVIEWER_HISTORY_ORDER.filter(query, cursor), SUMMARY_PROJECTION)
+		.sort(REVIEWER_HISTORY_ORDER.sort)
 		.limit(limit)
 	)
-	return list(cursor)
+	return list(rows)
 
 
 def update_claim_review(
@@ -84,17 +96,27 @@ def update_claim_review(
 	reviewer: dict[str, Any],
 	note: str | None,
 ) -> bool:
+	reviewed_at = _utcnow()
 	update_doc: dict[str, Any] = {
 		"status": status,
 		"review": {
 			"reviewer": reviewer,
 			"note": note,
-			"reviewed_at": _utcnow(),
+			"reviewed_at": reviewed_at,
 		},
-		"updated_at": _utcnow(),
+		"updated_at": reviewed_at,
 	}
-	result = claims_collection.update_one({"claim_id": claim_id}, {"$set": update_doc})
-	return result.matched_count > 0
+	# The previous status comes back atomically so the rollup moves the right count.
+	previous = claims_collection.find_one_and_update(
+		{"claim_id": claim_id},
+		{"$set": update_doc},
+		projection={"_id": 0, "status": 1},
+		return_document=ReturnDocument.BEFORE,
+	)
+	if previous is None:
+		return False
+	claim_metrics.record_reviewed(previous.get("status"), status, reviewed_at)
+	return True
 
 
 def get_claimer_stats(claimer_email: str) -> dict[str, Any]:
@@ -146,49 +168,14 @@ def get_claimer_stats(claimer_email: str) -> dict[str, Any]:
 	return row
 
 
-def search_user_claims(search_text: str, limit: int = 50) -> list[dict[str, Any]]:
-	query = {
-		"$or": [
-			{"claimer.name": {"$regex": search_text, "$options": "i"}},
-			{"claimer.email": {"$regex": search_text, "$options": "i"}},
-			{"claim_id": {"$regex": search_text, "$options": "i"}},
-		]
-	}
-	cursor = claims_collection.find(query, {"_id": 0}).sort("created_at", -1).limit(limit)
-	return list(cursor)
+def search_user_claims(search_text: str, limit: int = 50) -> list[ClaimSummaryRow]:
+	return search_claims(claims_collection, search_text, limit=limit, projection=SUMMARY_PROJECTION)
 
 
 def get_admin_metrics() -> dict[str, Any]:
-	pipeline = [
-		{
-			"$group": {
-				"_id": None,
-				"total_claims": {"$sum": 1},
-				"approved": {"$sum": {"$cond": [{"$eq": ["$status", "APPROVED"]}, 1, 0]}},
-				"flagged": {
-					"$sum": {
-						"$cond": [
-							{"$in": ["$status", ["FLAGGED_FOR_REVIEW", "ESCALATED_FRAUD_REVIEW"]]},
-							1,
-							0,
-						]
-					}
-				},
-				"avg_fraud_score": {"$avg": "$fraud_score"},
-				"avg_process_minutes": {"$avg": "$processing_minutes"},
-			}
-		}
-	]
-	rows = list(claims_collection.aggregate(pipeline))
-	if not rows:
-		return {
-			"total_claims": 0,
-			"approved": 0,
-			"flagged": 0,
-			"avg_fraud_score": 0.0,
-			"avg_process_minutes": 0.0,
-		}
-	row = rows[0]
-	row.pop("_id", None)
-	return row
+	"""Dashboard totals from the incrementally maintained rollup (one document read)."""
+	return claim_metrics.summary()
+
 
+def get_metrics_trend(days: int = 30) -> list[dict[str, Any]]:
+	return claim_metrics.trend(days)
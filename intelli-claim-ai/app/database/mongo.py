@@ -26,6 +26,8 @@ except Exception as e:
 insurance_db = client["insurance_db"]
 policies_collection = insurance_db["policies"]
 claims_collection = insurance_db["claims"]
+claim_jobs_collection = insurance_db["claim_jobs"]
+claim_metrics_collection = insurance_db["claim_metrics"]
 
 # ⭐ HITL DATABASE (NEW)
 hitl_db = client["hitl_db"]
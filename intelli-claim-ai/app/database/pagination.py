@@ -0,0 +1,92 @@
+"""
+Keyset (cursor) pagination for claim listings.
+
+A page is read as "the next ``limit`` rows after the last one you saw" in a
+fixed ``(field, claim_id)`` descending order, rather than with ``skip``, so
+every page costs the same however deep it is. The last row's sort values are
+handed back as an opaque cursor. The predicate for the next page is pushed
+into each branch of an ``$or`` together with the listing's own filter, which
+keeps both branches on tight bounds of the matching ``(..., field, claim_id)``
+index (see app/database/indexes.py).
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+TIEBREAK_FIELD = "claim_id"
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"$date": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and set(value) == {"$date"}:
+        return datetime.fromisoformat(value["$date"])
+    return value
+
+
+def _merge(query: Dict[str, Any], field: str, condition: Any) -> Dict[str, Any]:
+    """``query`` with ``condition`` added on ``field``, combining operator documents."""
+    merged = dict(query)
+    existing = merged.get(field)
+    if existing is None:
+        merged[field] = condition
+        return merged
+    existing_ops = existing if isinstance(existing, dict) and all(str(key).startswith("$") for key in existing) else {"$eq": existing}
+    new_ops = condition if isinstance(condition, dict) else {"$eq": condition}
+    merged[field] = {**existing_ops, **new_ops}
+    return merged
+
+
+class KeysetOrder:
+    """Descending ``(field, claim_id)`` order for one listing; cursors are only valid for the order that issued them."""
+
+    def __init__(self, name: str, field: str):
+        self.name = name
+        self.field = field
+        self.sort: List[Tuple[str, int]] = [(field, -1), (TIEBREAK_FIELD, -1)]
+
+    def encode(self, row: Dict[str, Any]) -> str:
+        payload = {"o": self.name, "k": [_encode_value(row.get(self.field)), row.get(TIEBREAK_FIELD)]}
+        raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    def decode(self, cursor: str) -> Tuple[Any, Any]:
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            payload = json.loads(raw)
+            value, tiebreak = payload["k"]
+            if payload["o"] != self.name:
+                raise InvalidCursorError(f"cursor belongs to another listing ({payload['o']})")
+            return _decode_value(value), tiebreak
+        except InvalidCursorError:
+            raise
+        except (binascii.Error, ValueError, KeyError, TypeError) as exc:
+            raise InvalidCursorError("malformed cursor") from exc
+
+    def filter(self, query: Dict[str, Any], cursor: Optional[str]) -> Dict[str, Any]:
+        """``query`` restricted to the rows after ``cursor`` (``query`` itself when there is none)."""
+        if not cursor:
+            return query
+        value, tiebreak = self.decode(cursor)
+        branches = [_merge(_merge(query, self.field, value), TIEBREAK_FIELD, {"$lt": tiebreak})]
+        if value is not None:
+            # Null and missing values sort last, but type bracketing keeps ``$lt`` from ever matching them.
+            branches[:0] = [_merge(query, self.field, {"$lt": value}), _merge(query, self.field, None)]
+        return {"$or": branches}
+
+    def next_cursor(self, rows: Sequence[Dict[str, Any]], limit: int) -> Optional[str]:
+        """Cursor for the page after ``rows``; None once a short page shows the listing is exhausted."""
+        if not rows or len(rows) < limit:
+            return None
+        return self.encode(rows[-1])
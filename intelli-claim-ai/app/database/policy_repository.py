@@ -1,11 +1,15 @@
 from typing import Any, List, Optional
 from app.database.mongo import policies_collection
+from app.services.policy_cache import policy_cache
+from app.services.policy_index import policy_index
 
 def create_policy(policy_data: dict[str, Any]) -> str:
     """
     Creates a new policy record.
     """
     result = policies_collection.insert_one(policy_data)
+    policy_index.on_created(policy_data.get("policyNumber"), result.inserted_id)
+    policy_cache.invalidate_misses()
     return str(result.inserted_id)
 
 def get_policy(policy_number: str) -> Optional[dict[str, Any]]:
@@ -25,6 +29,9 @@ def delete_policy(policy_number: str) -> bool:
     Deletes a policy by its policy number.
     """
     result = policies_collection.delete_one({"policyNumber": policy_number})
+    if result.deleted_count > 0:
+        policy_index.on_deleted(policy_number)
+        policy_cache.invalidate(policy_number)
     return result.deleted_count > 0
 
 def update_policy(policy_number: str, update_data: dict[str, Any]) -> bool:
@@ -35,4 +42,10 @@ def update_policy(policy_number: str, update_data: dict[str, Any]) -> bool:
         {"policyNumber": policy_number},
         {"$set": update_data}
     )
+    new_number = update_data.get("policyNumber")
+    if result.matched_count > 0:
+        policy_cache.invalidate(policy_number)
+    if result.matched_count > 0 and new_number and new_number != policy_number:
+        policy_index.on_renamed(policy_number, new_number)
+        policy_cache.invalidate_misses()
     return result.matched_count > 0
@@ -0,0 +1,47 @@
+"""
+Projections for claim reads that do not need the whole document.
+
+A stored claim carries every node's output plus ``form_data.node1_output``
+with the raw OCR text, tens of kilobytes per claim. List endpoints only show
+a summary, so they read ``SUMMARY_PROJECTION`` and get ``ClaimSummaryRow``s.
+benchmarks/bench_list_projection.py measures the difference per page.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, TypedDict
+
+
+class ClaimSummaryRow(TypedDict, total=False):
+	"""What list endpoints read from a claim: no node outputs, form data or OCR text."""
+
+	claim_id: str
+	claim_type: str
+	claim_amount: float
+	status: str
+	fraud_score: float
+	risk_score: float
+	decision_reason: str | None
+	review: dict[str, Any]  # only review.note
+	claimer: dict[str, Any]  # only name and email
+	created_at: datetime
+	updated_at: datetime
+
+
+# Covers the summary builders, the pagination cursors and user activity.
+SUMMARY_PROJECTION: dict[str, int] = {
+	"_id": 0,
+	"claim_id": 1,
+	"claim_type": 1,
+	"claim_amount": 1,
+	"status": 1,
+	"fraud_score": 1,
+	"risk_score": 1,
+	"decision_reason": 1,
+	"review.note": 1,
+	"claimer.name": 1,
+	"claimer.email": 1,
+	"created_at": 1,
+	"updated_at": 1,
+}
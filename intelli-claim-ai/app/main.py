@@ -1,15 +1,36 @@
 import argparse
+import asyncio
 import json
 import os
 import uuid
+from contextlib import asynccontextmanager
 
 from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.api.routes_claims import router as claims_router
+from app.api.routes_claims import process_claim_job, release_failed_claim, router as claims_router
 from app.api.routes_underwriter import router as underwriter_router
-from app.core.langgraph_builder import run_claim_workflow
+from app.api.websocket import router as websocket_router
+from app.core.langgraph_builder import run_claim_workflow, warm_up_claim_workflow
+from app.database.indexes import ensure_indexes
+from app.nodes.node1_extraction import pdf_ocr
+from app.nodes.node1_extraction.ocr_cache import ocr_cache
+from app.services.claim_jobs import start_claim_workers, stop_claim_workers
+from app.services.claim_search import start_search_backfill
+from app.services.document_store import (
+    document_compactor,
+    document_store,
+    start_document_compactor,
+    stop_document_compactor,
+)
+from app.services.llm_cache import llm_cache
+from app.services.model_registry import model_registry
+from app.services.ollama_client import ollama_client
+from app.services.policy_cache import policy_cache
+from app.services.policy_index import policy_index, start_policy_index_sync, stop_policy_index_sync
+from app.services.prompt_budget import prompt_budget_stats
+from app.services.progress_bus import progress_bus
 
 
 def parse_args():
@@ -39,12 +60,39 @@ def run_cli():
     print(json.dumps(final_state, default=str, indent=2))
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Compile the claim graph once before serving so the first claim does not pay for it.
+    app.state.workflow_version = warm_up_claim_workflow()
+    # Load the fraud models up front; inference then only ever sees warm objects.
+    app.state.models_loaded = model_registry.warm_up()
+    # Build any missing index before the first query (no-op when they all exist).
+    app.state.indexes = ensure_indexes()
+    # Claims stored before search tokens existed stay out of search until tokenized.
+    start_search_backfill()
+    progress_bus.bind_loop(asyncio.get_running_loop())
+    # CLAIM_JOB_WORKERS=0 runs an API-only process that just enqueues claims.
+    app.state.claim_workers = start_claim_workers(process_claim_job, on_failed=release_failed_claim)
+    start_document_compactor()
+    start_policy_index_sync()
+    try:
+        yield
+    finally:
+        stop_policy_index_sync()
+        stop_document_compactor()
+        stop_claim_workers()
+        # After the claim workers, which may still be OCR'ing pages in it.
+        pdf_ocr.shutdown_pool()
+        await ollama_client.aclose()
+
+
 def create_app() -> FastAPI:
     load_dotenv()
     app = FastAPI(
         title="Intelli Claim API",
         description="FastAPI integration layer for LangGraph insurance claim workflow",
         version="1.0.0",
+        lifespan=lifespan,
     )
 
     allowed_origins = [
@@ -68,8 +116,22 @@ def create_app() -> FastAPI:
     def health_check():
         return {"status": "ok"}
 
+    @app.get("/api/metrics")
+    def service_metrics():
+        return {
+            "llm_cache": llm_cache.stats(),
+            "models": model_registry.stats(),
+            "ocr_cache": ocr_cache.stats(),
+            "ollama": ollama_client.stats(),
+            "policy_index": policy_index.stats(),
+            "policy_cache": policy_cache.stats(),
+            "prompt_budget": prompt_budget_stats.snapshot(),
+            "document_store": {**document_store.stats(), "last_compaction": document_compactor.last_run},
+        }
+
     app.include_router(claims_router)
     app.include_router(underwriter_router)
+    app.include_router(websocket_router)
 
     return app
 
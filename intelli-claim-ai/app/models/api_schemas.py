@@ -24,6 +24,18 @@ class ClaimSubmitRequest(BaseModel):
     claimer: ClaimerInfo
 
 
+class ClaimJobStatus(BaseModel):
+    job_id: str
+    claim_id: str
+    status: Literal["QUEUED", "RUNNING", "COMPLETED", "FAILED"]
+    stage: str | None = None
+    completed_nodes: list[str] = Field(default_factory=list)
+    attempts: int = 0
+    error: str | None = None
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
+
+
 class ClaimSummary(BaseModel):
     claim_id: str
     claim_type: str
@@ -79,6 +91,7 @@ class ClaimDetailsResponse(BaseModel):
 
 class ReviewerQueueResponse(BaseModel):
     claims: list[ClaimSummary]
+    next_cursor: str | None = None
 
 
 class ReviewerDecisionRequest(BaseModel):
@@ -1,12 +1,22 @@
-import ollama
 import os
 import logging
+from functools import lru_cache
 import pytesseract
-from pdf2image import convert_from_path
 from pydantic import BaseModel, Field, field_validator, model_validator
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from dotenv import load_dotenv
 
+from app.nodes.node1_extraction.ocr_cache import OcrCache, ocr_cache
+from app.services.llm_cache import LlmResponseCache, llm_cache
+from app.services.ollama_client import OllamaUnavailableError, ollama_client
+from app.services.prompt_budget import fit_text, fit_texts
+from app.nodes.node1_extraction.pdf_ocr import (
+    PDF_OCR_DPI,
+    TEXT_LAYER_MAX_GARBAGE_RATIO,
+    TEXT_LAYER_MIN_CHARS,
+    extract_pdf_text,
+)
+
 # Load env for binary paths
 load_dotenv()
 
@@ -20,6 +30,27 @@ pytesseract.pytesseract.tesseract_cmd = TESSERACT_CMD
 # Configure Poppler path from env
 POPPLER_PATH = os.getenv("POPPLER_PATH")
 
+# Bump when a prompt template changes so cached responses for the old wording miss.
+EXTRACTION_PROMPT_VERSION = 2
+RECONCILE_PROMPT_VERSION = 2
+
+
+def _chat_json(model_name: str, prompt: str, call_site: str, cache_key: Optional[str] = None) -> str:
+    if cache_key:
+        cached = llm_cache.get(cache_key)
+        if cached is not None:
+            return cached
+    response = ollama_client.chat(
+        model=model_name,
+        messages=[{'role': 'user', 'content': prompt}],
+        call_site=call_site,
+        format='json'
+    )
+    content = response['message']['content']
+    if cache_key:
+        llm_cache.put_if_json(cache_key, content)
+    return content
+
 # 1. Define the 'Golden Record' Schema (Validation)
 class LineItem(BaseModel):
     description: str
@@ -109,33 +140,85 @@ class ClaimSchema(BaseModel):
         populate_by_name = True
 
 # 2. Hybrid OCR-LLM Extraction Logic
-def extract_text_hybrid(file_path: str) -> str:
-    """
-    Extracts raw text from Image or PDF using Tesseract and Poppler.
-    """
+# Bump when the OCR pipeline changes in a way that should invalidate cached text.
+OCR_PIPELINE_VERSION = 2
+
+
+@lru_cache(maxsize=1)
+def _tesseract_version() -> str:
+    try:
+        return str(pytesseract.get_tesseract_version())
+    except Exception:
+        return "unknown"
+
+
+def ocr_settings() -> Dict[str, Any]:
+    """Everything besides the file bytes that changes the OCR output."""
+    return {
+        "pipeline": OCR_PIPELINE_VERSION,
+        "tesseract": _tesseract_version(),
+        "tesseract_cmd": TESSERACT_CMD,
+        "pdf_dpi": PDF_OCR_DPI,
+        "text_layer_min_chars": TEXT_LAYER_MIN_CHARS,
+        "text_layer_max_garbage": TEXT_LAYER_MAX_GARBAGE_RATIO,
+    }
+
+
+def _run_ocr(file_path: str) -> Tuple[str, Dict[str, Any]]:
     ext = os.path.splitext(file_path)[1].lower()
     full_text = ""
 
+    if ext == ".pdf":
+        logger.info(f"Extracting text from PDF: {file_path}")
+        # Digital pages use the embedded text; scanned pages are OCR'd one at a time in the process pool
+        page_texts, stats = extract_pdf_text(file_path, poppler_path=POPPLER_PATH, tesseract_cmd=TESSERACT_CMD)
+        for page_number in sorted(page_texts):
+            full_text += f"\n--- Page {page_number} ---\n{page_texts[page_number]}"
+    else:
+        logger.info(f"Extracting text from Image: {file_path}")
+        full_text = pytesseract.image_to_string(file_path)
+        stats = {"pages": 1, "text_layer_pages": 0, "ocr_pages": 1}
+
+    return full_text, stats
+
+
+def extract_text_with_stats(file_path: str) -> Tuple[str, Dict[str, Any]]:
+    """
+    Extracts raw text from Image or PDF and reports how many pages came from
+    the PDF text layer vs. OCR. Results are cached by content hash + OCR
+    settings, so duplicate uploads and repeat passes skip extraction.
+    """
+    try:
+        cache_key = OcrCache.make_key(file_path, ocr_settings())
+    except OSError as e:
+        logger.error(f"OCR failed for {file_path}: {e}")
+        return "", {}
+
+    cached = ocr_cache.get(cache_key)
+    if cached is not None:
+        logger.info(f"OCR cache hit for {file_path}")
+        return cached["text"], {**cached.get("stats", {}), "cache_hit": True}
+
     try:
-        if ext == ".pdf":
-            logger.info(f"Extracting text from PDF: {file_path}")
-            # Convert PDF to images
-            images = convert_from_path(file_path, poppler_path=POPPLER_PATH)
-            for i, image in enumerate(images):
-                page_text = pytesseract.image_to_string(image)
-                full_text += f"\n--- Page {i+1} ---\n{page_text}"
-        else:
-            logger.info(f"Extracting text from Image: {file_path}")
-            full_text = pytesseract.image_to_string(file_path)
-            
-        return full_text
+        full_text, stats = _run_ocr(file_path)
     except Exception as e:
         logger.error(f"OCR failed for {file_path}: {e}")
-        return ""
+        return "", {}
 
-def extract_node_1(file_path: str, doc_type: str = "auto") -> Dict[str, Any]:
+    ocr_cache.put(cache_key, {"text": full_text, "stats": stats})
+    return full_text, {**stats, "cache_hit": False}
+
+
+def extract_text_hybrid(file_path: str) -> str:
+    """
+    Extracts raw text from Image or PDF using the PDF text layer, Tesseract and Poppler.
+    """
+    return extract_text_with_stats(file_path)[0]
+
+def extract_node_1(file_path: str, doc_type: str = "auto", raw_text: Optional[str] = None) -> Dict[str, Any]:
     """
     Hybrid extraction: Tesseract OCR -> Gemma 3 Reasoning -> Pydantic Validation.
+    Pass raw_text when the caller already OCR'd the file to skip the OCR pass.
     """
     logger.info(f"Starting Hybrid OCR-LLM extraction for [{doc_type}]: {file_path}")
     
@@ -143,11 +226,13 @@ def extract_node_1(file_path: str, doc_type: str = "auto") -> Dict[str, Any]:
     
     try:
         # A. OCR Pass
-        raw_text = extract_text_hybrid(file_path)
+        if raw_text is None:
+            raw_text = extract_text_hybrid(file_path)
         if not raw_text.strip():
             raise ValueError("No text could be extracted from the document.")
 
-        # B. LLM Reasoning Pass (Specialized based on doc_type)
+        # B. LLM Reasoning Pass (Specialized based on doc_type), on compacted and budgeted OCR text
+        prompt_text = fit_text(raw_text, "extract_node_1").text
         type_prefix = f"This document is a {doc_type.upper()}. " if doc_type != "auto" else ""
         
         prompt = f"""
@@ -156,7 +241,7 @@ def extract_node_1(file_path: str, doc_type: str = "auto") -> Dict[str, Any]:
         {type_prefix}
         
         ### RAW OCR TEXT
-        {raw_text}
+        {prompt_text}
         
         ### EXTRACTION FIELDS
         1. IDENTITY: claimant_name, aadhaar_id, dob, address, phone, email.
@@ -190,13 +275,8 @@ def extract_node_1(file_path: str, doc_type: str = "auto") -> Dict[str, Any]:
         """
 
         logger.info(f"Calling Ollama ({model_name}) for reasoning on {os.path.basename(file_path)}...")
-        response = ollama.chat(
-            model=model_name,
-            messages=[{'role': 'user', 'content': prompt}],
-            format='json'
-        )
-        
-        raw_content = response['message']['content']
+        cache_key = LlmResponseCache.make_key(model_name, f"extract_node_1:{doc_type}", EXTRACTION_PROMPT_VERSION, prompt_text)
+        raw_content = _chat_json(model_name, prompt, "extract_node_1", cache_key)
         
         # C. Validation (Pydantic)
         try:
@@ -229,6 +309,9 @@ def extract_node_1(file_path: str, doc_type: str = "auto") -> Dict[str, Any]:
 
         return validated_data.model_dump()
 
+    except OllamaUnavailableError:
+        # Not a bad document: Ollama is down or saturated, so the claim job should retry.
+        raise
     except Exception as e:
         logger.error(f"Hybrid Extraction failed for {file_path}: {e}")
         return ClaimSchema().model_dump()
@@ -240,9 +323,8 @@ def global_reconcile(all_texts: List[str]) -> Dict[str, Any]:
     logger.info("Executing Global Reconciliation Pass...")
     model_name = 'gemma3:4b'
     
-    combined_text = "\n\n".join(all_texts)
-    if len(combined_text) > 40000: # Slightly larger for multi-doc
-        combined_text = combined_text[:40000] + "... [TRUNCATED]"
+    # Every document gets a fair share of the token budget instead of a blind cut at the end.
+    combined_text = fit_texts(all_texts, "global_reconcile").text
 
     prompt = f"""
     ### SYSTEM ROLE
@@ -284,14 +366,12 @@ def global_reconcile(all_texts: List[str]) -> Dict[str, Any]:
     """
 
     try:
-        response = ollama.chat(
-            model=model_name,
-            messages=[{'role': 'user', 'content': prompt}],
-            format='json'
-        )
-        raw_content = response['message']['content']
+        cache_key = LlmResponseCache.make_key(model_name, "global_reconcile", RECONCILE_PROMPT_VERSION, combined_text)
+        raw_content = _chat_json(model_name, prompt, "global_reconcile", cache_key)
         validated_data = ClaimSchema.model_validate_json(raw_content)
         return validated_data.model_dump()
+    except OllamaUnavailableError:
+        raise
     except Exception as e:
         logger.error(f"Global Reconciliation failed: {e}")
         return {}
@@ -1,9 +1,11 @@
 import os
 import re
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from app.nodes.node1_extraction.ocr_engine import extract_text_from_image, extract_text_from_pdf
 from app.nodes.node1_extraction.confidence_scorer import calculate_field_confidence, get_overall_confidence
 from app.nodes.node1_extraction.entity_resolver import resolve_entities
+from app.services.ollama_client import OllamaUnavailableError
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -64,70 +66,88 @@ def classify_document(text: str) -> str:
     if "incident" in text or "report" in text or "diagnosis" in text: return "report"
     return "unknown"
 
+def _build_document(path: str, raw_text: str, ocr_stats: dict, doc_type: str, extracted_data: dict) -> dict:
+    # Regex Reinforcement (Fallback for critical patterns)
+    regex_data = extract_regex_fallback(raw_text)
+    for key in ["aadhaar_id", "email", "policy_number"]:
+        if not extracted_data.get(key) and regex_data.get(key):
+            logger.info(f"Regex Reinforcement: Found {key} via regex.")
+            extracted_data[key] = regex_data[key]
+
+    logger.info(f"High-Accuracy Extraction Result for {os.path.basename(path)}: {extracted_data}")
+
+    # Map back to legacy field structure
+    legacy_fields = {
+        "holder_name": [extracted_data.get("claimer_name")] if extracted_data.get("claimer_name") else [],
+        "name": [extracted_data.get("claimer_name")] if extracted_data.get("claimer_name") else [],
+        "policy_number": [extracted_data.get("policy_number")] if extracted_data.get("policy_number") else [],
+        "amount": [extracted_data.get("total_amount")] if extracted_data.get("total_amount") else [],
+        "total_amount": [extracted_data.get("total_amount")] if extracted_data.get("total_amount") else [],
+        "date": [extracted_data.get("admission_date")] if extracted_data.get("admission_date") else [],
+        "admission_date": [extracted_data.get("admission_date")] if extracted_data.get("admission_date") else [],
+        "incident_date": [extracted_data.get("admission_date")] if extracted_data.get("admission_date") else [],
+        "discharge_date": [extracted_data.get("discharge_date")] if extracted_data.get("discharge_date") else [],
+        "dob": [extracted_data.get("dob")] if extracted_data.get("dob") else [],
+        "hospital_name": extracted_data.get("hospital_name"),
+        "claimer_name": extracted_data.get("claimer_name"),
+        "aadhaar_id": extracted_data.get("aadhaar_id"),
+        "diagnosis": extracted_data.get("diagnosis"),
+        "phone": extracted_data.get("phone"),
+        "email": extracted_data.get("email"),
+        "address": extracted_data.get("address"),
+        "line_items": extracted_data.get("line_items", [])
+    }
+
+    return {
+        "file": path,
+        "document_type": doc_type,
+        "structured_fields": legacy_fields,
+        "fields": extracted_data,
+        "confidences": {k: 0.95 for k in extracted_data.keys()},
+        "extracted_text": raw_text[:800] + "...",
+        "ocr_stats": ocr_stats
+    }
+
 def process_documents(claim_id: str, file_paths: list[str]):
     logger.info(f"Processing claim {claim_id} with {len(file_paths)} files.")
     all_extracted_docs = []
     all_raw_texts = []
+    ocr_results = []
 
-    from app.nodes.node1_extraction.extraction_engine import extract_node_1, extract_text_hybrid, global_reconcile
+    from app.nodes.node1_extraction import extraction_engine
+    from app.nodes.node1_extraction.extraction_engine import extract_node_1, extract_text_with_stats, global_reconcile
 
+    # 1. OCR Pass (text layer for digital PDF pages, OCR for scans)
     for path in file_paths:
         try:
-            # 1. OCR Pass
-            raw_text = extract_text_hybrid(path)
-            all_raw_texts.append(raw_text)
-
-            # 2. Classify for specialized prompt
-            doc_type = classify_document(raw_text[:2000])
-
-            # 3. Individual High-accuracy multimodal extraction
-            extracted_data = extract_node_1(path, doc_type=doc_type)
-            
-            # 4. Regex Reinforcement (Fallback for critical patterns)
-            regex_data = extract_regex_fallback(raw_text)
-            for key in ["aadhaar_id", "email", "policy_number"]:
-                if not extracted_data.get(key) and regex_data.get(key):
-                    logger.info(f"Regex Reinforcement: Found {key} via regex.")
-                    extracted_data[key] = regex_data[key]
-
-            logger.info(f"High-Accuracy Extraction Result for {os.path.basename(path)}: {extracted_data}")
-            
-            # Map back to legacy field structure
-            legacy_fields = {
-                "holder_name": [extracted_data.get("claimer_name")] if extracted_data.get("claimer_name") else [],
-                "name": [extracted_data.get("claimer_name")] if extracted_data.get("claimer_name") else [],
-                "policy_number": [extracted_data.get("policy_number")] if extracted_data.get("policy_number") else [],
-                "amount": [extracted_data.get("total_amount")] if extracted_data.get("total_amount") else [],
-                "total_amount": [extracted_data.get("total_amount")] if extracted_data.get("total_amount") else [],
-                "date": [extracted_data.get("admission_date")] if extracted_data.get("admission_date") else [],
-                "admission_date": [extracted_data.get("admission_date")] if extracted_data.get("admission_date") else [],
-                "incident_date": [extracted_data.get("admission_date")] if extracted_data.get("admission_date") else [],
-                "discharge_date": [extracted_data.get("discharge_date")] if extracted_data.get("discharge_date") else [],
-                "dob": [extracted_data.get("dob")] if extracted_data.get("dob") else [],
-                "hospital_name": extracted_data.get("hospital_name"),
-                "claimer_name": extracted_data.get("claimer_name"),
-                "aadhaar_id": extracted_data.get("aadhaar_id"),
-                "diagnosis": extracted_data.get("diagnosis"),
-                "phone": extracted_data.get("phone"),
-                "email": extracted_data.get("email"),
-                "address": extracted_data.get("address"),
-                "line_items": extracted_data.get("line_items", [])
-            }
-
-            all_extracted_docs.append({
-                "file": path,
-                "document_type": doc_type, 
-                "structured_fields": legacy_fields,
-                "fields": extracted_data,
-                "confidences": {k: 0.95 for k in extracted_data.keys()},
-                "extracted_text": raw_text[:800] + "..."
-            })
-            
+            raw_text, ocr_stats = extract_text_with_stats(path)
         except Exception as e:
             logger.error(f"Error processing {path}: {e}")
+            continue
+        all_raw_texts.append(raw_text)
+        # Classify for specialized prompt
+        ocr_results.append((path, raw_text, ocr_stats, classify_document(raw_text[:2000])))
+
+    # 2. LLM Pass: reconciliation needs only the OCR text, so it goes out first and
+    # runs alongside the per-document extractions. The shared Ollama client caps
+    # what is actually in flight at OLLAMA_NUM_PARALLEL.
+    with ThreadPoolExecutor(max_workers=extraction_engine.ollama_client.max_in_flight + 1, thread_name_prefix="llm-extract") as pool:
+        reconcile_future = pool.submit(global_reconcile, all_raw_texts)
+        extraction_futures = [
+            pool.submit(extract_node_1, path, doc_type=doc_type, raw_text=raw_text)
+            for path, raw_text, _, doc_type in ocr_results
+        ]
+
+        for (path, raw_text, ocr_stats, doc_type), future in zip(ocr_results, extraction_futures):
+            try:
+                all_extracted_docs.append(_build_document(path, raw_text, ocr_stats, doc_type, future.result()))
+            except OllamaUnavailableError:
+                raise
+            except Exception as e:
+                logger.error(f"Error processing {path}: {e}")
 
-    # 4. Global Reconciliation Pass
-    reconciled_entities = global_reconcile(all_raw_texts)
+        # 3. Global Reconciliation Pass
+        reconciled_entities = reconcile_future.result()
     logger.info(f"Global Reconciled Entities: {reconciled_entities}")
 
     # Calculate fallback entities (most frequent from all docs)
@@ -0,0 +1,177 @@
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.utils.hashing import hash_file, hash_text
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR_ENV = "OCR_CACHE_DIR"
+CACHE_MEMORY_MB_ENV = "OCR_CACHE_MEMORY_MB"
+CACHE_DISK_MB_ENV = "OCR_CACHE_DISK_MB"
+# Disk eviction goes down to this share of the cap, so it does not rescan on every write.
+DISK_LOW_WATER = 0.9
+
+
+def _payload_size(payload: Dict[str, Any]) -> int:
+    return len(payload.get("text", "")) + 256
+
+
+class OcrCache:
+    """
+    Two-tier, content-addressed OCR result cache.
+
+    Keys combine the document's content hash with the OCR settings, so the
+    same bytes uploaded twice (or OCR'd twice within one claim) hit the cache,
+    while a Tesseract upgrade or config change misses it. Results are written
+    through to disk and the hottest ones are kept in an in-memory LRU bounded
+    by total text size. The disk tier is bounded by ``max_disk_bytes``: past it,
+    the least recently used entries (by mtime, refreshed on a disk hit) are deleted.
+    """
+
+    def __init__(self, directory: str, max_memory_bytes: int, max_disk_bytes: Optional[int] = None):
+        self.directory = directory
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_bytes: Optional[int] = None  # measured on the first write
+        self._lock = threading.Lock()
+        self._disk_lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0, "disk_evictions": 0}
+
+    @staticmethod
+    def make_key(file_path: str, settings: Dict[str, Any]) -> str:
+        fingerprint = json.dumps(settings, sort_keys=True, default=str)
+        return hash_text(f"{hash_file(file_path)}:{fingerprint}")
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            payload = self._memory.get(key)
+            if payload is not None:
+                self._memory.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                return payload
+
+        path = self._disk_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                payload = json.load(handle)
+        except (OSError, ValueError):
+            with self._lock:
+                self._stats["misses"] += 1
+            return None
+
+        try:
+            os.utime(path)  # keeps a hot entry from being evicted as the oldest
+        except OSError:
+            pass
+        with self._lock:
+            self._stats["disk_hits"] += 1
+            self._remember(key, payload)
+        return payload
+
+    def put(self, key: str, payload: Dict[str, Any]) -> None:
+        path = self._disk_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as handle:
+                json.dump(payload, handle)
+            os.replace(tmp_path, path)
+            self._track_disk(os.path.getsize(path))
+        except OSError as exc:
+            logger.warning(f"Could not persist OCR cache entry {key}: {exc}")
+
+        with self._lock:
+            self._remember(key, payload)
+
+    def _disk_entries(self) -> List[Tuple[float, int, str]]:
+        entries = []
+        for folder, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(folder, name)
+                try:
+                    info = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((info.st_mtime, info.st_size, path))
+        return entries
+
+    def _track_disk(self, written: int) -> None:
+        if not self.max_disk_bytes:
+            return
+        with self._disk_lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = sum(size for _, size, _ in self._disk_entries())
+            else:
+                self._disk_bytes += written
+            if self._disk_bytes <= self.max_disk_bytes:
+                return
+            # Rescan rather than trust the running total: other workers share the directory.
+            entries = sorted(self._disk_entries())
+            total = sum(size for _, size, _ in entries)
+            evicted = 0
+            for _, size, path in entries:
+                if total <= self.max_disk_bytes * DISK_LOW_WATER:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                evicted += 1
+            self._disk_bytes = total
+        with self._lock:
+            self._stats["disk_evictions"] += evicted
+
+    def _remember(self, key: str, payload: Dict[str, Any]) -> None:
+        if key in self._memory:
+            self._memory_bytes -= _payload_size(self._memory.pop(key))
+        size = _payload_size(payload)
+        if size > self.max_memory_bytes:
+            return
+        self._memory[key] = payload
+        self._memory_bytes += size
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= _payload_size(evicted)
+            self._stats["evictions"] += 1
+
+    def clear_memory(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._stats,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "max_memory_bytes": self.max_memory_bytes,
+                "disk_bytes": self._disk_bytes,
+                "max_disk_bytes": self.max_disk_bytes,
+            }
+
+
+def _megabytes(env_name: str, default: float) -> int:
+    try:
+        return int(float(os.getenv(env_name, default)) * 1024 * 1024)
+    except ValueError:
+        return int(default * 1024 * 1024)
+
+
+ocr_cache = OcrCache(
+    directory=os.getenv(CACHE_DIR_ENV, os.path.join("temp_images", "ocr_cache")),
+    max_memory_bytes=_megabytes(CACHE_MEMORY_MB_ENV, 64),
+    max_disk_bytes=_megabytes(CACHE_DISK_MB_ENV, 512),
+)
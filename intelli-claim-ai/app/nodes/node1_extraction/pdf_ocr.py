@@ -0,0 +1,169 @@
+"""
+Per-page PDF text extraction: embedded text layer first, OCR for the rest.
+
+Born-digital pages carry a usable text layer and skip OCR entirely. Each
+remaining (scanned) page is rasterized and OCR'd inside a worker process,
+one page per task, so at most ``OCR_PROCESS_WORKERS`` page images exist at
+any time regardless of how long the PDF is. Results come back as plain
+text and are reassembled in page order by the caller.
+"""
+
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import fitz  # PyMuPDF
+import pytesseract
+from pdf2image import convert_from_path
+from pypdf import PdfReader
+
+logger = logging.getLogger(__name__)
+
+OCR_PROCESSES_ENV = "OCR_PROCESS_WORKERS"
+PDF_OCR_DPI = 200
+
+# A text layer is trusted when it has enough real characters and little junk
+# (scanner-embedded OCR garbage, broken font encodings, U+FFFD replacements).
+TEXT_LAYER_MIN_CHARS = 40
+TEXT_LAYER_MAX_GARBAGE_RATIO = 0.25
+_PLAIN_PUNCTUATION = set(".,:;/-()'\"@#&%+*_=₹$[]")
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _worker_count() -> int:
+    try:
+        return max(int(os.getenv(OCR_PROCESSES_ENV, os.cpu_count() or 1)), 1)
+    except ValueError:
+        return os.cpu_count() or 1
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn keeps workers independent of the API's threads (and matches Windows).
+            _pool = ProcessPoolExecutor(
+                max_workers=_worker_count(),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def _reset_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def shutdown_pool() -> None:
+    _reset_pool()
+
+
+def count_pages(pdf_path: str) -> int:
+    return len(PdfReader(pdf_path).pages)
+
+
+def ocr_page(pdf_path: str, page_number: int, poppler_path: Optional[str], tesseract_cmd: Optional[str]) -> str:
+    """Rasterize and OCR a single 1-based page. Runs inside a worker process."""
+    if tesseract_cmd:
+        pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+    images = convert_from_path(
+        pdf_path,
+        dpi=PDF_OCR_DPI,
+        first_page=page_number,
+        last_page=page_number,
+        poppler_path=poppler_path,
+    )
+    try:
+        return pytesseract.image_to_string(images[0]) if images else ""
+    finally:
+        for image in images:
+            image.close()
+
+
+def ocr_pdf_pages(
+    pdf_path: str,
+    page_numbers: Optional[Iterable[int]] = None,
+    poppler_path: Optional[str] = None,
+    tesseract_cmd: Optional[str] = None,
+) -> Dict[int, str]:
+    """
+    OCR the given 1-based pages (all pages by default) and return {page: text}.
+    Single-page work runs inline; anything larger fans out to the process pool.
+    """
+    pages: List[int] = list(page_numbers) if page_numbers is not None else list(range(1, count_pages(pdf_path) + 1))
+    if not pages:
+        return {}
+
+    if len(pages) == 1 or _worker_count() == 1:
+        return {page: ocr_page(pdf_path, page, poppler_path, tesseract_cmd) for page in pages}
+
+    try:
+        pool = _get_pool()
+        futures = {page: pool.submit(ocr_page, pdf_path, page, poppler_path, tesseract_cmd) for page in pages}
+        return {page: future.result() for page, future in futures.items()}
+    except BrokenProcessPool:
+        logger.warning("OCR process pool died; rebuilding it and OCR'ing this PDF inline")
+        _reset_pool()
+        return {page: ocr_page(pdf_path, page, poppler_path, tesseract_cmd) for page in pages}
+
+
+def garbage_ratio(text: str) -> float:
+    visible = [c for c in text if not c.isspace()]
+    if not visible:
+        return 1.0
+    garbage = sum(1 for c in visible if not (c.isalnum() or c in _PLAIN_PUNCTUATION) or c == "\ufffd")
+    return garbage / len(visible)
+
+
+def text_layer_is_usable(text: str) -> bool:
+    visible_chars = sum(1 for c in text if not c.isspace())
+    return visible_chars >= TEXT_LAYER_MIN_CHARS and garbage_ratio(text) <= TEXT_LAYER_MAX_GARBAGE_RATIO
+
+
+def read_text_layer(pdf_path: str) -> Dict[int, str]:
+    """Embedded text per 1-based page; empty dict when the PDF cannot be parsed."""
+    try:
+        with fitz.open(pdf_path) as doc:
+            return {index + 1: page.get_text("text") or "" for index, page in enumerate(doc)}
+    except Exception as exc:
+        logger.warning(f"Could not read text layer of {pdf_path}: {exc}")
+        return {}
+
+
+def extract_pdf_text(
+    pdf_path: str,
+    poppler_path: Optional[str] = None,
+    tesseract_cmd: Optional[str] = None,
+) -> Tuple[Dict[int, str], Dict[str, Any]]:
+    """
+    Route each page to its text layer when it passes the quality check and to
+    OCR otherwise. Returns ({page: text}, stats) where stats counts both paths.
+    """
+    text_layer = read_text_layer(pdf_path)
+    if text_layer:
+        ocr_pages = [page for page, text in text_layer.items() if not text_layer_is_usable(text)]
+    else:
+        ocr_pages = list(range(1, count_pages(pdf_path) + 1))
+
+    page_texts = {page: text for page, text in text_layer.items() if page not in ocr_pages}
+    page_texts.update(ocr_pdf_pages(pdf_path, ocr_pages, poppler_path, tesseract_cmd))
+
+    stats = {
+        "pages": len(page_texts),
+        "text_layer_pages": len(page_texts) - len(ocr_pages),
+        "ocr_pages": len(ocr_pages),
+    }
+    logger.info(
+        f"{os.path.basename(pdf_path)}: {stats['text_layer_pages']} page(s) from text layer, "
+        f"{stats['ocr_pages']} page(s) OCR'd"
+    )
+    return page_texts, stats
@@ -1,4 +1,5 @@
 import os
+import re
 import pytesseract
 from pdf2image import convert_from_path
 import cv2
@@ -33,4 +34,50 @@ def extract_text_from_pdf(path):
         processed = preprocess_image(img)
         text += pytesseract.image_to_string(processed, config="--oem 3 --psm 4")
 
-    return text
\ No newline at end of file
+    return text
+
+# --- OCR text compaction (prompt input) ---
+
+PAGE_SEPARATOR = re.compile(r"^\s*(?:-{2,}\s*page\s+\d+\s*-{2,}|page\s+\d+(?:\s+of\s+\d+)?)\s*$", re.I)
+# Box-drawing characters and pipes Tesseract emits for table borders.
+TABLE_RULE_CHARS = re.compile(r"[|¦─-╿]+")
+RULE_LINE = re.compile(r"^[\s\-=_*~+#.:·•]+$")
+INLINE_SPACE = re.compile(r"[ \t ]+")
+
+
+def _normalized(line):
+    return re.sub(r"\W+", "", line).casefold()
+
+
+def compact_ocr_text(text):
+    """
+    Strip OCR noise that costs prompt tokens but carries no field values:
+    page separators, table rules, runs of whitespace, blank lines, and
+    headers/footers repeated on more than one page (kept once). Repeats
+    within a single page, e.g. identical bill line items, are kept.
+    """
+    pages = [[]]
+    for raw_line in text.replace("\f", "\n").splitlines():
+        if PAGE_SEPARATOR.match(raw_line):
+            pages.append([])
+            continue
+        line = INLINE_SPACE.sub(" ", TABLE_RULE_CHARS.sub(" ", raw_line)).strip()
+        if line and not RULE_LINE.match(line):
+            pages[-1].append(line)
+
+    pages_per_line = {}
+    for page in pages:
+        for key in {_normalized(line) for line in page}:
+            pages_per_line[key] = pages_per_line.get(key, 0) + 1
+
+    seen_repeated = set()
+    kept = []
+    for page in pages:
+        for line in page:
+            key = _normalized(line)
+            if pages_per_line.get(key, 0) > 1:
+                if key in seen_repeated:
+                    continue
+                seen_repeated.add(key)
+            kept.append(line)
+    return "\n".join(kept)
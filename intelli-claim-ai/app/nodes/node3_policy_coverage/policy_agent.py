@@ -1,6 +1,6 @@
 from datetime import datetime
 import re
-from .policy_fetcher import fetch_policy
+from app.services.policy_cache import resolve_policy
 from .coverage_checker import is_policy_active, calculate_covered_amount, parse_date
 from .exclusions_engine import check_exclusions
 
@@ -70,12 +70,11 @@ def verify_policy_coverage(node1_output):
     claim_amount = entities.get("amount", 0.0)
     incident_date_str = entities.get("date")
     
-    policy = fetch_policy(normalized_p_no)
+    policy = resolve_policy(normalized_p_no)
     
     match_status = "EXACT"
     if not policy and normalized_p_no:
         # Try a substring match or prefix match as fallback for messy OCR
-        # (Assuming fetch_policy can handle logic or we fetch all and filter)
         # For simplicity in this mock, we'll stick to exact, but mark as missing.
         pass
 
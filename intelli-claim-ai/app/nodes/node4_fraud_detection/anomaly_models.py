@@ -1,9 +1,10 @@
 import os
 from pathlib import Path
 
-import joblib
 import numpy as np
 
+from app.services.model_registry import model_registry
+
 
 MODEL_PATH_ENV = "FRAUD_MODEL_PATH"
 
@@ -19,14 +20,11 @@ def _resolve_model_path():
     return _default_model_path()
 
 
+model_registry.register("anomaly_model", _resolve_model_path)
+
+
 def _load_model():
-    model_path = _resolve_model_path()
-    if not model_path.exists() or model_path.stat().st_size == 0:
-        return None
-    try:
-        return joblib.load(model_path)
-    except Exception:
-        return None
+    return model_registry.get("anomaly_model")
 
 
 def anomaly_score(amount, days_since_policy):
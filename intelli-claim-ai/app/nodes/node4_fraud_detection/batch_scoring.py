@@ -0,0 +1,236 @@
+"""
+Batch LightGBM fraud scoring over whole collections.
+
+Used to re-score the open book nightly and after a model refresh. Records
+are streamed from MongoDB in cursor batches, each batch is encoded into one
+matrix, scored with a single ``predict_proba`` call and written back with one
+unordered ``bulk_write``. Results go under ``lightgbm_score`` and never touch
+a claim's blended ``fraud_score``, which also depends on the LLM and rules.
+
+    python -m app.nodes.node4_fraud_detection.batch_scoring --source claims
+"""
+
+import argparse
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from pymongo import UpdateOne
+
+from app.services.model_registry import model_registry
+
+from .feature_encoder import FraudFeatureEncoder, encoder_for
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE_ENV = "FRAUD_SCORING_BATCH_SIZE"
+SCORE_FIELD = "lightgbm_score"
+CLOSED_CLAIM_STATUSES = ("APPROVED", "REJECTED")
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(int(os.getenv(name, default)), 1)
+    except ValueError:
+        return default
+
+
+def predict_fraud(model: Any, matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (predictions, fraud probabilities) from one ``predict_proba`` call.
+    Predictions are the argmax class, which is exactly what ``predict`` returns.
+    """
+    probabilities = model.predict_proba(matrix)
+    predictions = np.asarray(model.classes_)[np.argmax(probabilities, axis=1)]
+    return predictions.astype(int), probabilities[:, 1]
+
+
+def fraud_confidence(probability):
+    """Confidence from the distance to 0.5; works on scalars and arrays."""
+    return np.minimum(np.abs(probability - 0.5) * 2 + 0.5, 1.0)
+
+
+def iter_batches(cursor: Iterable[Dict[str, Any]], batch_size: int) -> Iterator[List[Dict[str, Any]]]:
+    batch: List[Dict[str, Any]] = []
+    for document in cursor:
+        batch.append(document)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _load_model_and_features():
+    # Imported here so this module (and its tests) load without a MongoDB connection.
+    from .mongodb_fraud_classifier import _load_features_list, _load_lightgbm_model
+
+    return _load_lightgbm_model(), _load_features_list()
+
+
+def _score_payload(prediction: int, probability: float, model_sha256: Optional[str], scored_at: datetime) -> Dict[str, Any]:
+    return {
+        "prediction": int(prediction),
+        "probability": float(probability),
+        "confidence": float(fraud_confidence(probability)),
+        "model_sha256": model_sha256,
+        "scored_at": scored_at,
+    }
+
+
+class BatchFraudScorer:
+    """Scores record batches and turns them into bulk update operations."""
+
+    def __init__(self, model: Any = None, features: Optional[Sequence[str]] = None, batch_size: Optional[int] = None):
+        if model is None or features is None:
+            loaded_model, loaded_features = _load_model_and_features()
+            model = model if model is not None else loaded_model
+            features = features if features is not None else loaded_features
+        if model is None or features is None:
+            raise RuntimeError("LightGBM fraud model or features list is not available")
+        self.model = model
+        self.encoder: FraudFeatureEncoder = encoder_for(features)
+        self.batch_size = batch_size or _env_int(BATCH_SIZE_ENV, 5000)
+        self.model_sha256 = model_registry.stats().get("fraud_lightgbm", {}).get("sha256")
+
+    def score(self, records: Sequence[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+        return predict_fraud(self.model, self.encoder.encode(records))
+
+    def updates(self, keys: Sequence[Any], records: Sequence[Dict[str, Any]]) -> List[UpdateOne]:
+        """One ``$set`` per record, matched on ``_id``; keys and records are parallel."""
+        if not records:
+            return []
+        predictions, probabilities = self.score(records)
+        scored_at = datetime.utcnow()
+        return [
+            UpdateOne({"_id": key}, {"$set": {SCORE_FIELD: _score_payload(prediction, probability, self.model_sha256, scored_at)}})
+            for key, prediction, probability in zip(keys, predictions, probabilities)
+        ]
+
+
+class _Run:
+    def __init__(self, source: str, dry_run: bool):
+        self.stats: Dict[str, Any] = {
+            "source": source, "dry_run": dry_run, "batches": 0, "scanned": 0, "scored": 0, "unmatched": 0, "written": 0,
+        }
+        self.dry_run = dry_run
+        self.started = time.perf_counter()
+
+    def write(self, collection: Any, operations: List[UpdateOne]) -> None:
+        self.stats["batches"] += 1
+        self.stats["scored"] += len(operations)
+        if operations and not self.dry_run:
+            result = collection.bulk_write(operations, ordered=False)
+            self.stats["written"] += result.modified_count + result.upserted_count
+
+    def finish(self) -> Dict[str, Any]:
+        seconds = time.perf_counter() - self.started
+        self.stats["seconds"] = round(seconds, 3)
+        self.stats["records_per_second"] = round(self.stats["scanned"] / seconds, 1) if seconds else None
+        logger.info("Batch fraud scoring finished: %s", self.stats)
+        return self.stats
+
+
+def rescore_fraud_records(
+    collection: Any = None,
+    query: Optional[Dict[str, Any]] = None,
+    scorer: Optional[BatchFraudScorer] = None,
+    dry_run: bool = False,
+) -> Dict[str, Any]:
+    """Score every matching fraud_classification record and store the result on it."""
+    if collection is None:
+        from app.database.mongo import fraud_classification_collection as collection
+    scorer = scorer or BatchFraudScorer()
+    run = _Run("fraud_classification", dry_run)
+    projection = {field: 1 for field in scorer.encoder.source_fields}
+    cursor = collection.find(query or {}, projection, batch_size=scorer.batch_size)
+    for batch in iter_batches(cursor, scorer.batch_size):
+        run.stats["scanned"] += len(batch)
+        run.write(collection, scorer.updates([record["_id"] for record in batch], batch))
+    return run.finish()
+
+
+def _claimer_name(claim: Dict[str, Any]) -> Optional[str]:
+    return (claim.get("claimer") or {}).get("name")
+
+
+def _lookup_key(claim: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+    # Same order as fraud_agent: a claim with a claimer name is looked up by name
+    # only, and by policy number only when it has no name.
+    name = _claimer_name(claim)
+    if name:
+        return "claimer_name", name
+    policy_number = claim.get("policy_number")
+    if policy_number:
+        return "policy_number", policy_number
+    return None
+
+
+def _match_fraud_records(fraud_records: Any, claims: List[Dict[str, Any]], projection: Dict[str, int]) -> List[Optional[Dict[str, Any]]]:
+    """Fraud records for a batch of claims with one ``$in`` query, matched like the single-claim path."""
+    keys = [_lookup_key(claim) for claim in claims]
+    wanted: Dict[str, set] = {"claimer_name": set(), "policy_number": set()}
+    for key in keys:
+        if key is not None:
+            wanted[key[0]].add(key[1])
+    clauses = [{field: {"$in": sorted(values)}} for field, values in wanted.items() if values]
+    if not clauses:
+        return [None] * len(claims)
+
+    found: Dict[Tuple[str, Any], Dict[str, Any]] = {}
+    for record in fraud_records.find({"$or": clauses}, {**projection, "claimer_name": 1, "policy_number": 1}):
+        for field in wanted:
+            found.setdefault((field, record.get(field)), record)
+    return [found.get(key) if key is not None else None for key in keys]
+
+
+def rescore_claims(
+    claims: Any = None,
+    fraud_records: Any = None,
+    query: Optional[Dict[str, Any]] = None,
+    scorer: Optional[BatchFraudScorer] = None,
+    dry_run: bool = False,
+) -> Dict[str, Any]:
+    """Score claims (open ones by default) from their fraud_classification records."""
+    if claims is None:
+        from app.database.mongo import claims_collection as claims
+    if fraud_records is None:
+        from app.database.mongo import fraud_classification_collection as fraud_records
+    if query is None:
+        query = {"status": {"$nin": list(CLOSED_CLAIM_STATUSES)}}
+    scorer = scorer or BatchFraudScorer()
+    run = _Run("claims", dry_run)
+    feature_projection = {field: 1 for field in scorer.encoder.source_fields}
+    cursor = claims.find(query, {"_id": 1, "claimer.name": 1, "policy_number": 1}, batch_size=scorer.batch_size)
+    for batch in iter_batches(cursor, scorer.batch_size):
+        run.stats["scanned"] += len(batch)
+        matched = _match_fraud_records(fraud_records, batch, feature_projection)
+        pairs = [(claim["_id"], record) for claim, record in zip(batch, matched) if record is not None]
+        run.stats["unmatched"] += len(batch) - len(pairs)
+        run.write(claims, scorer.updates([key for key, _ in pairs], [record for _, record in pairs]))
+    return run.finish()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-score fraud with the LightGBM model in batches")
+    parser.add_argument("--source", choices=["claims", "fraud_classification"], default="claims")
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument("--all", action="store_true", help="claims: include approved/rejected claims too")
+    parser.add_argument("--dry-run", action="store_true", help="score without writing results")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    scorer = BatchFraudScorer(batch_size=args.batch_size)
+    if args.source == "claims":
+        stats = rescore_claims(query={} if args.all else None, scorer=scorer, dry_run=args.dry_run)
+    else:
+        stats = rescore_fraud_records(scorer=scorer, dry_run=args.dry_run)
+    print(json.dumps(stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+Vectorized encoder for the LightGBM fraud model's inputs.
+
+The column layout is compiled once from ``fraud_features.pkl``: every
+one-hot column is parsed into (source field, category) and stored in a
+per-field ``{normalized value: column index}`` dict. Encoding a record is
+then a handful of dict lookups writing into a preallocated float64 row,
+and a batch of records fills one ``(n_records, n_features)`` matrix in a
+single pass. Encoding rules are the ones the old per-record pandas
+preprocessing applied, so scores do not change.
+"""
+
+import math
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+NUMERIC_FIELDS = (
+    "months_as_customer", "age", "policy_deductable", "policy_annual_premium",
+    "umbrella_limit", "incident_hour_of_the_day", "bodily_injuries", "witnesses",
+    "total_claim_amount", "days_since_policy",
+)
+
+BINARY_FIELDS = {
+    "property_damage": {"No": 0, "Yes": 1, "NO": 0, "YES": 1},
+    "police_report_available": {"No": 0, "Yes": 1, "NO": 0, "YES": 1},
+}
+
+
+def _strip(value: str) -> str:
+    return value.strip()
+
+
+def _upper(value: str) -> str:
+    return value.strip().upper()
+
+
+def _lower(value: str) -> str:
+    return value.strip().lower()
+
+
+def _hyphenated(value: str) -> str:
+    return value.strip().lower().replace(" ", "-")
+
+
+def _sex(value: str) -> str:
+    return "MALE" if value.strip().upper() in {"MALE", "M"} else ""
+
+
+# One-hot source fields: feature prefix -> how a raw value is normalized before lookup.
+CATEGORICAL_FIELDS: Dict[str, Callable[[str], str]] = {
+    "policy_state": _upper,
+    "insured_sex": _sex,
+    "insured_education_level": _strip,
+    "insured_occupation": _lower,
+    "insured_relationship": _hyphenated,
+    "incident_severity": _strip,
+    "authorities_contacted": _strip,
+    "incident_state": _upper,
+    "incident_city": _strip,
+}
+HOBBIES_FIELD = "insured_hobbies"
+CSL_FIELD = "policy_csl"
+
+
+def _is_missing(value: Any) -> bool:
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+class FraudFeatureEncoder:
+    def __init__(self, features: Sequence[str]):
+        self.features: List[str] = list(features)
+        self.column_index: Dict[str, int] = {name: i for i, name in enumerate(self.features)}
+        self.numeric = [(field, self.column_index[field]) for field in NUMERIC_FIELDS if field in self.column_index]
+        self.binary = [
+            (field, self.column_index[field], mapping)
+            for field, mapping in BINARY_FIELDS.items()
+            if field in self.column_index
+        ]
+        self.categorical: Dict[str, Dict[str, int]] = {field: {} for field in CATEGORICAL_FIELDS}
+        self.hobbies: Dict[str, int] = {}
+        self.csl: List[tuple] = []
+        for name, index in self.column_index.items():
+            self._compile_column(name, index)
+
+    def _compile_column(self, name: str, index: int) -> None:
+        if name in NUMERIC_FIELDS or name in BINARY_FIELDS:
+            return
+        if name.startswith(f"{HOBBIES_FIELD}_"):
+            self.hobbies[name[len(HOBBIES_FIELD) + 1:]] = index
+            return
+        if name.startswith(f"{CSL_FIELD}_"):
+            # The legacy rule strips commas from the value and then looks for
+            # "250,500"-style suffixes, which never match. Kept identical so
+            # scores stay put; fixing it belongs with a model retrain.
+            self.csl.append((name[len(CSL_FIELD) + 1:].replace("/", ","), index))
+            return
+        for field in CATEGORICAL_FIELDS:
+            if name.startswith(f"{field}_"):
+                self.categorical[field][name[len(field) + 1:]] = index
+                return
+
+    @property
+    def width(self) -> int:
+        return len(self.features)
+
+    @property
+    def source_fields(self) -> List[str]:
+        """Raw record fields the encoder reads; use as a MongoDB projection."""
+        fields = [field for field, _ in self.numeric] + [field for field, _, _ in self.binary]
+        fields += [field for field, columns in self.categorical.items() if columns]
+        if self.hobbies:
+            fields.append(HOBBIES_FIELD)
+        if self.csl:
+            fields.append(CSL_FIELD)
+        return fields
+
+    def encode_into(self, record: Mapping[str, Any], row: np.ndarray) -> None:
+        """Write one record's features into a zeroed row."""
+        for field, index in self.numeric:
+            value = record.get(field)
+            if _is_missing(value):
+                continue
+            try:
+                row[index] = float(value)
+            except (TypeError, ValueError):
+                pass
+
+        for field, index, mapping in self.binary:
+            value = record.get(field)
+            if isinstance(value, str):
+                row[index] = mapping.get(value, 0)
+            elif isinstance(value, float) and not math.isnan(value):
+                # Integers are deliberately not mapped: the pandas path saw them as
+                # numpy ints, which failed its isinstance check and encoded 0.
+                row[index] = int(value)
+
+        for field, normalize in CATEGORICAL_FIELDS.items():
+            columns = self.categorical[field]
+            value = record.get(field)
+            if not columns or not value:
+                continue
+            index = columns.get(normalize(str(value)))
+            if index is not None:
+                row[index] = 1
+
+        hobbies = record.get(HOBBIES_FIELD)
+        if self.hobbies and hobbies:
+            for hobby in str(hobbies).lower().split(","):
+                index = self.hobbies.get(hobby.strip())
+                if index is not None:
+                    row[index] = 1
+
+        csl = record.get(CSL_FIELD)
+        if self.csl and csl:
+            cleaned = str(csl).strip().replace(",", "").strip()
+            for code, index in self.csl:
+                if cleaned.endswith(code):
+                    row[index] = 1
+
+    def encode(self, records: Iterable[Optional[Mapping[str, Any]]]) -> np.ndarray:
+        """Encode records into an ``(n, width)`` float64 matrix, one row per record in order."""
+        records = records if isinstance(records, list) else list(records)
+        matrix = np.zeros((len(records), self.width), dtype=np.float64)
+        for row, record in zip(matrix, records):
+            if record:
+                self.encode_into(record, row)
+        return matrix
+
+    def encode_one(self, record: Mapping[str, Any]) -> np.ndarray:
+        return self.encode([record])
+
+
+_cached_encoder: Optional[FraudFeatureEncoder] = None
+_cached_features: Optional[Sequence[str]] = None
+
+
+def encoder_for(features: Sequence[str]) -> FraudFeatureEncoder:
+    """
+    Encoder for a features list. The model registry hands out the same list
+    object until the file changes, so an identity check is enough to reuse it.
+    """
+    global _cached_encoder, _cached_features
+    encoder = _cached_encoder
+    if encoder is None or _cached_features is not features:
+        encoder = FraudFeatureEncoder(features)
+        _cached_encoder, _cached_features = encoder, features
+    return encoder
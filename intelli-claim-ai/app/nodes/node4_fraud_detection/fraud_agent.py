@@ -1,7 +1,7 @@
 from datetime import datetime
 from .fraud_rules import round_amount_check
 from .benford import benford_score
-from .watchlist_scan import watchlist_match
+from .watchlist_scan import watchlist_hits
 from .anomaly_models import anomaly_score
 from .mongodb_fraud_classifier import classify_fraud_mongodb
 
@@ -206,11 +206,12 @@ def fraud_detection(node1_output, policy):
         rules_triggered.append(f"Benford anomaly (score: {b_score:.3f}) [{+0.1}]")
 
     # watchlist
-    matched, name_hit = watchlist_match(name)
-    if matched:
-        indicators.append(f"watchlist match: {name_hit}")
+    hits = watchlist_hits(name)
+    if hits:
+        names_hit = ", ".join(f"{hit.name} ({hit.score:.0f})" for hit in hits[:5])
+        indicators.append(f"watchlist match: {names_hit}")
         score += 0.3
-        rules_triggered.append(f"Watchlist match ({name_hit}) [{+0.3}]")
+        rules_triggered.append(f"Watchlist match ({len(hits)} hit(s): {names_hit}) [{+0.3}]")
 
     if rules_triggered:
         for rule in rules_triggered:
@@ -1,12 +1,22 @@
 import json
 import os
+import re
+import threading
+import time
+import unicodedata
+from dataclasses import dataclass
 from pathlib import Path
 
-from rapidfuzz import fuzz
+from rapidfuzz import fuzz, process
+
+from app.utils.fuzzy_index import NgramIndex
 
 
 WATCHLIST_DIR_ENV = "WATCHLIST_DIR"
 FUZZY_THRESHOLD_ENV = "WATCHLIST_FUZZY_THRESHOLD"
+RELOAD_CHECK_ENV = "WATCHLIST_RELOAD_CHECK_SECONDS"
+
+NON_ALNUM = re.compile(r"[^0-9A-Z]+")
 
 
 def _default_watchlist_dir():
@@ -26,19 +36,29 @@ def _get_threshold():
         return 85.0
 
 
-def _load_watchlist_entries():
-    watchlist_dir = _resolve_watchlist_dir()
-    if not watchlist_dir.exists():
+def _get_reload_check_seconds():
+    try:
+        return float(os.getenv(RELOAD_CHECK_ENV, "5"))
+    except ValueError:
+        return 5.0
+
+
+def _watchlist_files(watchlist_dir):
+    if not watchlist_dir.is_dir():
         return []
+    return sorted(
+        path for path in watchlist_dir.iterdir()
+        if path.is_file() and path.suffix.lower() in {".txt", ".json"}
+    )
 
+
+def _load_watchlist_entries(watchlist_dir=None):
     entries = []
-    for path in watchlist_dir.iterdir():
-        if not path.is_file():
-            continue
+    for path in _watchlist_files(watchlist_dir or _resolve_watchlist_dir()):
         if path.suffix.lower() == ".txt":
             lines = [line.strip() for line in path.read_text(encoding="utf-8").splitlines()]
             entries.extend([line for line in lines if line])
-        elif path.suffix.lower() == ".json":
+        else:
             try:
                 content = json.loads(path.read_text(encoding="utf-8"))
                 if isinstance(content, list):
@@ -57,14 +77,116 @@ def _load_watchlist_entries():
     return normalized
 
 
-def watchlist_match(name):
+def normalize_name(name):
+    """
+    Canonical form used for matching: accents folded, upper case, punctuation
+    dropped and tokens sorted. Plain ``fuzz.ratio`` on canonical forms equals
+    ``token_sort_ratio`` on the cleaned names, without re-sorting per comparison.
+    """
+    folded = unicodedata.normalize("NFKD", str(name)).encode("ascii", "ignore").decode("ascii")
+    return " ".join(sorted(NON_ALNUM.sub(" ", folded.upper()).split()))
+
+
+@dataclass(frozen=True)
+class WatchlistHit:
+    name: str
+    score: float
+
+
+class WatchlistIndex:
+    """
+    Pre-normalized watchlist. A bigram index narrows each lookup to the
+    entries that could still score above the threshold, so only those are
+    scored and the hits are exactly what a full scan would return.
+    """
+
+    def __init__(self, names):
+        self.names = []
+        self.canonical = []
+        self.index = NgramIndex()
+        by_canonical = set()
+        for name in names:
+            canonical = normalize_name(name)
+            if not canonical or canonical in by_canonical:
+                continue
+            by_canonical.add(canonical)
+            self.names.append(name)
+            self.canonical.append(canonical)
+            self.index.add(canonical)
+
+    def __len__(self):
+        return len(self.names)
+
+    def search(self, name, threshold):
+        """All entries scoring above ``threshold``, best first."""
+        canonical = normalize_name(name)
+        if not canonical:
+            return []
+        ids = self.index.candidates(canonical, threshold).tolist()
+        if not ids:
+            return []
+        matches = process.extract(
+            canonical,
+            [self.canonical[i] for i in ids],
+            scorer=fuzz.ratio,
+            score_cutoff=threshold,
+            limit=None,
+        )
+        hits = [WatchlistHit(self.names[ids[position]], round(score, 2)) for _, score, position in matches if score > threshold]
+        return sorted(hits, key=lambda hit: (-hit.score, hit.name))
+
+
+class _WatchlistCache:
+    """Keeps one index per watchlist directory and rebuilds it when any file changes."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._index = WatchlistIndex([])
+        self._signature = None
+        self._checked_at = 0.0
+
+    def _signature_of(self, watchlist_dir):
+        signature = [str(watchlist_dir)]
+        for path in _watchlist_files(watchlist_dir):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            signature.append((path.name, stat.st_mtime_ns, stat.st_ino, stat.st_size))
+        return tuple(signature)
+
+    def get(self):
+        now = time.monotonic()
+        if self._signature is not None and now - self._checked_at < _get_reload_check_seconds():
+            return self._index
+        with self._lock:
+            if self._signature is not None and now - self._checked_at < _get_reload_check_seconds():
+                return self._index
+            watchlist_dir = _resolve_watchlist_dir()
+            signature = self._signature_of(watchlist_dir)
+            if signature != self._signature:
+                self._index = WatchlistIndex(_load_watchlist_entries(watchlist_dir))
+                self._signature = signature
+            self._checked_at = time.monotonic()
+            return self._index
+
+    def invalidate(self):
+        with self._lock:
+            self._signature = None
+
+
+_watchlist_cache = _WatchlistCache()
+
+
+def watchlist_hits(name):
     if not name:
-        return False, None
+        return []
+    return _watchlist_cache.get().search(name, _get_threshold())
+
 
-    normalized_name = str(name).upper()
-    threshold = _get_threshold()
-    for watch_name in _load_watchlist_entries():
-        score = fuzz.token_sort_ratio(normalized_name, watch_name)
-        if score > threshold:
-            return True, watch_name
-    return False, None
\ No newline at end of file
+def watchlist_match(name):
+    """(matched, best matching watchlist name); see ``watchlist_hits`` for every hit."""
+    hits = watchlist_hits(name)
+    if not hits:
+        return False, None
+    return True, hits[0].name
@@ -0,0 +1,351 @@
+"""
+Mongo-backed background job queue for claim processing.
+
+Submissions are stored in the ``claim_jobs`` collection and picked up by an
+in-process worker pool, so no extra queue service is needed. Jobs are keyed
+by claim id (resubmitting the same claim returns the existing job), record
+the pipeline stage as nodes start and finish, and are retried with
+exponential backoff when Ollama or Mongo fail transiently.
+"""
+
+import logging
+import os
+import random
+import socket
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+import ollama
+import requests
+from pymongo import ASCENDING, ReturnDocument
+from pymongo.errors import AutoReconnect
+
+from app.services.progress_bus import progress_bus
+
+logger = logging.getLogger(__name__)
+
+WORKERS_ENV = "CLAIM_JOB_WORKERS"
+MAX_ATTEMPTS_ENV = "CLAIM_JOB_MAX_ATTEMPTS"
+BACKOFF_ENV = "CLAIM_JOB_BACKOFF_SECONDS"
+LEASE_ENV = "CLAIM_JOB_LEASE_SECONDS"
+POLL_ENV = "CLAIM_JOB_POLL_SECONDS"
+
+QUEUED = "QUEUED"
+RUNNING = "RUNNING"
+COMPLETED = "COMPLETED"
+FAILED = "FAILED"
+
+JobHandler = Callable[[Dict[str, Any], Callable[[Dict[str, Any]], None]], Dict[str, Any]]
+FailureHook = Callable[[Dict[str, Any]], None]
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def _utcnow() -> datetime:
+    return datetime.utcnow()
+
+
+def _jobs() -> Any:
+    # Imported here so the queue (and its tests) load without a MongoDB connection.
+    from app.database.mongo import claim_jobs_collection
+
+    return claim_jobs_collection
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    """Errors worth retrying: Ollama/Mongo unreachable, timeouts, overloaded server."""
+    if isinstance(exc, ollama.ResponseError):
+        return exc.status_code >= 500 or exc.status_code == 429
+    if isinstance(exc, requests.exceptions.HTTPError):
+        status = exc.response.status_code if exc.response is not None else 0
+        return status >= 500 or status == 429
+    return isinstance(
+        exc,
+        (
+            ConnectionError,
+            TimeoutError,
+            socket.timeout,
+            requests.exceptions.ConnectionError,
+            requests.exceptions.Timeout,
+            httpx.TransportError,
+            AutoReconnect,
+        ),
+    )
+
+
+def _public_job(job: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    if not job:
+        return None
+    return {
+        "job_id": job["_id"],
+        "claim_id": job["claim_id"],
+        "status": job["status"],
+        "stage": job.get("stage"),
+        "completed_nodes": job.get("completed_nodes", []),
+        "attempts": job.get("attempts", 0),
+        "error": job.get("error"),
+        "created_at": job.get("created_at"),
+        "updated_at": job.get("updated_at"),
+    }
+
+
+def get_job(job_id: str) -> Optional[Dict[str, Any]]:
+    return _public_job(_jobs().find_one({"_id": job_id}))
+
+
+def get_job_for_claim(claim_id: str) -> Optional[Dict[str, Any]]:
+    return _public_job(_jobs().find_one({"claim_id": claim_id}))
+
+
+def enqueue_claim_job(claim_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Queue a claim for processing. Idempotent by claim id: an existing job is
+    returned untouched unless it previously failed, in which case it is re-queued.
+    """
+    now = _utcnow()
+    job = _jobs().find_one_and_update(
+        {"claim_id": claim_id},
+        {
+            "$setOnInsert": {
+                "_id": uuid.uuid4().hex,
+                "claim_id": claim_id,
+                "status": QUEUED,
+                "stage": "queued",
+                "completed_nodes": [],
+                "payload": payload,
+                "attempts": 0,
+                "next_attempt_at": now,
+                "created_at": now,
+                "updated_at": now,
+            }
+        },
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+    if job["status"] == FAILED:
+        progress_bus.clear(claim_id)
+        job = _jobs().find_one_and_update(
+            {"_id": job["_id"], "status": FAILED},
+            {
+                "$set": {
+                    "status": QUEUED,
+                    "stage": "queued",
+                    "completed_nodes": [],
+                    "payload": payload,
+                    "attempts": 0,
+                    "error": None,
+                    "next_attempt_at": now,
+                    "updated_at": now,
+                }
+            },
+            return_document=ReturnDocument.AFTER,
+        ) or job
+    if job["status"] == QUEUED:
+        progress_bus.publish(claim_id, {"event": "job_queued", "job_id": job["_id"]})
+    _pool.notify()
+    return _public_job(job)
+
+
+def _fail_abandoned_jobs(max_attempts: int) -> None:
+    """Jobs whose lease expired on their last allowed attempt are failed instead of reclaimed."""
+    now = _utcnow()
+    abandoned = {"status": RUNNING, "lease_expires_at": {"$lt": now}, "attempts": {"$gte": max_attempts}}
+    for job in _jobs().find(abandoned, {"claim_id": 1, "attempts": 1}):
+        result = _jobs().update_one(
+            {"_id": job["_id"], **abandoned},
+            {
+                "$set": {
+                    "status": FAILED,
+                    "stage": "failed",
+                    "error": f"lease expired after {job.get('attempts', 0)} attempt(s)",
+                    "updated_at": now,
+                },
+                "$unset": {"lease_expires_at": "", "worker": ""},
+            },
+        )
+        if result.modified_count:
+            logger.error("Claim job %s abandoned by its worker on the last attempt; marking failed", job["_id"])
+            progress_bus.publish(job["claim_id"], {"event": "claim_failed", "error": "worker lease expired"})
+
+
+def _claim_next_job(worker_id: str, lease_seconds: float, max_attempts: int) -> Optional[Dict[str, Any]]:
+    _fail_abandoned_jobs(max_attempts)
+    now = _utcnow()
+    return _jobs().find_one_and_update(
+        {
+            "$or": [
+                {"status": QUEUED, "next_attempt_at": {"$lte": now}},
+                # A worker that died mid-job leaves its lease to expire.
+                {"status": RUNNING, "lease_expires_at": {"$lt": now}, "attempts": {"$lt": max_attempts}},
+            ]
+        },
+        {
+            "$set": {
+                "status": RUNNING,
+                "worker": worker_id,
+                "lease_expires_at": now + timedelta(seconds=lease_seconds),
+                "updated_at": now,
+            },
+            "$inc": {"attempts": 1},
+        },
+        sort=[("next_attempt_at", ASCENDING)],
+        return_document=ReturnDocument.AFTER,
+    )
+
+
+def _record_event(job: Dict[str, Any], event: Dict[str, Any], lease_seconds: float) -> None:
+    progress_bus.publish(job["claim_id"], event)
+    now = _utcnow()
+    # Every node event doubles as a heartbeat, so a long claim keeps its lease.
+    update: Dict[str, Any] = {"$set": {"updated_at": now, "lease_expires_at": now + timedelta(seconds=lease_seconds)}}
+    if event.get("event") == "node_started":
+        update["$set"]["stage"] = event["node"]
+    elif event.get("event") == "node_finished":
+        update["$addToSet"] = {"completed_nodes": event["node"]}
+    result = _jobs().update_one({"_id": job["_id"], "worker": job.get("worker")}, update)
+    if not result.matched_count:
+        logger.warning("Claim job %s lease was taken over by another worker", job["_id"])
+
+
+class ClaimJobWorkerPool:
+    def __init__(self):
+        self._threads: List[threading.Thread] = []
+        self._stop = threading.Event()
+        self._wake = threading.Condition()
+        self._handler: Optional[JobHandler] = None
+        self._on_failed: Optional[FailureHook] = None
+        self.max_attempts = int(_env_number(MAX_ATTEMPTS_ENV, 3))
+        self.backoff_seconds = _env_number(BACKOFF_ENV, 5.0)
+        self.lease_seconds = _env_number(LEASE_ENV, 900.0)
+        self.poll_seconds = _env_number(POLL_ENV, 2.0)
+
+    @property
+    def size(self) -> int:
+        return len(self._threads)
+
+    def start(self, handler: JobHandler, size: Optional[int] = None, on_failed: Optional[FailureHook] = None) -> None:
+        if self._threads:
+            return
+        size = int(_env_number(WORKERS_ENV, 2)) if size is None else size
+        self._handler = handler
+        self._on_failed = on_failed
+        self._stop.clear()
+        for index in range(max(size, 0)):
+            thread = threading.Thread(
+                target=self._run,
+                args=(f"{socket.gethostname()}-{os.getpid()}-{index}",),
+                name=f"claim-job-worker-{index}",
+                daemon=True,
+            )
+            thread.start()
+            self._threads.append(thread)
+        logger.info("Started %d claim job workers", len(self._threads))
+
+    def stop(self, timeout: float = 10.0) -> None:
+        self._stop.set()
+        self.notify(all_workers=True)
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def notify(self, all_workers: bool = False) -> None:
+        with self._wake:
+            if all_workers:
+                self._wake.notify_all()
+            else:
+                self._wake.notify()
+
+    def _run(self, worker_id: str) -> None:
+        while not self._stop.is_set():
+            try:
+                job = _claim_next_job(worker_id, self.lease_seconds, self.max_attempts)
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Claim job poll failed: %s", exc)
+                job = None
+            if job is None:
+                with self._wake:
+                    self._wake.wait(self.poll_seconds)
+                continue
+            try:
+                self._process(job)
+            except Exception as exc:  # noqa: BLE001
+                # Recording the outcome failed (e.g. Mongo down); the lease expires and the job is retried.
+                logger.exception("Claim job %s could not be finalized: %s", job.get("_id"), exc)
+
+    def _process(self, job: Dict[str, Any]) -> None:
+        job_id = job["_id"]
+        progress_bus.publish(job["claim_id"], {"event": "job_started", "attempt": job.get("attempts", 1)})
+        try:
+            result = self._handler(job, lambda event: _record_event(job, event, self.lease_seconds))
+        except Exception as exc:  # noqa: BLE001
+            self._fail(job, exc)
+            return
+
+        written = _jobs().update_one(
+            {"_id": job_id, "worker": job.get("worker")},
+            {
+                "$set": {
+                    "status": COMPLETED,
+                    "stage": "completed",
+                    "result": result,
+                    "error": None,
+                    "updated_at": _utcnow(),
+                },
+                "$unset": {"lease_expires_at": "", "worker": ""},
+            },
+        )
+        if not written.matched_count:
+            logger.warning("Claim job %s finished after losing its lease; result not recorded", job_id)
+            return
+        progress_bus.publish(job["claim_id"], {"event": "claim_completed", "status": result.get("status")})
+
+    def _fail(self, job: Dict[str, Any], exc: BaseException) -> None:
+        attempts = job.get("attempts", 1)
+        retry = is_transient_error(exc) and attempts < self.max_attempts
+        now = _utcnow()
+        update: Dict[str, Any] = {"error": f"{type(exc).__name__}: {exc}", "updated_at": now}
+        if retry:
+            # Exponential backoff with jitter so a recovering Ollama is not stampeded.
+            delay = self.backoff_seconds * (2 ** (attempts - 1)) * random.uniform(0.8, 1.2)
+            update.update({"status": QUEUED, "stage": "retry_scheduled", "next_attempt_at": now + timedelta(seconds=delay)})
+        else:
+            update.update({"status": FAILED, "stage": "failed"})
+        written = _jobs().update_one(
+            {"_id": job["_id"], "worker": job.get("worker")},
+            {"$set": update, "$unset": {"lease_expires_at": "", "worker": ""}},
+        )
+        if not written.matched_count:
+            logger.warning("Claim job %s failed after losing its lease: %s", job["_id"], exc)
+            return
+        if retry:
+            logger.warning("Claim job %s failed transiently (attempt %d), retrying in %.1fs: %s", job["_id"], attempts, delay, exc)
+            progress_bus.publish(job["claim_id"], {"event": "retry_scheduled", "delay_seconds": round(delay, 1), "error": update["error"]})
+        else:
+            logger.error("Claim job %s failed after %d attempt(s): %s", job["_id"], attempts, exc)
+            progress_bus.publish(job["claim_id"], {"event": "claim_failed", "error": update["error"]})
+            if self._on_failed is not None:
+                try:
+                    self._on_failed(job)
+                except Exception as hook_exc:  # noqa: BLE001
+                    logger.warning("Cleanup for failed claim job %s failed: %s", job["_id"], hook_exc)
+
+
+_pool = ClaimJobWorkerPool()
+
+
+def start_claim_workers(handler: JobHandler, size: Optional[int] = None, on_failed: Optional[FailureHook] = None) -> int:
+    """``on_failed`` runs once a job has failed for good (no retry left)."""
+    _pool.start(handler, size, on_failed)
+    return _pool.size
+
+
+def stop_claim_workers() -> None:
+    _pool.stop()
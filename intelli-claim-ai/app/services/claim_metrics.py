@@ -0,0 +1,245 @@
+"""
+Incrementally maintained claim metrics for the admin dashboard.
+
+The ``claim_metrics`` collection holds one ``totals`` document (claims by
+status and by type, running sums and counts for the averages) and one document per day
+(``day:YYYY-MM-DD``) with the claims created and reviews made that day, for
+trends. Creating or reviewing a claim applies a single ``$inc``; the
+dashboard reads one document instead of grouping the whole claims
+collection on every load.
+
+Counts start from whatever existed before this rollup through ``rebuild``,
+which runs once on the first dashboard read (or by hand):
+
+    python -m app.services.claim_metrics --rebuild
+"""
+
+import argparse
+import json
+import logging
+import re
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from pymongo.errors import PyMongoError
+
+logger = logging.getLogger(__name__)
+
+TOTALS_ID = "totals"
+# Bump when the totals document gains fields; an older one is rebuilt on the next read.
+ROLLUP_VERSION = 2
+FLAGGED_STATUSES = ("FLAGGED_FOR_REVIEW", "ESCALATED_FRAUD_REVIEW")
+
+UNSAFE_KEY = re.compile(r"[.$]")
+
+
+def _key(value: Any, default: str = "Unknown") -> str:
+    """Statuses and claim types become field names, so dots and dollars are replaced."""
+    return UNSAFE_KEY.sub("_", str(value)) if value else default
+
+
+def _day_id(moment: datetime) -> str:
+    return f"day:{moment:%Y-%m-%d}"
+
+
+def _measured(value: Any) -> bool:
+    """Whether ``$avg`` would count the value: numbers only, not missing, null or strings."""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _number(value: Any) -> float:
+    try:
+        return float(value or 0.0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _current(totals: Optional[Dict[str, Any]]) -> bool:
+    return bool(totals and totals.get("seeded_at") and totals.get("version") == ROLLUP_VERSION)
+
+
+def _average(totals: Dict[str, Any], field: str) -> float:
+    count = _number(totals.get(f"{field}_count"))
+    return _number(totals.get(f"{field}_sum")) / count if count else 0.0
+
+
+class ClaimMetrics:
+    def __init__(self, collection: Any = None, claims: Any = None):
+        self._collection = collection
+        self._claims = claims
+        self._seed_lock = threading.Lock()
+
+    @property
+    def collection(self) -> Any:
+        if self._collection is None:
+            from app.database.mongo import claim_metrics_collection
+
+            self._collection = claim_metrics_collection
+        return self._collection
+
+    @property
+    def claims(self) -> Any:
+        if self._claims is None:
+            from app.database.mongo import claims_collection
+
+            self._claims = claims_collection
+        return self._claims
+
+    def _apply(self, document_id: str, increments: Dict[str, float], fields: Optional[Dict[str, Any]] = None) -> None:
+        update: Dict[str, Any] = {"$inc": increments, "$set": {"updated_at": datetime.utcnow()}}
+        if fields:
+            update["$setOnInsert"] = fields
+        try:
+            self.collection.update_one({"_id": document_id}, update, upsert=True)
+        except PyMongoError as exc:
+            # The claim itself is already written; a missed increment is fixed by the next rebuild.
+            logger.warning("Could not update claim metrics %s: %s", document_id, exc)
+
+    # --- write path ---
+
+    def record_created(self, claim: Dict[str, Any]) -> None:
+        status = _key(claim.get("status"), "PENDING_REVIEW")
+        claim_type = _key(claim.get("claim_type"))
+        fraud_score, processing_minutes = claim.get("fraud_score"), claim.get("processing_minutes")
+        increments = {
+            "claims": 1,
+            f"by_type.{claim_type}": 1,
+            "fraud_score_sum": fraud_score if _measured(fraud_score) else 0.0,
+            "fraud_score_count": int(_measured(fraud_score)),
+            "claim_amount_sum": _number(claim.get("claim_amount")),
+            "processing_minutes_sum": processing_minutes if _measured(processing_minutes) else 0.0,
+            "processing_minutes_count": int(_measured(processing_minutes)),
+        }
+        self._apply(TOTALS_ID, {**increments, f"by_status.{status}": 1})
+        # Day buckets keep creations by type; status moves are tracked as that day's reviews.
+        created_at = claim.get("created_at") or datetime.utcnow()
+        day = datetime(created_at.year, created_at.month, created_at.day)
+        self._apply(_day_id(created_at), increments, {"day": day})
+
+    def record_reviewed(self, previous_status: Optional[str], new_status: str, reviewed_at: Optional[datetime] = None) -> None:
+        previous, new = _key(previous_status, "PENDING_REVIEW"), _key(new_status)
+        if previous != new:
+            self._apply(TOTALS_ID, {f"by_status.{previous}": -1, f"by_status.{new}": 1})
+        reviewed_at = reviewed_at or datetime.utcnow()
+        day = datetime(reviewed_at.year, reviewed_at.month, reviewed_at.day)
+        self._apply(_day_id(reviewed_at), {"reviews": 1, f"reviewed.{new}": 1}, {"day": day})
+
+    # --- read path ---
+
+    def totals(self) -> Dict[str, Any]:
+        document = self.collection.find_one({"_id": TOTALS_ID})
+        if not _current(document):
+            with self._seed_lock:
+                document = self.collection.find_one({"_id": TOTALS_ID})
+                if not _current(document):
+                    document = self.rebuild()
+        return document
+
+    def summary(self) -> Dict[str, Any]:
+        """Same shape ``get_admin_metrics`` used to compute with a ``$group``, plus counts by type."""
+        totals = self.totals()
+        total = int(totals.get("claims", 0))
+        by_status = totals.get("by_status") or {}
+        return {
+            "total_claims": total,
+            "approved": int(by_status.get("APPROVED", 0)),
+            "flagged": int(sum(by_status.get(status, 0) for status in FLAGGED_STATUSES)),
+            # Averages over the claims that have the value, as ``$avg`` skips missing fields.
+            "avg_fraud_score": _average(totals, "fraud_score"),
+            "avg_process_minutes": _average(totals, "processing_minutes"),
+            "by_status": {status: int(count) for status, count in by_status.items()},
+            "by_type": {claim_type: int(count) for claim_type, count in (totals.get("by_type") or {}).items()},
+        }
+
+    def trend(self, days: int = 30, today: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """One row per day for the last ``days`` days, oldest first; days without activity are zero."""
+        today = today or datetime.utcnow()
+        first = today - timedelta(days=days - 1)
+        stored = {
+            document["_id"]: document
+            for document in self.collection.find({"_id": {"$gte": _day_id(first), "$lte": _day_id(today)}})
+        }
+        rows = []
+        for offset in range(days):
+            moment = first + timedelta(days=offset)
+            document = stored.get(_day_id(moment), {})
+            rows.append({
+                "day": f"{moment:%Y-%m-%d}",
+                "claims": int(document.get("claims", 0)),
+                "reviews": int(document.get("reviews", 0)),
+                "by_type": document.get("by_type", {}),
+                "reviewed": document.get("reviewed", {}),
+                "claim_amount_sum": _number(document.get("claim_amount_sum")),
+            })
+        return rows
+
+    # --- seeding ---
+
+    def rebuild(self) -> Dict[str, Any]:
+        """
+        Recompute the totals and the daily creation buckets from the claims
+        collection. Increments that land while it runs can be lost, so beyond
+        the automatic first seed, run it only while claims are not being written.
+        """
+        sums = {
+            "claims": {"$sum": 1},
+            "fraud_score_sum": {"$sum": {"$ifNull": ["$fraud_score", 0]}},
+            "fraud_score_count": {"$sum": {"$cond": [{"$isNumber": "$fraud_score"}, 1, 0]}},
+            "claim_amount_sum": {"$sum": {"$ifNull": ["$claim_amount", 0]}},
+            "processing_minutes_sum": {"$sum": {"$ifNull": ["$processing_minutes", 0]}},
+            "processing_minutes_count": {"$sum": {"$cond": [{"$isNumber": "$processing_minutes"}, 1, 0]}},
+        }
+        pipeline = [
+            {
+                "$group": {
+                    "_id": {
+                        "status": "$status",
+                        "type": "$claim_type",
+                        "day": {"$dateToString": {"format": "%Y-%m-%d", "date": {"$ifNull": ["$created_at", "$$NOW"]}}},
+                    },
+                    **sums,
+                }
+            }
+        ]
+        totals: Dict[str, Any] = {**{field: 0 for field in sums}, "by_status": {}, "by_type": {}}
+        days: Dict[str, Dict[str, Any]] = {}
+        for row in self.claims.aggregate(pipeline, allowDiskUse=True):
+            group = row["_id"]
+            status, claim_type = _key(group.get("status"), "PENDING_REVIEW"), _key(group.get("type"))
+            day = days.setdefault(group["day"], {**{field: 0 for field in sums}, "by_type": {}})
+            for target in (totals, day):
+                for field in sums:
+                    target[field] += row[field]
+                target["by_type"][claim_type] = target["by_type"].get(claim_type, 0) + row["claims"]
+            totals["by_status"][status] = totals["by_status"].get(status, 0) + row["claims"]
+
+        now = datetime.utcnow()
+        for day_key, values in days.items():
+            self.collection.update_one(
+                {"_id": f"day:{day_key}"},
+                {"$set": {**values, "day": datetime.strptime(day_key, "%Y-%m-%d"), "updated_at": now}},
+                upsert=True,
+            )
+        document = {"_id": TOTALS_ID, **totals, "version": ROLLUP_VERSION, "seeded_at": now, "updated_at": now}
+        self.collection.replace_one({"_id": TOTALS_ID}, document, upsert=True)
+        logger.info("Claim metrics rebuilt: %d claims over %d days", totals["claims"], len(days))
+        return document
+
+
+claim_metrics = ClaimMetrics()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain the claim metrics rollup")
+    parser.add_argument("--rebuild", action="store_true", help="recompute the rollup from the claims collection")
+    args = parser.parse_args()
+    if not args.rebuild:
+        parser.error("nothing to do (pass --rebuild)")
+
+    logging.basicConfig(level=logging.INFO)
+    print(json.dumps(claim_metrics.rebuild(), default=str, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""
+Prefix search over claims without regex scans.
+
+Every claim stores ``search_tokens``: the words of its claim id, claimer
+name, email and claim type, lower-cased, with each word's leading edge
+n-grams ("jo", "joh", "john"). A search splits the query the same way and
+matches ``{"search_tokens": {"$all": terms}}``, so every query word is a
+prefix match that runs on the multikey ``(search_tokens, created_at)`` index
+instead of four unanchored regexes over the whole collection. The user's
+text never reaches a regex.
+
+Matches are read newest first through the index, at most
+``CLAIM_SEARCH_CANDIDATES`` of them, ranked in process (exact words beat
+prefixes, claim id and email beat name and type), and only the top rows
+are fetched in full. Work per search is bounded by that cap rather than by
+the size of the collection.
+
+Claims written before this existed (or under an older ``SEARCH_VERSION``)
+are tokenized by the backfill. The API runs it in the background on every
+start, where it only touches claims that are not current yet; it can also
+be run by hand:
+
+    python -m app.services.claim_search --backfill
+"""
+
+import argparse
+import json
+import logging
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from pymongo import UpdateOne
+
+logger = logging.getLogger(__name__)
+
+TOKENS_FIELD = "search_tokens"
+VERSION_FIELD = "search_version"
+# Bump when tokenization changes so the backfill re-tokenizes every claim.
+SEARCH_VERSION = 1
+
+CANDIDATES_ENV = "CLAIM_SEARCH_CANDIDATES"
+MIN_PREFIX = 2
+MAX_PREFIX = 20
+
+WORD = re.compile(r"[0-9a-z]+")
+
+# (field, weight): a hit on the claim id or email says more than one on a common name or type.
+FIELD_WEIGHTS: Tuple[Tuple[str, float], ...] = (
+    ("claim_id", 4.0),
+    ("claimer.email", 3.0),
+    ("claimer.name", 2.0),
+    ("claim_type", 1.0),
+)
+PROJECTION = {"_id": 0, "claim_id": 1, "claimer.name": 1, "claimer.email": 1, "claim_type": 1, "created_at": 1}
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(int(os.getenv(name, default)), 1)
+    except ValueError:
+        return default
+
+
+def _field(document: Dict[str, Any], dotted: str) -> Any:
+    value: Any = document
+    for part in dotted.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def words(text: Any) -> List[str]:
+    if not text:
+        return []
+    return WORD.findall(str(text).lower())
+
+
+def claim_search_tokens(claim: Dict[str, Any]) -> List[str]:
+    """Every word of the searchable fields plus its edge n-grams, deduplicated."""
+    tokens = set()
+    for field, _ in FIELD_WEIGHTS:
+        for word in words(_field(claim, field)):
+            tokens.add(word[:MAX_PREFIX])
+            tokens.update(word[:length] for length in range(MIN_PREFIX, min(len(word), MAX_PREFIX) + 1))
+    return sorted(tokens)
+
+
+def query_terms(text: Any) -> List[str]:
+    """Index terms for a query, most selective (longest) first; single characters are dropped."""
+    terms = {word[:MAX_PREFIX] for word in words(text) if len(word) >= MIN_PREFIX}
+    return sorted(terms, key=lambda term: (-len(term), term))
+
+
+def search_fields(claim: Dict[str, Any]) -> Dict[str, Any]:
+    """Fields to store on a claim whenever its searchable fields are written."""
+    return {TOKENS_FIELD: claim_search_tokens(claim), VERSION_FIELD: SEARCH_VERSION}
+
+
+def _field_words(claim: Dict[str, Any]) -> List[Tuple[float, List[str]]]:
+    return [(weight, words(_field(claim, field))) for field, weight in FIELD_WEIGHTS]
+
+
+def rank(claim: Dict[str, Any], query_words: List[str]) -> Optional[float]:
+    """
+    Relevance of ``claim``, or None when some query word is not a prefix of
+    any of its words (query words longer than ``MAX_PREFIX`` are only
+    checked in full here).
+    """
+    fields = _field_words(claim)
+    score = 0.0
+    for query_word in query_words:
+        best = 0.0
+        for weight, field_words in fields:
+            if query_word in field_words:
+                best = max(best, weight * 2)
+            elif any(word.startswith(query_word) for word in field_words):
+                best = max(best, weight)
+        if not best:
+            return None
+        score += best
+    whole = " ".join(query_words)
+    score += sum(weight * 2 for weight, field_words in fields if " ".join(field_words) == whole)
+    return score
+
+
+def search_claims(
+    collection: Any,
+    text: str,
+    filters: Optional[Dict[str, Any]] = None,
+    limit: int = 50,
+    projection: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    """Claims matching every word of ``text`` as a prefix, best ranked first."""
+    terms = query_terms(text)
+    if not terms:
+        return []
+    query = {**(filters or {}), TOKENS_FIELD: {"$all": terms}}
+    candidates = (
+        collection.find(query, PROJECTION)
+        .sort("created_at", -1)
+        .limit(max(_env_int(CANDIDATES_ENV, 500), limit))
+    )
+    query_words = [word for word in words(text) if len(word) >= MIN_PREFIX]
+    ranked = []
+    for position, claim in enumerate(candidates):
+        score = rank(claim, query_words)
+        if score is not None:
+            ranked.append((-score, position, claim.get("claim_id")))
+    # Ties keep index order, i.e. newest first.
+    top_ids = [claim_id for _, _, claim_id in sorted(ranked)[:limit]]
+    if not top_ids:
+        return []
+    rows = {row.get("claim_id"): row for row in collection.find({"claim_id": {"$in": top_ids}}, projection or {"_id": 0})}
+    return [rows[claim_id] for claim_id in top_ids if claim_id in rows]
+
+
+def backfill_search_tokens(collection: Any = None, batch_size: int = 1000, dry_run: bool = False) -> Dict[str, Any]:
+    """Tokenize every claim written before search tokens (or under an older ``SEARCH_VERSION``)."""
+    if collection is None:
+        from app.database.mongo import claims_collection as collection
+    started = time.perf_counter()
+    stats = {"scanned": 0, "written": 0, "dry_run": dry_run}
+    projection = {field: 1 for field, _ in FIELD_WEIGHTS}
+    cursor = collection.find({VERSION_FIELD: {"$ne": SEARCH_VERSION}}, projection, batch_size=batch_size)
+    batch: List[UpdateOne] = []
+    for claim in cursor:
+        stats["scanned"] += 1
+        batch.append(UpdateOne({"_id": claim["_id"]}, {"$set": search_fields(claim)}))
+        if len(batch) >= batch_size:
+            stats["written"] += _write(collection, batch, dry_run)
+            batch = []
+    stats["written"] += _write(collection, batch, dry_run)
+    stats["seconds"] = round(time.perf_counter() - started, 3)
+    logger.info("Claim search backfill finished: %s", stats)
+    return stats
+
+
+def start_search_backfill(collection: Any = None) -> threading.Thread:
+    """Run the backfill once on a background thread, so startup does not wait on it."""
+
+    def run() -> None:
+        try:
+            backfill_search_tokens(collection)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Claim search backfill failed: %s", exc)
+
+    thread = threading.Thread(target=run, name="claim-search-backfill", daemon=True)
+    thread.start()
+    return thread
+
+
+def _write(collection: Any, operations: Iterable[UpdateOne], dry_run: bool) -> int:
+    operations = list(operations)
+    if not operations or dry_run:
+        return 0
+    return collection.bulk_write(operations, ordered=False).modified_count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain claim search tokens")
+    parser.add_argument("--backfill", action="store_true", help="tokenize claims missing current search tokens")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+    if not args.backfill:
+        parser.error("nothing to do (pass --backfill)")
+
+    logging.basicConfig(level=logging.INFO)
+    print(json.dumps(backfill_search_tokens(batch_size=args.batch_size, dry_run=args.dry_run), indent=2))
+
+
+if __name__ == "__main__":
+    main()
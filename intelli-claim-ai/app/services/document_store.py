@@ -0,0 +1,313 @@
+"""
+On-disk document store for claim uploads and their derived files.
+
+Layout under ``DOCUMENT_STORE_ROOT`` (default ``temp_images/uploads``):
+
+    blobs/<sha[:2]>/<sha><ext>     uploaded documents, content-addressed
+    claims/<claim_id>/pages/...    rasterized pages and other intermediates
+    incoming/                      partial uploads still being written
+    store.sqlite3                  blob reference counts, claim -> blob refs
+
+Blobs are shared between claims and kept while any claim references them.
+Everything under ``claims/`` is scratch that can be regenerated, so the
+background compactor deletes it after a retention window, along with
+unreferenced blobs and abandoned partial uploads. That keeps disk use and
+inode counts bounded on long-running workers.
+"""
+
+import logging
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+STORE_ROOT_ENV = "DOCUMENT_STORE_ROOT"
+SCRATCH_RETENTION_ENV = "DOCUMENT_SCRATCH_RETENTION_HOURS"
+ORPHAN_GRACE_ENV = "DOCUMENT_ORPHAN_GRACE_HOURS"
+COMPACT_INTERVAL_ENV = "DOCUMENT_COMPACT_INTERVAL_SECONDS"
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def _safe_segment(value: str) -> str:
+    cleaned = "".join(c if c.isalnum() or c in "-_." else "_" for c in value).strip(".")
+    return cleaned or "_"
+
+
+def _age_seconds(path: str, now: float) -> float:
+    try:
+        return now - os.stat(path).st_mtime
+    except OSError:
+        return 0.0
+
+
+class DocumentStore:
+    def __init__(self, root: str):
+        self.root = root
+        self.blob_root = os.path.join(root, "blobs")
+        self.claims_root = os.path.join(root, "claims")
+        self.incoming_root = os.path.join(root, "incoming")
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(self.root, exist_ok=True)
+            conn = sqlite3.connect(os.path.join(self.root, "store.sqlite3"), timeout=5, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS blobs ("
+                "sha256 TEXT PRIMARY KEY, path TEXT NOT NULL, size INTEGER NOT NULL, "
+                "refcount INTEGER NOT NULL DEFAULT 0, created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS claim_refs ("
+                "claim_id TEXT NOT NULL, sha256 TEXT NOT NULL, filename TEXT, created_at REAL NOT NULL, "
+                "PRIMARY KEY (claim_id, sha256))"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_blobs_refcount ON blobs(refcount, updated_at)")
+            self._conn = conn
+        return self._conn
+
+    # --- blobs ---
+
+    def blob_path(self, sha256: str, ext: str) -> str:
+        return os.path.join(self.blob_root, sha256[:2], f"{sha256}{ext}")
+
+    def new_part_path(self) -> str:
+        os.makedirs(self.incoming_root, exist_ok=True)
+        return os.path.join(self.incoming_root, f"{uuid.uuid4().hex}.part")
+
+    def commit_blob(self, part_path: str, sha256: str, ext: str, size: int) -> Tuple[str, bool]:
+        """
+        Move a fully written part file into place as a blob. Returns (path, created);
+        created is False when the content was already stored and the part was dropped.
+        """
+        path = self.blob_path(sha256, ext)
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            created = not os.path.exists(path)
+            if created:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(part_path, path)
+            else:
+                os.remove(part_path)
+            conn.execute(
+                "INSERT INTO blobs (sha256, path, size, refcount, created_at, updated_at) VALUES (?, ?, ?, 0, ?, ?) "
+                "ON CONFLICT(sha256) DO UPDATE SET path = excluded.path, updated_at = excluded.updated_at",
+                (sha256, path, size, now, now),
+            )
+            conn.commit()
+        return path, created
+
+    # --- references ---
+
+    def add_refs(self, claim_id: str, blobs: Iterable[Tuple[str, str]]) -> List[str]:
+        """
+        Reference (sha256, filename) blobs from a claim. Re-adding an existing ref
+        is a no-op; returns the sha256s this call newly referenced.
+        """
+        now = time.time()
+        added = []
+        with self._lock:
+            conn = self._connection()
+            for sha256, filename in blobs:
+                inserted = conn.execute(
+                    "INSERT OR IGNORE INTO claim_refs (claim_id, sha256, filename, created_at) VALUES (?, ?, ?, ?)",
+                    (claim_id, sha256, filename, now),
+                ).rowcount
+                if inserted:
+                    conn.execute(
+                        "UPDATE blobs SET refcount = refcount + 1, updated_at = ? WHERE sha256 = ?", (now, sha256)
+                    )
+                    added.append(sha256)
+            conn.commit()
+        return added
+
+    def _drop_refs(self, conn: sqlite3.Connection, claim_id: str, shas: Iterable[str]) -> None:
+        now = time.time()
+        for sha256 in shas:
+            deleted = conn.execute(
+                "DELETE FROM claim_refs WHERE claim_id = ? AND sha256 = ?", (claim_id, sha256)
+            ).rowcount
+            if deleted:
+                conn.execute(
+                    "UPDATE blobs SET refcount = MAX(refcount - 1, 0), updated_at = ? WHERE sha256 = ?", (now, sha256)
+                )
+
+    def release_refs(self, claim_id: str, shas: Iterable[str]) -> None:
+        """Drop only the given references of a claim, e.g. the ones one failed request added."""
+        with self._lock:
+            conn = self._connection()
+            self._drop_refs(conn, claim_id, shas)
+            conn.commit()
+
+    def release_claim(self, claim_id: str) -> None:
+        """Drop a claim's references and scratch files; blobs go once unreferenced."""
+        with self._lock:
+            conn = self._connection()
+            shas = [row[0] for row in conn.execute("SELECT sha256 FROM claim_refs WHERE claim_id = ?", (claim_id,))]
+            self._drop_refs(conn, claim_id, shas)
+            conn.commit()
+        shutil.rmtree(self.claim_dir(claim_id, create=False), ignore_errors=True)
+
+    def refcount(self, sha256: str) -> int:
+        with self._lock:
+            row = self._connection().execute("SELECT refcount FROM blobs WHERE sha256 = ?", (sha256,)).fetchone()
+        return row[0] if row else 0
+
+    # --- per-claim scratch ---
+
+    def claim_dir(self, claim_id: Optional[str], create: bool = True) -> str:
+        path = os.path.join(self.claims_root, _safe_segment(claim_id or "_unassigned"))
+        if create:
+            os.makedirs(path, exist_ok=True)
+        return path
+
+    def scratch_dir(self, claim_id: Optional[str], kind: str = "pages") -> str:
+        """A fresh directory per call, so concurrent work on one claim never collides."""
+        path = os.path.join(self.claim_dir(claim_id, create=False), kind, uuid.uuid4().hex[:12])
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    # --- compaction ---
+
+    def compact(self, scratch_retention_seconds: float, orphan_grace_seconds: float) -> Dict[str, int]:
+        now = time.time()
+        stats = {"scratch_dirs": 0, "orphan_blobs": 0, "stale_parts": 0, "bytes_freed": 0}
+
+        if os.path.isdir(self.claims_root):
+            for claim_name in os.listdir(self.claims_root):
+                claim_path = os.path.join(self.claims_root, claim_name)
+                for kind in os.listdir(claim_path) if os.path.isdir(claim_path) else []:
+                    kind_path = os.path.join(claim_path, kind)
+                    for entry in os.listdir(kind_path) if os.path.isdir(kind_path) else []:
+                        entry_path = os.path.join(kind_path, entry)
+                        if _age_seconds(entry_path, now) > scratch_retention_seconds:
+                            stats["bytes_freed"] += _tree_size(entry_path)
+                            shutil.rmtree(entry_path, ignore_errors=True)
+                            stats["scratch_dirs"] += 1
+                _remove_empty_dirs(claim_path)
+
+        if os.path.isdir(self.incoming_root):
+            for name in os.listdir(self.incoming_root):
+                part_path = os.path.join(self.incoming_root, name)
+                if _age_seconds(part_path, now) > orphan_grace_seconds:
+                    stats["bytes_freed"] += _tree_size(part_path)
+                    _remove_file(part_path)
+                    stats["stale_parts"] += 1
+
+        with self._lock:
+            conn = self._connection()
+            orphans = conn.execute(
+                "SELECT sha256, path, size FROM blobs WHERE refcount = 0 AND updated_at < ?",
+                (now - orphan_grace_seconds,),
+            ).fetchall()
+            for sha256, path, size in orphans:
+                _remove_file(path)
+                conn.execute("DELETE FROM blobs WHERE sha256 = ? AND refcount = 0", (sha256,))
+                stats["orphan_blobs"] += 1
+                stats["bytes_freed"] += size
+            conn.commit()
+
+        if any(stats.values()):
+            logger.info("Document store compaction: %s", stats)
+        return stats
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            conn = self._connection()
+            blobs, blob_bytes, unreferenced = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(refcount = 0), 0) FROM blobs"
+            ).fetchone()
+            claims = conn.execute("SELECT COUNT(DISTINCT claim_id) FROM claim_refs").fetchone()[0]
+        return {"blobs": blobs, "blob_bytes": blob_bytes, "unreferenced_blobs": unreferenced, "claims": claims}
+
+
+def _remove_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _tree_size(path: str) -> int:
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    total = 0
+    for folder, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(folder, name))
+            except OSError:
+                pass
+    return total
+
+
+def _remove_empty_dirs(path: str) -> None:
+    for folder, _, _ in sorted(os.walk(path), key=lambda item: len(item[0]), reverse=True):
+        try:
+            os.rmdir(folder)
+        except OSError:
+            pass
+
+
+class DocumentCompactor:
+    """Background thread that runs ``DocumentStore.compact`` on an interval."""
+
+    def __init__(self, store: DocumentStore):
+        self.store = store
+        self.interval_seconds = _env_number(COMPACT_INTERVAL_ENV, 600.0)
+        self.scratch_retention_seconds = _env_number(SCRATCH_RETENTION_ENV, 24.0) * 3600
+        self.orphan_grace_seconds = _env_number(ORPHAN_GRACE_ENV, 1.0) * 3600
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.last_run: Dict[str, Any] = {}
+
+    def run_once(self) -> Dict[str, int]:
+        stats = self.store.compact(self.scratch_retention_seconds, self.orphan_grace_seconds)
+        self.last_run = {**stats, "finished_at": time.time()}
+        return stats
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                self.run_once()
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Document store compaction failed: %s", exc)
+
+    def start(self) -> None:
+        if self._thread is not None or self.interval_seconds <= 0:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="document-compactor", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+
+document_store = DocumentStore(os.getenv(STORE_ROOT_ENV, os.path.join("temp_images", "uploads")))
+document_compactor = DocumentCompactor(document_store)
+
+
+def start_document_compactor() -> None:
+    document_compactor.start()
+
+
+def stop_document_compactor() -> None:
+    document_compactor.stop()
@@ -0,0 +1,160 @@
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from app.utils.hashing import hash_text
+
+logger = logging.getLogger(__name__)
+
+CACHE_PATH_ENV = "LLM_CACHE_PATH"
+CACHE_TTL_ENV = "LLM_CACHE_TTL_SECONDS"
+CACHE_MAX_ENTRIES_ENV = "LLM_CACHE_MAX_ENTRIES"
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_input(text: str) -> str:
+    """OCR runs differ in spacing and line breaks; the model's answer does not."""
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+class LlmResponseCache:
+    """
+    Persistent cache of raw JSON responses for deterministic-format LLM prompts.
+
+    Keys are (model, prompt template + version, hash of the normalized input),
+    so re-running a claim (relearning, regression replays) skips Ollama while a
+    model swap or template edit -- bump its version -- misses. Entries live in
+    SQLite so they survive restarts and are shared by worker processes; they
+    expire after ``ttl_seconds`` and the least recently used are evicted past
+    ``max_entries``.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float, max_entries: int):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "writes": 0, "evictions": 0, "errors": 0}
+
+    @staticmethod
+    def make_key(model: str, template: str, version: int, text: str) -> str:
+        return hash_text(f"{model}:{template}:v{version}:{hash_text(normalize_input(text))}")
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_responses ("
+                "key TEXT PRIMARY KEY, response TEXT NOT NULL, "
+                "created_at REAL NOT NULL, last_used_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_responses_last_used ON llm_responses(last_used_at)")
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            try:
+                conn = self._connection()
+                row = conn.execute("SELECT response, created_at FROM llm_responses WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    self._stats["misses"] += 1
+                    return None
+                response, created_at = row
+                if now - created_at > self.ttl_seconds:
+                    conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                    conn.commit()
+                    self._stats["expired"] += 1
+                    self._stats["misses"] += 1
+                    return None
+                conn.execute("UPDATE llm_responses SET last_used_at = ? WHERE key = ?", (now, key))
+                conn.commit()
+            except sqlite3.Error as exc:
+                logger.warning(f"LLM cache read failed: {exc}")
+                self._stats["errors"] += 1
+                self._stats["misses"] += 1
+                return None
+            self._stats["hits"] += 1
+            return response
+
+    def put(self, key: str, response: str) -> None:
+        now = time.time()
+        with self._lock:
+            try:
+                conn = self._connection()
+                conn.execute(
+                    "INSERT OR REPLACE INTO llm_responses (key, response, created_at, last_used_at) VALUES (?, ?, ?, ?)",
+                    (key, response, now, now),
+                )
+                self._stats["writes"] += 1
+                overflow = conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0] - self.max_entries
+                if overflow > 0:
+                    conn.execute(
+                        "DELETE FROM llm_responses WHERE key IN "
+                        "(SELECT key FROM llm_responses ORDER BY last_used_at LIMIT ?)",
+                        (overflow,),
+                    )
+                    self._stats["evictions"] += overflow
+                conn.commit()
+            except sqlite3.Error as exc:
+                logger.warning(f"Could not persist LLM cache entry {key}: {exc}")
+                self._stats["errors"] += 1
+
+    def put_if_json(self, key: str, response: str) -> bool:
+        """Only well-formed JSON is cached, so a garbled answer is retried next time."""
+        try:
+            json.loads(response)
+        except (TypeError, ValueError):
+            return False
+        self.put(key, response)
+        return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection().execute("DELETE FROM llm_responses")
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            try:
+                entries = self._connection().execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+            except sqlite3.Error:
+                entries = None
+            return {
+                **self._stats,
+                "entries": entries,
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+llm_cache = LlmResponseCache(
+    path=os.getenv(CACHE_PATH_ENV, os.path.join("temp_images", "llm_cache.sqlite3")),
+    ttl_seconds=_env_number(CACHE_TTL_ENV, 7 * 24 * 3600),
+    max_entries=int(_env_number(CACHE_MAX_ENTRIES_ENV, 20000)),
+)
@@ -1,40 +1,45 @@
 import json
+import logging
 import os
-import requests
 import base64
 from typing import Any, Dict, List, Optional
 
+from app.services.llm_cache import LlmResponseCache, llm_cache
+from app.services.ollama_client import OllamaClient, OllamaUnavailableError, ollama_client
+from app.services.prompt_budget import fit_text
+
+logger = logging.getLogger(__name__)
+
+# Bump when the analyze_claim_context prompt changes so cached answers miss.
+CONTEXT_ANALYSIS_PROMPT_VERSION = 2
+
 class LLMService:
-    def __init__(self):
-        self.base_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+    def __init__(self, client: Optional[OllamaClient] = None):
+        self.client = client or ollama_client
         self.model = "gemma3:4b"  # Found on user's system
 
-    def _call_ollama(self, prompt: str, system_prompt: str = "", images: Optional[List[str]] = None) -> str:
-        url = f"{self.base_url}/api/generate"
-        
+    def _call_ollama(self, prompt: str, system_prompt: str = "", images: Optional[List[str]] = None, call_site: str = "structured_extraction") -> str:
         # Use bakllava if images are provided, otherwise use default gemma3
         current_model = "bakllava" if images else self.model
-        
-        payload = {
-            "model": current_model,
-            "prompt": prompt,
-            "system": system_prompt,
-            "stream": False,
-            "format": "json"
-        }
-        
         if images:
-            payload["images"] = images
-            
+            call_site = "vision_extraction"
+
         try:
-            print(f"DEBUG: Calling Ollama with model: {current_model}")
-            response = requests.post(url, json=payload, timeout=90) # Increased timeout for vision
-            response.raise_for_status()
-            res_text = response.json().get("response", "")
-            print(f"DEBUG: Ollama Raw Response: {res_text[:200]}")
-            return res_text
+            logger.debug(f"Calling Ollama ({current_model}) for {call_site}")
+            response = self.client.generate(
+                model=current_model,
+                prompt=prompt,
+                call_site=call_site,
+                system=system_prompt,
+                images=images,
+                format="json",
+            )
+            return response.get("response", "")
+        except OllamaUnavailableError:
+            # Breaker open or no free slot: let the claim job retry instead of scoring on an empty answer.
+            raise
         except Exception as e:
-            print(f"Ollama Call Error: {e}")
+            logger.warning(f"Ollama call failed for {call_site}: {e}")
             return ""
 
     def extract_structured_data(self, text: str, document_type: str, image_path: Optional[str] = None) -> Dict[str, Any]:
@@ -51,9 +56,9 @@ class LLMService:
                 with open(image_path, "rb") as f:
                     img_base64 = base64.b64encode(f.read()).decode("utf-8")
                     images = [img_base64]
-                print(f"DEBUG: Including image from {image_path} for vision extraction.")
+                logger.debug(f"Including image from {image_path} for vision extraction.")
             except Exception as e:
-                print(f"Error reading image for Ollama: {e}")
+                logger.warning(f"Error reading image for Ollama: {e}")
 
         raw_response = self._call_ollama(prompt, EXTRACTION_SYSTEM_PROMPT, images=images)
         try:
@@ -63,7 +68,7 @@ class LLMService:
                 data["confidence"] = 0.8
             return data
         except Exception as e:
-            print(f"Ollama JSON Parse Error: {e}\nRaw: {raw_response}")
+            logger.warning(f"Ollama JSON Parse Error: {e}; raw response: {raw_response[:200]}")
             return {}
 
     def analyze_claim_context(self, documents_context: str) -> Dict[str, Any]:
@@ -71,6 +76,7 @@ class LLMService:
         Perform qualitative analysis on the entire claim context using Ollama.
         """
         system_prompt = "You are an insurance fraud expert. Analyze sequences of documents and return results in JSON format."
+        context = fit_text(documents_context, "analyze_claim_context").text
         
         prompt = f"""
         Analyze the following insurance claim document context for fraud and risk.
@@ -82,14 +88,18 @@ class LLMService:
         - extraction_confidence (0.0 to 1.0)
 
         Claim Context:
-        {documents_context[:4000]}
+        {context}
         """
 
-        raw_response = self._call_ollama(prompt, system_prompt)
+        cache_key = LlmResponseCache.make_key(self.model, "analyze_claim_context", CONTEXT_ANALYSIS_PROMPT_VERSION, context)
+        raw_response = llm_cache.get(cache_key)
+        if raw_response is None:
+            raw_response = self._call_ollama(prompt, system_prompt, call_site="analyze_claim_context")
+            llm_cache.put_if_json(cache_key, raw_response)
         try:
             return json.loads(raw_response)
         except Exception as e:
-            print(f"Ollama Analysis Parse Error: {e}")
+            logger.warning(f"Ollama Analysis Parse Error: {e}")
             return {
                 "risk_level": "UNKNOWN",
                 "fraud_indicators": ["Local AI Error"],
@@ -0,0 +1,198 @@
+"""
+Process-wide registry of pickled model artifacts.
+
+Each artifact is loaded once and then served warm to every inference call.
+A cheap ``os.stat`` (at most every ``MODEL_RELOAD_CHECK_SECONDS``) notices
+when the file is replaced -- new mtime, inode or size -- and the next call
+reloads it; if the new file cannot be loaded the old object keeps serving.
+Every load is checksummed: if a ``<file>.sha256`` sidecar or
+``MODEL_CHECKSUM_<NAME>`` is set, a mismatching file is refused rather than
+unpickled. Load time and memory footprint are kept per model.
+"""
+
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import joblib
+
+from app.utils.hashing import hash_file
+
+logger = logging.getLogger(__name__)
+
+CHECK_INTERVAL_ENV = "MODEL_RELOAD_CHECK_SECONDS"
+CHECKSUM_ENV_PREFIX = "MODEL_CHECKSUM_"
+# tracemalloc roughly triples unpickling time for the LightGBM model, so the
+# Python-heap figure is opt-in; the RSS delta is always recorded.
+TRACE_ALLOCATIONS_ENV = "MODEL_TRACE_ALLOCATIONS"
+
+FileSignature = Tuple[int, int, int]  # (st_mtime_ns, st_ino, st_size)
+
+
+class ModelChecksumError(RuntimeError):
+    pass
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def _rss_bytes() -> Optional[int]:
+    """Resident set size from /proc; None where that is unavailable (Windows, macOS)."""
+    try:
+        with open("/proc/self/statm", "r", encoding="ascii") as handle:
+            return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError, IndexError):
+        return None
+
+
+def _signature(path: Path) -> Optional[FileSignature]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    if stat.st_size == 0:
+        return None
+    return (stat.st_mtime_ns, stat.st_ino, stat.st_size)
+
+
+@dataclass
+class ModelEntry:
+    name: str
+    resolve_path: Callable[[], Path]
+    loader: Callable[[str], Any]
+    obj: Any = None
+    path: Optional[Path] = None
+    signature: Optional[FileSignature] = None
+    sha256: Optional[str] = None
+    loaded_at: Optional[float] = None
+    load_seconds: Optional[float] = None
+    python_bytes: Optional[int] = None
+    rss_delta_bytes: Optional[int] = None
+    loads: int = 0
+    errors: int = 0
+    last_error: Optional[str] = None
+    checked_at: float = 0.0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "path": str(self.path) if self.path else None,
+            "loaded": self.obj is not None,
+            "type": type(self.obj).__name__ if self.obj is not None else None,
+            "sha256": self.sha256,
+            "size_bytes": self.signature[2] if self.signature else None,
+            "loaded_at": self.loaded_at,
+            "load_seconds": self.load_seconds,
+            "python_bytes": self.python_bytes,
+            "rss_delta_bytes": self.rss_delta_bytes,
+            "loads": self.loads,
+            "errors": self.errors,
+            "last_error": self.last_error,
+        }
+
+
+class ModelRegistry:
+    def __init__(self, check_interval: Optional[float] = None):
+        self.check_interval = _env_number(CHECK_INTERVAL_ENV, 2.0) if check_interval is None else check_interval
+        self._entries: Dict[str, ModelEntry] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, resolve_path: Callable[[], Path], loader: Callable[[str], Any] = joblib.load) -> None:
+        """``resolve_path`` is re-evaluated on every check, so env-configured paths can change at runtime."""
+        with self._lock:
+            if name not in self._entries:
+                self._entries[name] = ModelEntry(name=name, resolve_path=resolve_path, loader=loader)
+
+    def _expected_checksum(self, entry: ModelEntry, path: Path) -> Optional[str]:
+        configured = os.getenv(f"{CHECKSUM_ENV_PREFIX}{entry.name.upper()}")
+        if configured:
+            return configured.strip().lower()
+        sidecar = path.with_name(path.name + ".sha256")
+        try:
+            return sidecar.read_text(encoding="utf-8").split()[0].strip().lower()
+        except (OSError, IndexError):
+            return None
+
+    def _load(self, entry: ModelEntry, path: Path, signature: FileSignature) -> None:
+        sha256 = hash_file(str(path))
+        expected = self._expected_checksum(entry, path)
+        if expected and expected != sha256:
+            raise ModelChecksumError(f"{path.name} checksum {sha256[:12]} does not match expected {expected[:12]}")
+
+        already_tracing = tracemalloc.is_tracing()
+        trace = already_tracing or os.getenv(TRACE_ALLOCATIONS_ENV, "").lower() in {"1", "true", "yes"}
+        if trace and not already_tracing:
+            tracemalloc.start()
+        before_python = tracemalloc.get_traced_memory()[0] if trace else 0
+        before_rss = _rss_bytes()
+        started = time.perf_counter()
+        try:
+            obj = entry.loader(str(path))
+        finally:
+            load_seconds = time.perf_counter() - started
+            after_python = tracemalloc.get_traced_memory()[0] if trace else 0
+            if trace and not already_tracing:
+                tracemalloc.stop()
+        after_rss = _rss_bytes()
+
+        entry.obj = obj
+        entry.path = path
+        entry.signature = signature
+        entry.sha256 = sha256
+        entry.loaded_at = time.time()
+        entry.load_seconds = round(load_seconds, 4)
+        entry.python_bytes = max(after_python - before_python, 0) if trace else None
+        entry.rss_delta_bytes = after_rss - before_rss if before_rss is not None and after_rss is not None else None
+        entry.loads += 1
+        entry.last_error = None
+        logger.info(
+            "Loaded model %s from %s in %.2fs (sha256 %s, rss %+d KB)",
+            entry.name, path, load_seconds, sha256[:12], (entry.rss_delta_bytes or 0) // 1024,
+        )
+
+    def get(self, name: str) -> Optional[Any]:
+        entry = self._entries[name]
+        now = time.monotonic()
+        if entry.obj is not None and now - entry.checked_at < self.check_interval:
+            return entry.obj
+
+        with entry.lock:
+            if entry.obj is not None and now - entry.checked_at < self.check_interval:
+                return entry.obj
+            path = Path(entry.resolve_path())
+            signature = _signature(path)
+            entry.checked_at = time.monotonic()
+            if signature is None:
+                if entry.obj is not None:
+                    logger.warning("Model file for %s is missing or empty at %s; keeping loaded version", name, path)
+                return entry.obj
+            if entry.obj is not None and signature == entry.signature and path == entry.path:
+                return entry.obj
+            try:
+                self._load(entry, path, signature)
+            except Exception as exc:  # noqa: BLE001
+                entry.errors += 1
+                entry.last_error = f"{type(exc).__name__}: {exc}"
+                # Remember the bad file so it is not re-read on every call; a new file retriggers a load.
+                entry.signature = signature
+                entry.path = path
+                logger.error("Could not load model %s from %s: %s", name, path, exc)
+            return entry.obj
+
+    def warm_up(self) -> Dict[str, bool]:
+        return {name: self.get(name) is not None for name in list(self._entries)}
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: entry.stats() for name, entry in list(self._entries.items())}
+
+
+model_registry = ModelRegistry()
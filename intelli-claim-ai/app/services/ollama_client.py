@@ -0,0 +1,284 @@
+"""
+Shared HTTP client for every Ollama call in the process.
+
+One pooled keep-alive connection set (sync and async) replaces per-call
+``requests.post`` and the separate ``ollama`` package client. Each call names
+its call site, which picks its timeout. In-flight calls are capped at
+``OLLAMA_NUM_PARALLEL`` (what Ollama serves concurrently per model), and a
+circuit breaker opens after consecutive failures so an overloaded or dead
+Ollama fails fast instead of tying up worker threads for a full timeout.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+import ollama
+
+logger = logging.getLogger(__name__)
+
+BASE_URL_ENV = "OLLAMA_BASE_URL"
+PARALLEL_ENV = "OLLAMA_NUM_PARALLEL"
+QUEUE_TIMEOUT_ENV = "OLLAMA_QUEUE_TIMEOUT_SECONDS"
+BREAKER_FAILURES_ENV = "OLLAMA_BREAKER_FAILURES"
+BREAKER_RESET_ENV = "OLLAMA_BREAKER_RESET_SECONDS"
+# Per-call-site override, e.g. OLLAMA_TIMEOUT_GLOBAL_RECONCILE=240
+TIMEOUT_ENV_PREFIX = "OLLAMA_TIMEOUT_"
+
+DEFAULT_TIMEOUT_SECONDS = 90.0
+CALL_SITE_TIMEOUTS = {
+    "extract_node_1": 120.0,
+    "global_reconcile": 180.0,
+    "analyze_claim_context": 60.0,
+    "structured_extraction": 90.0,
+    "vision_extraction": 150.0,
+}
+CONNECT_TIMEOUT_SECONDS = 5.0
+
+
+class OllamaUnavailableError(ConnectionError):
+    """Raised without contacting Ollama: breaker open or no free slot in time."""
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def _default_base_url() -> str:
+    host = os.getenv(BASE_URL_ENV) or os.getenv("OLLAMA_HOST") or "http://localhost:11434"
+    return host if "://" in host else f"http://{host}"
+
+
+def call_site_timeout(call_site: str) -> float:
+    default = CALL_SITE_TIMEOUTS.get(call_site, DEFAULT_TIMEOUT_SECONDS)
+    return _env_number(f"{TIMEOUT_ENV_PREFIX}{call_site.upper()}", default)
+
+
+class CircuitBreaker:
+    """Closed -> open after ``failure_threshold`` consecutive failures -> one trial call after ``reset_seconds``."""
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at >= self.reset_seconds:
+                return "half_open"
+            return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.reset_seconds or self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def release_trial(self) -> None:
+        """The admitted call never reached Ollama; let the next caller make the trial."""
+        with self._lock:
+            if self._opened_at is not None:
+                self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    logger.warning("Ollama circuit breaker opened after %d consecutive failures", self._failures)
+                self._opened_at = time.monotonic()
+
+
+def _is_failure(exc: BaseException) -> bool:
+    if isinstance(exc, ollama.ResponseError):
+        return exc.status_code >= 500 or exc.status_code == 429
+    return isinstance(exc, httpx.TransportError)
+
+
+class OllamaClient:
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        max_in_flight: Optional[int] = None,
+        queue_timeout: Optional[float] = None,
+        breaker_failures: Optional[int] = None,
+        breaker_reset_seconds: Optional[float] = None,
+    ):
+        self.base_url = (base_url or _default_base_url()).rstrip("/")
+        self.max_in_flight = max(int(max_in_flight or _env_number(PARALLEL_ENV, 4)), 1)
+        self.queue_timeout = queue_timeout if queue_timeout is not None else _env_number(QUEUE_TIMEOUT_ENV, 30.0)
+        self.breaker = CircuitBreaker(
+            failure_threshold=int(breaker_failures or _env_number(BREAKER_FAILURES_ENV, 5)),
+            reset_seconds=breaker_reset_seconds if breaker_reset_seconds is not None else _env_number(BREAKER_RESET_ENV, 30.0),
+        )
+        self._slots = threading.BoundedSemaphore(self.max_in_flight)
+        self._limits = httpx.Limits(max_connections=self.max_in_flight * 2, max_keepalive_connections=self.max_in_flight)
+        self._client: Optional[httpx.Client] = None
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._client_lock = threading.Lock()
+
+    def _sync_client(self) -> httpx.Client:
+        with self._client_lock:
+            if self._client is None:
+                self._client = httpx.Client(base_url=self.base_url, limits=self._limits)
+            return self._client
+
+    def _async_http(self) -> httpx.AsyncClient:
+        # Bound to the event loop that first uses it (the API's loop).
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(base_url=self.base_url, limits=self._limits)
+        return self._async_client
+
+    @staticmethod
+    def _timeout(call_site: str) -> httpx.Timeout:
+        return httpx.Timeout(call_site_timeout(call_site), connect=CONNECT_TIMEOUT_SECONDS)
+
+    def _admit(self, call_site: str) -> None:
+        if not self.breaker.allow():
+            raise OllamaUnavailableError(f"Ollama circuit breaker is open; skipping {call_site}")
+
+    @staticmethod
+    def _parse(response: httpx.Response) -> Dict[str, Any]:
+        if response.status_code >= 400:
+            try:
+                error = response.json().get("error", response.text)
+            except ValueError:
+                error = response.text
+            raise ollama.ResponseError(error, response.status_code)
+        return response.json()
+
+    def _settle(self, exc: Optional[BaseException]) -> None:
+        if exc is None:
+            self.breaker.record_success()
+        elif _is_failure(exc):
+            self.breaker.record_failure()
+        else:
+            # Client-side errors (bad model name, 4xx) say nothing about Ollama's health.
+            self.breaker.record_success()
+
+    def post(self, path: str, payload: Dict[str, Any], call_site: str) -> Dict[str, Any]:
+        self._admit(call_site)
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            self.breaker.release_trial()
+            raise OllamaUnavailableError(f"No Ollama slot free within {self.queue_timeout:.0f}s for {call_site}")
+        try:
+            response = self._sync_client().post(path, json=payload, timeout=self._timeout(call_site))
+            result = self._parse(response)
+        except Exception as exc:
+            self._settle(exc)
+            raise
+        finally:
+            self._slots.release()
+        self._settle(None)
+        return result
+
+    async def apost(self, path: str, payload: Dict[str, Any], call_site: str) -> Dict[str, Any]:
+        self._admit(call_site)
+        # Shares the thread semaphore with sync callers; poll instead of parking a thread on it.
+        deadline = time.monotonic() + self.queue_timeout
+        while not self._slots.acquire(blocking=False):
+            if time.monotonic() >= deadline:
+                self.breaker.release_trial()
+                raise OllamaUnavailableError(f"No Ollama slot free within {self.queue_timeout:.0f}s for {call_site}")
+            await asyncio.sleep(0.05)
+        try:
+            response = await self._async_http().post(path, json=payload, timeout=self._timeout(call_site))
+            result = self._parse(response)
+        except Exception as exc:
+            self._settle(exc)
+            raise
+        finally:
+            self._slots.release()
+        self._settle(None)
+        return result
+
+    @staticmethod
+    def _chat_payload(model: str, messages: List[Dict[str, Any]], format: Optional[str]) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {"model": model, "messages": messages, "stream": False}
+        if format:
+            payload["format"] = format
+        return payload
+
+    @staticmethod
+    def _generate_payload(
+        model: str, prompt: str, system: str, images: Optional[List[str]], format: Optional[str]
+    ) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {"model": model, "prompt": prompt, "system": system, "stream": False}
+        if format:
+            payload["format"] = format
+        if images:
+            payload["images"] = images
+        return payload
+
+    def chat(self, model: str, messages: List[Dict[str, Any]], call_site: str, format: Optional[str] = None) -> Dict[str, Any]:
+        return self.post("/api/chat", self._chat_payload(model, messages, format), call_site)
+
+    async def achat(self, model: str, messages: List[Dict[str, Any]], call_site: str, format: Optional[str] = None) -> Dict[str, Any]:
+        return await self.apost("/api/chat", self._chat_payload(model, messages, format), call_site)
+
+    def generate(
+        self,
+        model: str,
+        prompt: str,
+        call_site: str,
+        system: str = "",
+        images: Optional[List[str]] = None,
+        format: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        return self.post("/api/generate", self._generate_payload(model, prompt, system, images, format), call_site)
+
+    async def agenerate(
+        self,
+        model: str,
+        prompt: str,
+        call_site: str,
+        system: str = "",
+        images: Optional[List[str]] = None,
+        format: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        return await self.apost("/api/generate", self._generate_payload(model, prompt, system, images, format), call_site)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "base_url": self.base_url,
+            "max_in_flight": self.max_in_flight,
+            "breaker_state": self.breaker.state,
+        }
+
+    def close(self) -> None:
+        with self._client_lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+
+    async def aclose(self) -> None:
+        self.close()
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+
+
+ollama_client = OllamaClient()
@@ -0,0 +1,194 @@
+"""
+Read-through cache for policy documents, shared by node3 and node4.
+
+Two layers, both keyed by normalized policy number:
+
+* a per-claim scope, set by ``run_claim_workflow`` in a contextvar (the
+  executors carry contextvars into worker threads), so every node of a
+  claim sees the same policy document however many times it asks;
+* a process-wide TTL cache, so claims against the same policy in quick
+  succession share one MongoDB read.
+
+Node3 and node4 run in parallel, so loads are single-flight: concurrent
+lookups of one key wait for the first instead of each querying MongoDB.
+Writes through ``policy_repository`` invalidate the process-wide layer.
+"""
+
+import copy
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from app.services.policy_index import normalize_policy_number
+
+TTL_ENV = "POLICY_CACHE_TTL_SECONDS"
+NEGATIVE_TTL_ENV = "POLICY_CACHE_NEGATIVE_TTL_SECONDS"
+MAX_ENTRIES_ENV = "POLICY_CACHE_MAX_ENTRIES"
+
+PolicyLoader = Callable[[str], Optional[Dict[str, Any]]]
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def _default_loader(policy_number: str) -> Optional[Dict[str, Any]]:
+    # Imported lazily: the fetcher pulls in the MongoDB client.
+    from app.nodes.node3_policy_coverage.policy_fetcher import fetch_policy
+
+    return fetch_policy(policy_number)
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.policy: Optional[Dict[str, Any]] = None
+        self.error: Optional[BaseException] = None
+
+
+class PolicyCache:
+    def __init__(
+        self,
+        loader: Optional[PolicyLoader] = None,
+        ttl_seconds: Optional[float] = None,
+        negative_ttl_seconds: Optional[float] = None,
+        max_entries: Optional[int] = None,
+    ):
+        self.loader = loader or _default_loader
+        self.ttl_seconds = _env_number(TTL_ENV, 300.0) if ttl_seconds is None else ttl_seconds
+        self.negative_ttl_seconds = _env_number(NEGATIVE_TTL_ENV, 30.0) if negative_ttl_seconds is None else negative_ttl_seconds
+        self.max_entries = int(_env_number(MAX_ENTRIES_ENV, 10000)) if max_entries is None else max_entries
+        self._lock = threading.Lock()
+        # key -> (expires_at, policy or None for a cached miss)
+        self._entries: "OrderedDict[str, Tuple[float, Optional[Dict[str, Any]]]]" = OrderedDict()
+        self._flights: Dict[str, _Flight] = {}
+        self._stats = {"hits": 0, "misses": 0, "loads": 0, "coalesced": 0, "invalidations": 0}
+
+    def get(self, policy_number: Any) -> Optional[Dict[str, Any]]:
+        """The policy for ``policy_number``, loading it at most once per key at a time."""
+        key = normalize_policy_number(policy_number)
+        if not key:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return copy.deepcopy(entry[1])
+            self._stats["misses"] += 1
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self._stats["coalesced"] += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return copy.deepcopy(flight.policy)
+
+        try:
+            policy = self.loader(key)
+            flight.policy = policy
+            with self._lock:
+                self._stats["loads"] += 1
+                # A write that invalidated this key mid-load removed the flight; don't cache stale data.
+                if self._flights.get(key) is flight:
+                    ttl = self.ttl_seconds if policy else self.negative_ttl_seconds
+                    self._entries[key] = (time.monotonic() + ttl, copy.deepcopy(policy))
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+            flight.done.set()
+        return copy.deepcopy(policy)
+
+    def invalidate(self, policy_number: Any) -> None:
+        """Drop the policy under its own number and under every number that resolved to it."""
+        key = normalize_policy_number(policy_number)
+        if not key:
+            return
+        with self._lock:
+            stale = [
+                cached_key for cached_key, (_, policy) in self._entries.items()
+                if cached_key == key or (policy and normalize_policy_number(policy.get("policyNumber")) == key)
+            ]
+            for cached_key in stale:
+                del self._entries[cached_key]
+            self._flights.pop(key, None)
+            self._stats["invalidations"] += 1
+
+    def invalidate_misses(self) -> None:
+        """A new policy may answer lookups that were cached as not found."""
+        with self._lock:
+            for cached_key in [k for k, (_, policy) in self._entries.items() if policy is None]:
+                del self._entries[cached_key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "entries": len(self._entries), "ttl_seconds": self.ttl_seconds}
+
+
+policy_cache = PolicyCache()
+
+
+class PolicyScope:
+    """Per-claim memo in front of the process-wide cache."""
+
+    def __init__(self, cache: Optional[PolicyCache] = None):
+        self.cache = cache or policy_cache
+        self._lock = threading.Lock()
+        self._resolved: Dict[str, Optional[Dict[str, Any]]] = {}
+
+    def resolve(self, policy_number: Any) -> Optional[Dict[str, Any]]:
+        """A private copy per call: node3 and node4 run in parallel and must not see each other's edits."""
+        key = normalize_policy_number(policy_number)
+        if not key:
+            return None
+        with self._lock:
+            if key in self._resolved:
+                return copy.deepcopy(self._resolved[key])
+        policy = self.cache.get(key)
+        with self._lock:
+            return copy.deepcopy(self._resolved.setdefault(key, policy))
+
+
+_current_scope: ContextVar[Optional[PolicyScope]] = ContextVar("policy_scope", default=None)
+
+
+@contextmanager
+def policy_request_scope(cache: Optional[PolicyCache] = None) -> Iterator[PolicyScope]:
+    scope = PolicyScope(cache)
+    token = _current_scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _current_scope.reset(token)
+
+
+def resolve_policy(policy_number: Any) -> Optional[Dict[str, Any]]:
+    """Policy for ``policy_number`` through the current claim's scope, or the process cache outside one."""
+    scope = _current_scope.get()
+    if scope is not None:
+        return scope.resolve(policy_number)
+    return policy_cache.get(policy_number)
@@ -0,0 +1,360 @@
+"""
+In-memory index of policy numbers for exact, prefix and fuzzy lookups.
+
+OCR'd policy numbers are often truncated or have a character or two wrong.
+Resolving those used to pull every policy number out of MongoDB on each
+miss. The index holds every normalized number once: a dict for exact hits, a
+sorted list for prefix hits and a bigram index that narrows fuzzy lookups to
+the few numbers that can reach the threshold. A lookup never touches MongoDB.
+
+It is loaded once and kept in sync three ways: writes through
+``policy_repository`` update it immediately, a change stream applies writes
+made elsewhere, and where change streams are unavailable (standalone mongod)
+a poller picks up new ``_id``s and periodically rebuilds in the background.
+"""
+
+import bisect
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from rapidfuzz import fuzz, process
+
+from app.utils.fuzzy_index import NgramIndex
+
+logger = logging.getLogger(__name__)
+
+FUZZY_THRESHOLD_ENV = "POLICY_FUZZY_THRESHOLD"
+REFRESH_ENV = "POLICY_INDEX_REFRESH_SECONDS"
+FULL_REFRESH_ENV = "POLICY_INDEX_FULL_REFRESH_SECONDS"
+
+NON_ALNUM = re.compile(r"[^A-Z0-9]")
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def normalize_policy_number(policy_number: Any) -> str:
+    if not policy_number:
+        return ""
+    return NON_ALNUM.sub("", str(policy_number).upper())
+
+
+@dataclass(frozen=True)
+class PolicyMatch:
+    policy_number: str  # as stored in MongoDB
+    kind: str  # "exact", "prefix" or "fuzzy"
+    score: float
+
+
+class PolicyNumberIndex:
+    def __init__(self, numbers: Iterable[str] = ()):
+        self._lock = threading.RLock()
+        self._stored: Dict[str, Set[str]] = {}  # normalized -> stored numbers
+        self._sorted: List[str] = []
+        self._ngram = NgramIndex()
+        self._ngram_ids: Dict[str, int] = {}
+        for number in numbers:
+            key = normalize_policy_number(number)
+            if key:
+                self._stored.setdefault(key, set()).add(str(number))
+        self._sorted = sorted(self._stored)
+        self._ngram_ids = dict(zip(self._sorted, self._ngram.extend(self._sorted)))
+
+    def __len__(self) -> int:
+        return len(self._sorted)
+
+    def add(self, number: Any) -> None:
+        key = normalize_policy_number(number)
+        if not key:
+            return
+        with self._lock:
+            stored = self._stored.setdefault(key, set())
+            stored.add(str(number))
+            if key not in self._ngram_ids:
+                bisect.insort(self._sorted, key)
+                self._ngram_ids[key] = self._ngram.add(key)
+
+    def remove(self, number: Any) -> None:
+        key = normalize_policy_number(number)
+        with self._lock:
+            stored = self._stored.get(key)
+            if stored is None:
+                return
+            stored.discard(str(number))
+            if stored:
+                return
+            del self._stored[key]
+            del self._sorted[bisect.bisect_left(self._sorted, key)]
+            self._ngram.remove(self._ngram_ids.pop(key))
+
+    def _stored_number(self, key: str) -> str:
+        return min(self._stored[key])
+
+    def exact(self, number: Any) -> Optional[str]:
+        key = normalize_policy_number(number)
+        with self._lock:
+            return self._stored_number(key) if key in self._stored else None
+
+    def prefix(self, number: Any, limit: int = 10) -> List[str]:
+        """Stored numbers whose normalized form starts with ``number`` (a truncated read)."""
+        key = normalize_policy_number(number)
+        if not key:
+            return []
+        with self._lock:
+            start = bisect.bisect_left(self._sorted, key)
+            keys = []
+            for candidate in self._sorted[start:start + limit]:
+                if not candidate.startswith(key):
+                    break
+                keys.append(candidate)
+            return [self._stored_number(candidate) for candidate in keys]
+
+    def fuzzy(self, number: Any, threshold: float) -> Optional[PolicyMatch]:
+        key = normalize_policy_number(number)
+        if not key:
+            return None
+        ids = self._ngram.candidates(key, threshold)
+        if not len(ids):
+            return None
+        texts = self._ngram.texts
+        # Same scorer as the old collection-scan fallback. Keys contain no whitespace, so
+        # token_set_ratio equals ratio here and the bigram bound on candidates still holds.
+        best = process.extractOne(key, [texts[i] for i in ids.tolist()], scorer=fuzz.token_set_ratio, score_cutoff=threshold)
+        if best is None:
+            return None
+        with self._lock:
+            if best[0] not in self._stored:
+                return None
+            return PolicyMatch(self._stored_number(best[0]), "fuzzy", round(best[1], 2))
+
+    def lookup(self, number: Any, threshold: Optional[float] = None) -> Optional[PolicyMatch]:
+        """Exact, then prefix, then closest fuzzy match at or above the threshold."""
+        exact = self.exact(number)
+        if exact is not None:
+            return PolicyMatch(exact, "exact", 100.0)
+        prefixed = self.prefix(number, limit=1)
+        if prefixed:
+            return PolicyMatch(prefixed[0], "prefix", 100.0)
+        return self.fuzzy(number, _env_number(FUZZY_THRESHOLD_ENV, 85.0) if threshold is None else threshold)
+
+
+class PolicyIndexSync:
+    """Owns the process-wide index: initial load, change stream or polling, write-through."""
+
+    def __init__(self, collection: Any = None):
+        self._collection = collection
+        self.index = PolicyNumberIndex()
+        self.refresh_seconds = _env_number(REFRESH_ENV, 60.0)
+        self.full_refresh_seconds = _env_number(FULL_REFRESH_ENV, 900.0)
+        # The sync thread and request threads (repository hooks) both update these; _sync_lock guards them.
+        self._sync_lock = threading.RLock()
+        self._numbers_by_id: Dict[Any, str] = {}
+        self._ids_by_number: Dict[str, Set[Any]] = {}
+        self._last_id: Any = None
+        self._loaded = False
+        self._load_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.mode = "idle"
+        self.last_full_load: Optional[float] = None
+
+    @property
+    def collection(self) -> Any:
+        if self._collection is None:
+            from app.database.mongo import policies_collection
+
+            self._collection = policies_collection
+        return self._collection
+
+    # --- loading ---
+
+    def full_load(self) -> int:
+        """Rebuild from the collection (startup and background refresh only, never on a lookup)."""
+        numbers_by_id: Dict[Any, str] = {}
+        last_id = None
+        for document in self.collection.find({}, {"policyNumber": 1}):
+            number = document.get("policyNumber")
+            if not number:
+                continue
+            numbers_by_id[document["_id"]] = number
+            if last_id is None or _id_after(document["_id"], last_id):
+                last_id = document["_id"]
+        ids_by_number: Dict[str, Set[Any]] = {}
+        for document_id, number in numbers_by_id.items():
+            ids_by_number.setdefault(number, set()).add(document_id)
+        index = PolicyNumberIndex(numbers_by_id.values())
+        with self._sync_lock:
+            self.index, self._numbers_by_id, self._ids_by_number = index, numbers_by_id, ids_by_number
+            self._last_id = last_id
+        self._loaded = True
+        self.last_full_load = time.time()
+        logger.info("Policy index loaded with %d policy numbers", len(index))
+        return len(index)
+
+    def ensure_loaded(self) -> PolicyNumberIndex:
+        if not self._loaded:
+            with self._load_lock:
+                if not self._loaded:
+                    try:
+                        self.full_load()
+                    except Exception as exc:  # noqa: BLE001
+                        logger.warning("Policy index could not be loaded: %s", exc)
+        return self.index
+
+    def refresh_delta(self) -> int:
+        """Pick up policies inserted since the last load or refresh."""
+        query = {"_id": {"$gt": self._last_id}} if self._last_id is not None else {}
+        added = 0
+        for document in self.collection.find(query, {"policyNumber": 1}).sort("_id", 1):
+            with self._sync_lock:
+                self._track(document["_id"], document.get("policyNumber"))
+                self._last_id = document["_id"]
+            added += 1
+        return added
+
+    # --- write-through (policy_repository) ---
+
+    def _remember(self, document_id: Any, number: str) -> None:
+        self._numbers_by_id[document_id] = number
+        self._ids_by_number.setdefault(number, set()).add(document_id)
+
+    def _forget(self, document_id: Any) -> Optional[str]:
+        number = self._numbers_by_id.pop(document_id, None)
+        ids = self._ids_by_number.get(number) if number is not None else None
+        if ids is not None:
+            ids.discard(document_id)
+            if not ids:
+                del self._ids_by_number[number]
+        return number
+
+    def _track(self, document_id: Any, number: Optional[str]) -> None:
+        with self._sync_lock:
+            previous = self._forget(document_id) if document_id is not None else None
+            if previous and previous != number:
+                self.index.remove(previous)
+            if number:
+                if document_id is not None:
+                    self._remember(document_id, number)
+                self.index.add(number)
+
+    def on_created(self, number: Optional[str], document_id: Any = None) -> None:
+        self._track(document_id, number)
+
+    def _id_for(self, number: str) -> Any:
+        # Repository writes filter by policy number and do not know the _id.
+        ids = self._ids_by_number.get(number)
+        return next(iter(ids)) if ids else None
+
+    def on_deleted(self, number: Optional[str], document_id: Any = None) -> None:
+        if not number:
+            return
+        with self._sync_lock:
+            self._forget(self._id_for(number) if document_id is None else document_id)
+            self.index.remove(number)
+
+    def on_renamed(self, old_number: str, new_number: str) -> None:
+        with self._sync_lock:
+            document_id = self._id_for(old_number)
+            if document_id is not None:
+                self._forget(document_id)
+                self._remember(document_id, new_number)
+            self.index.remove(old_number)
+            self.index.add(new_number)
+
+    # --- background sync ---
+
+    def _apply_change(self, change: Dict[str, Any]) -> None:
+        document_id = change.get("documentKey", {}).get("_id")
+        if change.get("operationType") == "delete":
+            with self._sync_lock:
+                number = self._forget(document_id)
+                if number:
+                    self.index.remove(number)
+            return
+        document = change.get("fullDocument") or {}
+        self._track(document_id, document.get("policyNumber"))
+
+    def _watch(self) -> bool:
+        """Follow the change stream; False when the deployment does not support one."""
+        try:
+            with self.collection.watch(full_document="updateLookup") as stream:
+                self.mode = "change_stream"
+                while not self._stop.is_set():
+                    change = stream.try_next()
+                    if change is not None:
+                        self._apply_change(change)
+                    else:
+                        self._stop.wait(0.5)
+            return True
+        except Exception as exc:  # noqa: BLE001
+            logger.info("Policy index change stream unavailable (%s); polling instead", exc)
+            return False
+
+    def _poll(self) -> None:
+        self.mode = "polling"
+        next_full = time.monotonic() + self.full_refresh_seconds
+        while not self._stop.wait(self.refresh_seconds):
+            try:
+                if time.monotonic() >= next_full:
+                    self.full_load()
+                    next_full = time.monotonic() + self.full_refresh_seconds
+                else:
+                    self.refresh_delta()
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Policy index refresh failed: %s", exc)
+
+    def _run(self) -> None:
+        self.ensure_loaded()
+        if not self._watch() and not self._stop.is_set():
+            self._poll()
+
+    def start(self) -> None:
+        if self._thread is not None or self.refresh_seconds <= 0:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="policy-index-sync", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def lookup(self, number: Any, threshold: Optional[float] = None) -> Optional[PolicyMatch]:
+        return self.ensure_loaded().lookup(number, threshold)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "policies": len(self.index),
+            "loaded": self._loaded,
+            "mode": self.mode,
+            "last_full_load": self.last_full_load,
+        }
+
+
+def _id_after(candidate: Any, current: Any) -> bool:
+    try:
+        return candidate > current
+    except TypeError:
+        return False
+
+
+policy_index = PolicyIndexSync()
+
+
+def start_policy_index_sync() -> None:
+    policy_index.start()
+
+
+def stop_policy_index_sync() -> None:
+    policy_index.stop()
@@ -0,0 +1,102 @@
+"""
+In-process fan-out of claim pipeline events to WebSocket subscribers.
+
+Publishers (graph runs on worker threads or the event loop) hand events to
+the loop with a single ``call_soon_threadsafe``; each subscriber is just a
+bounded ``asyncio.Queue`` awaited by its connection coroutine, so thousands
+of idle subscribers cost no threads. A short per-claim history is replayed
+to late subscribers, e.g. a client that connects after the 202 response.
+
+Events only reach subscribers connected to the same process that runs the
+claim; the job record in Mongo remains the cross-process source of truth.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_EVENTS = {"claim_completed", "claim_failed"}
+
+SUBSCRIBER_QUEUE_SIZE = 256
+HISTORY_PER_CLAIM = 64
+MAX_TRACKED_CLAIMS = 2048
+
+
+class ProgressBus:
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._history: "OrderedDict[str, Deque[Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def bind_loop(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+
+    def publish(self, claim_id: str, event: Dict[str, Any]) -> None:
+        """Thread-safe: callable from graph worker threads or the event loop."""
+        event = {"claim_id": claim_id, "timestamp": time.time(), **event}
+        with self._lock:
+            history = self._history.get(claim_id)
+            if history is None:
+                history = self._history[claim_id] = deque(maxlen=HISTORY_PER_CLAIM)
+                if len(self._history) > MAX_TRACKED_CLAIMS:
+                    self._history.popitem(last=False)
+            else:
+                self._history.move_to_end(claim_id)
+            history.append(event)
+
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._dispatch(claim_id, event)
+        else:
+            loop.call_soon_threadsafe(self._dispatch, claim_id, event)
+
+    def _dispatch(self, claim_id: str, event: Dict[str, Any]) -> None:
+        for queue in self._subscribers.get(claim_id, ()):
+            if queue.full():
+                # A slow consumer loses its oldest events rather than stalling everyone.
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+    def subscribe(self, claim_id: str) -> asyncio.Queue:
+        """Must be called on the event loop. Replays recent history for the claim."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        with self._lock:
+            for event in self._history.get(claim_id, ()):
+                queue.put_nowait(event)
+        self._subscribers.setdefault(claim_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, claim_id: str, queue: asyncio.Queue) -> None:
+        subscribers = self._subscribers.get(claim_id)
+        if not subscribers:
+            return
+        subscribers.discard(queue)
+        if not subscribers:
+            del self._subscribers[claim_id]
+
+    def clear(self, claim_id: str) -> None:
+        """Forget a claim's history, so a new attempt does not replay the last one's terminal event."""
+        with self._lock:
+            self._history.pop(claim_id, None)
+
+    def history(self, claim_id: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._history.get(claim_id, ()))
+
+    def subscriber_count(self) -> int:
+        return sum(len(queues) for queues in self._subscribers.values())
+
+
+progress_bus = ProgressBus()
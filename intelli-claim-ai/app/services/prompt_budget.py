@@ -0,0 +1,208 @@
+"""
+Token-budgeted prompt inputs for the Ollama call sites.
+
+gemma3:4b latency grows almost linearly with prompt length, and blind
+character cuts drop whatever happens to sit at the end (often the bill
+totals). Each call site instead gets a token budget: OCR text is compacted
+first, and if it still does not fit, lines are ranked by how likely they
+are to carry a field value and the best ones are kept in reading order.
+"""
+
+import logging
+import math
+import os
+import re
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from app.nodes.node1_extraction.text_cleaner import compact_ocr_text
+
+logger = logging.getLogger(__name__)
+
+# No tokenizer for gemma3 is available offline; ~4 characters per token holds
+# well enough for English OCR text to size budgets.
+CHARS_PER_TOKEN = 4
+BUDGET_ENV_PREFIX = "PROMPT_BUDGET_"  # e.g. PROMPT_BUDGET_GLOBAL_RECONCILE=6000
+
+DEFAULT_BUDGETS = {
+    "extract_node_1": 3000,
+    "global_reconcile": 8000,
+    "analyze_claim_context": 1000,
+}
+DEFAULT_BUDGET = 3000
+
+FIELD_KEYWORDS = re.compile(
+    r"\b(policy|insured|claim(?:ant)?|name|patient|aadhaar|uid|dob|birth|age|gender|address|phone|mobile|"
+    r"email|hospital|admission|admitted|discharge|diagnosis|treatment|doctor|date|bill|invoice|total|amount|"
+    r"payable|paid|net|gst|room|charges|sum|premium|vehicle|incident|accident)\b",
+    re.I,
+)
+FIELD_PATTERNS = [
+    re.compile(r"\b\d{2}[-/.]\d{2}[-/.]\d{2,4}\b"),  # dates
+    re.compile(r"(?:rs\.?|inr|₹)\s?[\d,]+", re.I),  # amounts
+    re.compile(r"\b\d{1,3}(?:,\d{2,3})+(?:\.\d{2})?\b"),  # grouped numbers
+    re.compile(r"\b[A-Z]{2,}[-/]?\d{3,}[-/\w]*\b"),  # policy / registration ids
+    re.compile(r"\b\d{4}\s?\d{4}\s?\d{4}\b"),  # aadhaar
+    re.compile(r"\b[6-9]\d{9}\b"),  # phone
+    re.compile(r"\S+@\S+\.\w{2,}"),  # email
+]
+KEY_VALUE = re.compile(r"^[^:]{2,40}:\s*\S")
+# OCR of a dense page can come back as one huge line; longer lines are ranked in pieces.
+LINE_CHUNK_CHARS = 200
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def budget_for(call_site: str) -> int:
+    default = DEFAULT_BUDGETS.get(call_site, DEFAULT_BUDGET)
+    try:
+        return int(os.getenv(f"{BUDGET_ENV_PREFIX}{call_site.upper()}", default))
+    except ValueError:
+        return default
+
+
+def line_score(line: str) -> float:
+    """Higher for lines that look like they carry a field value."""
+    score = 2.0 * len(FIELD_KEYWORDS.findall(line))
+    score += 3.0 * sum(1 for pattern in FIELD_PATTERNS if pattern.search(line))
+    if KEY_VALUE.match(line):
+        score += 2.0
+    alnum = sum(c.isalnum() for c in line)
+    if alnum < 3 or alnum / len(line) < 0.5:
+        score -= 3.0  # OCR debris
+    return score
+
+
+def _chunks(line: str, size: int) -> List[str]:
+    """Split a line longer than ``size`` at whitespace (or hard, without any) into pieces that fit."""
+    pieces = []
+    while len(line) > size:
+        cut = line.rfind(" ", 1, size + 1)
+        if cut <= 0:
+            cut = size
+        pieces.append(line[:cut].rstrip())
+        line = line[cut:].lstrip()
+    if line:
+        pieces.append(line)
+    return pieces
+
+
+def select_lines(text: str, max_tokens: int) -> str:
+    """Keep the highest-scoring lines that fit, in their original order."""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    chunk_chars = min(LINE_CHUNK_CHARS, max_tokens * CHARS_PER_TOKEN - 1)
+    if chunk_chars <= 0:
+        return ""
+    lines = [piece for line in text.splitlines() for piece in _chunks(line, chunk_chars)]
+    ranked = sorted(range(len(lines)), key=lambda i: (-line_score(lines[i]), i))
+    budget_chars = max_tokens * CHARS_PER_TOKEN
+    chosen = []
+    used = 0
+    for index in ranked:
+        cost = len(lines[index]) + 1
+        if used + cost > budget_chars:
+            continue
+        chosen.append(index)
+        used += cost
+    return "\n".join(lines[i] for i in sorted(chosen))
+
+
+def _fair_shares(sizes: List[int], total: int) -> List[int]:
+    """Split ``total`` across parts; small parts keep everything, the rest share what is left."""
+    shares = [0] * len(sizes)
+    remaining = total
+    pending = sorted(range(len(sizes)), key=lambda i: sizes[i])
+    while pending:
+        share = remaining // len(pending)
+        index = pending.pop(0)
+        shares[index] = min(sizes[index], share)
+        remaining -= shares[index]
+    return shares
+
+
+@dataclass
+class BudgetedText:
+    text: str
+    call_site: str
+    budget: int
+    original_tokens: int
+    compacted_tokens: int
+    final_tokens: int
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.original_tokens - self.final_tokens
+
+
+class PromptBudgetStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._per_site: Dict[str, Dict[str, int]] = {}
+
+    def record(self, result: BudgetedText) -> None:
+        with self._lock:
+            site = self._per_site.setdefault(
+                result.call_site, {"calls": 0, "original_tokens": 0, "final_tokens": 0, "tokens_saved": 0, "trimmed_calls": 0}
+            )
+            site["calls"] += 1
+            site["original_tokens"] += result.original_tokens
+            site["final_tokens"] += result.final_tokens
+            site["tokens_saved"] += result.tokens_saved
+            if result.final_tokens < result.compacted_tokens:
+                site["trimmed_calls"] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {site: dict(values) for site, values in self._per_site.items()}
+
+
+prompt_budget_stats = PromptBudgetStats()
+
+
+def _report(result: BudgetedText) -> BudgetedText:
+    prompt_budget_stats.record(result)
+    logger.info(
+        f"Prompt budget [{result.call_site}]: {result.original_tokens} -> {result.final_tokens} tokens "
+        f"(~{result.tokens_saved} saved, budget {result.budget})"
+    )
+    return result
+
+
+def fit_text(text: str, call_site: str, max_tokens: Optional[int] = None) -> BudgetedText:
+    """Compact one OCR text and trim it to the call site's token budget."""
+    budget = max_tokens or budget_for(call_site)
+    compacted = compact_ocr_text(text)
+    final = select_lines(compacted, budget)
+    return _report(BudgetedText(
+        text=final,
+        call_site=call_site,
+        budget=budget,
+        original_tokens=estimate_tokens(text),
+        compacted_tokens=estimate_tokens(compacted),
+        final_tokens=estimate_tokens(final),
+    ))
+
+
+def fit_texts(texts: List[str], call_site: str, separator: str = "\n\n", max_tokens: Optional[int] = None) -> BudgetedText:
+    """
+    Budget several documents into one prompt. Each document is compacted on
+    its own, then the budget is shared so one long document cannot crowd the
+    others out.
+    """
+    budget = max_tokens or budget_for(call_site)
+    compacted = [compact_ocr_text(text) for text in texts]
+    separators = estimate_tokens(separator) * max(len(texts) - 1, 0)
+    shares = _fair_shares([estimate_tokens(text) for text in compacted], max(budget - separators, 0))
+    final = separator.join(select_lines(text, share) for text, share in zip(compacted, shares))
+    return _report(BudgetedText(
+        text=final,
+        call_site=call_site,
+        budget=budget,
+        original_tokens=estimate_tokens(separator.join(texts)),
+        compacted_tokens=estimate_tokens(separator.join(compacted)),
+        final_tokens=estimate_tokens(final),
+    ))
@@ -0,0 +1,148 @@
+"""
+Streaming storage for uploaded claim documents.
+
+Each upload is copied to disk one chunk at a time and hashed on the fly, so
+a request holds at most one chunk per file in memory however large the
+scans are. Files become content-addressed blobs in the document store, so an
+identical re-upload reuses the stored copy instead of writing another one.
+Size and type limits are enforced as early as possible: declared size and
+extension before reading, magic bytes on the first chunk, running size while
+copying.
+"""
+
+import logging
+import os
+from dataclasses import dataclass
+from typing import Any, List, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.services.document_store import DocumentStore, document_store
+from app.utils.hashing import CHUNK_SIZE, new_hasher
+
+logger = logging.getLogger(__name__)
+
+MAX_FILE_MB_ENV = "UPLOAD_MAX_FILE_MB"
+MAX_TOTAL_MB_ENV = "UPLOAD_MAX_TOTAL_MB"
+
+ALLOWED_EXTENSIONS = {".pdf", ".png", ".jpg", ".jpeg", ".webp"}
+
+
+def _env_megabytes(name: str, default: float) -> int:
+    try:
+        return int(float(os.getenv(name, default)) * 1024 * 1024)
+    except ValueError:
+        return int(default * 1024 * 1024)
+
+
+class UploadRejectedError(ValueError):
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+@dataclass
+class StoredUpload:
+    path: str
+    sha256: str
+    size: int
+    filename: str
+    deduplicated: bool
+
+
+def _matches_extension(ext: str, head: bytes) -> bool:
+    if ext == ".pdf":
+        return head.startswith(b"%PDF-")
+    if ext == ".png":
+        return head.startswith(b"\x89PNG\r\n\x1a\n")
+    if ext in {".jpg", ".jpeg"}:
+        return head.startswith(b"\xff\xd8\xff")
+    if ext == ".webp":
+        return head[:4] == b"RIFF" and head[8:12] == b"WEBP"
+    return False
+
+
+def _open_part(store: DocumentStore):
+    path = store.new_part_path()
+    return path, open(path, "wb")
+
+
+def _write_chunk(handle, hasher, chunk: bytes) -> None:
+    hasher.update(chunk)
+    handle.write(chunk)
+
+
+def _discard(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class UploadSession:
+    """Stores the files of one request, enforcing the per-file and per-request limits."""
+
+    def __init__(
+        self,
+        store: Optional[DocumentStore] = None,
+        max_file_bytes: Optional[int] = None,
+        max_total_bytes: Optional[int] = None,
+        chunk_size: int = CHUNK_SIZE,
+    ):
+        self.document_store = store or document_store
+        self.max_file_bytes = max_file_bytes or _env_megabytes(MAX_FILE_MB_ENV, 25)
+        self.max_total_bytes = max_total_bytes or _env_megabytes(MAX_TOTAL_MB_ENV, 100)
+        self.chunk_size = chunk_size
+        self.total_bytes = 0
+        self.stored: List[StoredUpload] = []
+
+    def _check_size(self, filename: str, size: int) -> None:
+        if size > self.max_file_bytes:
+            raise UploadRejectedError(413, f"{filename} exceeds the {self.max_file_bytes // (1024 * 1024)} MB per-file limit")
+        if self.total_bytes + size > self.max_total_bytes:
+            raise UploadRejectedError(413, f"Upload exceeds the {self.max_total_bytes // (1024 * 1024)} MB per-request limit")
+
+    async def store(self, upload: Any) -> StoredUpload:
+        """``upload`` is a FastAPI/Starlette ``UploadFile`` (anything with ``filename``, ``size``, async ``read``)."""
+        filename = os.path.basename(upload.filename or "")
+        ext = os.path.splitext(filename)[1].lower()
+        if ext not in ALLOWED_EXTENSIONS:
+            raise UploadRejectedError(415, f"Unsupported file type for {filename}")
+        if getattr(upload, "size", None) is not None:
+            self._check_size(filename, upload.size)
+
+        hasher = new_hasher()
+        size = 0
+        part_path, handle = await run_in_threadpool(_open_part, self.document_store)
+        try:
+            try:
+                while True:
+                    chunk = await upload.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    if size == 0 and not _matches_extension(ext, chunk[:16]):
+                        raise UploadRejectedError(415, f"{filename} is not a valid {ext.lstrip('.').upper()} file")
+                    size += len(chunk)
+                    self._check_size(filename, size)
+                    await run_in_threadpool(_write_chunk, handle, hasher, chunk)
+            finally:
+                await run_in_threadpool(handle.close)
+            if size == 0:
+                raise UploadRejectedError(400, f"{filename} is empty")
+
+            digest = hasher.hexdigest()
+            final_path, created = await run_in_threadpool(self.document_store.commit_blob, part_path, digest, ext, size)
+        except BaseException:
+            await run_in_threadpool(_discard, part_path)
+            raise
+
+        self.total_bytes += size
+        stored = StoredUpload(path=final_path, sha256=digest, size=size, filename=filename, deduplicated=not created)
+        if stored.deduplicated:
+            logger.info(f"Upload {filename} matches stored document {digest[:12]}; reusing it")
+        self.stored.append(stored)
+        return stored
+
+    def refs(self) -> List[Tuple[str, str]]:
+        return [(stored.sha256, stored.filename) for stored in self.stored]
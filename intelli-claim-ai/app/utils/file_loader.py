@@ -5,8 +5,17 @@ from pdf2image import convert_from_path
 from pdf2image.exceptions import PDFInfoNotInstalledError
 from pypdf import PdfReader
 
+from app.services.document_store import document_store
 
-def pdf_to_images(pdf_path, output_folder="temp_images"):
+
+def pdf_to_images(pdf_path, output_folder=None, claim_id=None):
+    """
+    Rasterize every page to JPEG. Without an explicit output_folder the pages go
+    to a fresh per-claim scratch directory in the document store, so concurrent
+    calls never overwrite each other and the compactor can evict them later.
+    """
+    if output_folder is None:
+        output_folder = document_store.scratch_dir(claim_id, "pages")
     os.makedirs(output_folder, exist_ok=True)
     poppler_path = os.getenv("POPPLER_PATH")
     if poppler_path:
@@ -19,8 +28,9 @@ def pdf_to_images(pdf_path, output_folder="temp_images"):
 
     image_paths = []
     for i, page in enumerate(pages):
-        path = f"{output_folder}/page_{i}.jpg"
+        path = os.path.join(output_folder, f"page_{i}.jpg")
         page.save(path, "JPEG")
+        page.close()
         image_paths.append(path)
 
     return image_paths
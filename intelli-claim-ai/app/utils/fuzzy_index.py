@@ -0,0 +1,112 @@
+"""
+Incremental bigram index for fuzzy lookups without scanning every entry.
+
+Two strings within Levenshtein distance d share at least
+``max(len_a, len_b) - 1 - 2d`` bigrams (the q-gram count lemma). RapidFuzz's
+``ratio`` above a threshold bounds the indel distance, which bounds d, so
+``candidates`` only drops entries that could never reach the threshold:
+scoring the candidates gives exactly what a full scan would. Bigrams carry
+their occurrence number so set overlap equals multiset overlap.
+
+Postings are packed ``array('i')`` buffers, so a few million entries stay in
+tens of megabytes, and entries can be added and removed in place.
+"""
+
+import math
+import threading
+from array import array
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+
+def bigrams(text: str) -> List[str]:
+    seen: Dict[str, int] = {}
+    grams = []
+    for i in range(len(text) - 1):
+        gram = text[i:i + 2]
+        occurrence = seen.get(gram, 0) + 1
+        seen[gram] = occurrence
+        grams.append(gram + str(occurrence))
+    return grams
+
+
+def _required_shared(query_length: int, length: int, threshold: float) -> int:
+    max_distance = math.floor((1 - threshold / 100.0) * (query_length + length))
+    return max(query_length, length) - 1 - 2 * max_distance
+
+
+class NgramIndex:
+    def __init__(self):
+        self.texts: List[str] = []
+        self._lengths = array("i")
+        self._alive = bytearray()
+        self._postings: Dict[str, array] = {}
+        self._by_length: Dict[int, array] = {}
+        self._live = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._live
+
+    def _add(self, text: str) -> int:
+        entry_id = len(self.texts)
+        self.texts.append(text)
+        self._lengths.append(len(text))
+        self._alive.append(1)
+        self._by_length.setdefault(len(text), array("i")).append(entry_id)
+        postings = self._postings
+        for gram in bigrams(text):
+            posting = postings.get(gram)
+            if posting is None:
+                posting = postings[gram] = array("i")
+            posting.append(entry_id)
+        self._live += 1
+        return entry_id
+
+    def add(self, text: str) -> int:
+        with self._lock:
+            return self._add(text)
+
+    def extend(self, texts: Iterable[str]) -> List[int]:
+        with self._lock:
+            return [self._add(text) for text in texts]
+
+    def remove(self, entry_id: int) -> None:
+        """Tombstones the entry; its postings are skipped until the index is rebuilt."""
+        with self._lock:
+            if self._alive[entry_id]:
+                self._alive[entry_id] = 0
+                self._live -= 1
+
+    def candidates(self, query: str, threshold: float) -> np.ndarray:
+        """Live entry ids that can still reach ``ratio >= threshold`` against ``query``."""
+        query_length = len(query)
+        with self._lock:
+            # Views over the packed buffers; every result below is a fresh array, so
+            # no view outlives the lock (a live view would block the next append).
+            lengths = np.frombuffer(self._lengths, dtype=np.int32)
+            alive = np.frombuffer(self._alive, dtype=np.uint8)
+            found = []
+            shared = [np.frombuffer(self._postings[gram], dtype=np.int32) for gram in bigrams(query) if gram in self._postings]
+            if shared:
+                counts = np.bincount(np.concatenate(shared), minlength=len(self.texts))
+                # Cheap pass with the loosest requirement of any stored length, exact check on the survivors.
+                loosest = min(_required_shared(query_length, length, threshold) for length in self._by_length)
+                ids = np.flatnonzero(counts >= max(loosest, 1))
+                max_distance = np.floor((1 - threshold / 100.0) * (query_length + lengths[ids]))
+                required = np.maximum(query_length, lengths[ids]) - 1 - 2 * max_distance
+                found.append(ids[counts[ids] >= required])
+            # Entries short enough to qualify without sharing a single bigram.
+            found.extend(
+                np.frombuffer(ids, dtype=np.int32)
+                for length, ids in self._by_length.items()
+                if _required_shared(query_length, length, threshold) <= 0
+            )
+            if found:
+                ids = found[0] if len(found) == 1 else np.unique(np.concatenate(found))
+                result = ids[alive[ids].astype(bool)]
+            else:
+                result = np.empty(0, dtype=np.int32)
+            del lengths, alive, shared, found
+        return result
@@ -0,0 +1,26 @@
+import hashlib
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def new_hasher(algorithm="sha256"):
+    return hashlib.new(algorithm)
+
+
+def hash_file(path, algorithm="sha256", chunk_size=CHUNK_SIZE):
+    """
+    Streams the file through the hash so large scans never sit fully in memory.
+    """
+    hasher = new_hasher(algorithm)
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(chunk_size), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def hash_bytes(data, algorithm="sha256"):
+    return hashlib.new(algorithm, data).hexdigest()
+
+
+def hash_text(text, algorithm="sha256"):
+    return hash_bytes(text.encode("utf-8"), algorithm)
@@ -0,0 +1,72 @@
+"""
+Benchmark: LightGBM fraud scoring one record at a time vs in batches.
+
+"per-record" is the old path (pandas preprocessing, then separate predict and
+predict_proba calls on a one-row frame), timed on a sample and extrapolated.
+"batch" streams records through BatchFraudScorer exactly as the nightly
+re-score does (encode, one predict_proba, build UpdateOne ops) into a sink
+that only counts operations, so MongoDB round trips are left out of both.
+
+Usage:
+    python benchmarks/bench_batch_scoring.py --sizes 10000 100000 1000000
+"""
+
+import argparse
+import itertools
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+sys.path.append(str(ROOT / "tests"))
+
+import joblib
+
+from app.nodes.node4_fraud_detection.batch_scoring import BatchFraudScorer, iter_batches
+from fraud_records import make_fraud_records
+from legacy_fraud_preprocess import _preprocess_fraud_data as legacy_preprocess
+
+
+def _per_record_seconds(model, features, records):
+    start = time.perf_counter()
+    for record in records:
+        frame = legacy_preprocess(record, features)
+        model.predict(frame)
+        model.predict_proba(frame)
+    return (time.perf_counter() - start) / len(records)
+
+
+def _batch_seconds(scorer, pool, size):
+    stream = itertools.islice(itertools.cycle(pool), size)
+    operations = 0
+    start = time.perf_counter()
+    for batch in iter_batches(stream, scorer.batch_size):
+        operations += len(scorer.updates([record["_id"] for record in batch], batch))
+    assert operations == size
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-record vs batch LightGBM fraud scoring")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--sample", type=int, default=500, help="records timed on the per-record path")
+    args = parser.parse_args()
+
+    model = joblib.load(ROOT / "fraud_lightgbm.pkl")
+    features = joblib.load(ROOT / "fraud_features.pkl")
+    pool = make_fraud_records(20_000)
+    scorer = BatchFraudScorer(model, features, batch_size=args.batch_size)
+
+    per_record = _per_record_seconds(model, features, pool[: args.sample])
+    print(f"per-record path: {per_record * 1000:.2f} ms/record (sampled on {args.sample})")
+    print(f"{'records':>10}  {'per-record (est)':>16}  {'batch':>9}  {'batch rec/s':>12}  {'speedup':>8}")
+    for size in args.sizes:
+        batch = _batch_seconds(scorer, pool, size)
+        estimate = per_record * size
+        print(f"{size:>10,}  {estimate:>15.1f}s  {batch:>8.2f}s  {size / batch:>12,.0f}  {estimate / batch:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Micro-benchmark: fraud feature encoding, per-record pandas vs FraudFeatureEncoder.
+
+"before" runs the old _preprocess_fraud_data (one DataFrame in, one out, per
+record); "after" encodes the whole batch into one preallocated matrix.
+
+Usage:
+    python benchmarks/bench_fraud_encoder.py --records 2000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+sys.path.append(str(ROOT / "tests"))
+
+import joblib
+
+from app.nodes.node4_fraud_detection.feature_encoder import FraudFeatureEncoder
+from fraud_records import make_fraud_records
+from legacy_fraud_preprocess import _preprocess_fraud_data as legacy_preprocess
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fraud feature encoding cost per record")
+    parser.add_argument("--records", type=int, default=2000)
+    args = parser.parse_args()
+
+    features = joblib.load(ROOT / "fraud_features.pkl")
+    records = make_fraud_records(args.records)
+
+    start = time.perf_counter()
+    for record in records:
+        legacy_preprocess(record, features)
+    before = (time.perf_counter() - start) / len(records)
+
+    start = time.perf_counter()
+    encoder = FraudFeatureEncoder(features)
+    encoder.encode(records)
+    after = (time.perf_counter() - start) / len(records)
+
+    print(f"before (pandas per record)  {before * 1e6:10.1f} us/record")
+    print(f"after  (batch encoder)      {after * 1e6:10.1f} us/record")
+    print(f"speedup: {before / max(after, 1e-12):,.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Micro-benchmark: per-claim graph overhead before and after the compiled-graph registry.
+
+"before" rebuilds and compiles the StateGraph for every claim (the old
+run_claim_workflow behaviour); "after" fetches the process-wide compiled graph.
+
+Usage:
+    python benchmarks/bench_graph_compile.py --iterations 200
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from app.core.langgraph_builder import build_claim_workflow, get_claim_workflow, warm_up_claim_workflow
+
+
+def _time_calls(fn, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def _report(label, samples):
+    print(
+        f"{label:<28} mean={statistics.mean(samples):8.3f} ms  "
+        f"p50={statistics.median(samples):8.3f} ms  max={max(samples):8.3f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-claim StateGraph compile overhead")
+    parser.add_argument("--iterations", type=int, default=100)
+    args = parser.parse_args()
+
+    warm_up_claim_workflow()
+
+    before = _time_calls(build_claim_workflow, args.iterations)
+    after = _time_calls(lambda: get_claim_workflow().graph, args.iterations)
+
+    _report("before (build + compile)", before)
+    _report("after (registry lookup)", after)
+    print(f"speedup: {statistics.mean(before) / max(statistics.mean(after), 1e-9):,.0f}x")
+
+
+if __name__ == "__main__":
+    main()
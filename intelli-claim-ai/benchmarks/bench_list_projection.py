@@ -0,0 +1,164 @@
+"""
+Benchmark: bytes and latency per list page, full claim documents vs the
+summary projection.
+
+Claims are synthetic but shaped like stored ones: every node output, plus
+``form_data.node1_output`` with a few pages of OCR text.
+
+Without --mongo-uri the page is measured as BSON (what the server sends and
+the driver decodes): encoded size and decode time for full vs projected
+documents. With --mongo-uri the claims are inserted into a scratch database
+and pages are read through pymongo, once with ``{"_id": 0}`` as before and
+once with SUMMARY_PROJECTION, as raw BSON so the byte counts are exact.
+
+Usage:
+    python benchmarks/bench_list_projection.py --page-sizes 50 200
+    python benchmarks/bench_list_projection.py --mongo-uri mongodb://localhost:27017 --claims 5000
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+import bson
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
+
+from app.database.projections import SUMMARY_PROJECTION
+
+WORDS = "patient admitted diagnosis invoice hospital amount policy total discharge treatment ward charges".split()
+
+
+def _ocr_text(rng, characters):
+    text = []
+    while sum(len(word) + 1 for word in text) < characters:
+        text.append(rng.choice(WORDS))
+    return " ".join(text)
+
+
+def make_claim_document(index, rng, ocr_characters=12000):
+    created = datetime(2026, 1, 1) + timedelta(minutes=index)
+    node1 = {
+        "extracted_entities": {"policy_number": f"MOT-{index:08d}", "amount": 1000.0 + index, "diagnosis": "fracture"},
+        "field_confidence": {field: rng.random() for field in ("policy_number", "amount", "date", "name")},
+        "raw_text": _ocr_text(rng, ocr_characters),
+        "reasoning": [_ocr_text(rng, 200) for _ in range(5)],
+    }
+    return {
+        "claim_id": f"CLM-{index:06d}",
+        "claim_type": rng.choice(["Health", "Motor", "Property"]),
+        "claim_amount": 1000.0 + index,
+        "policy_number": f"MOT-{index:08d}",
+        "claimer": {"name": f"Claimer {index}", "email": f"user{index}@example.com", "phone": "555-0100", "address": "1 Main St"},
+        "status": rng.choice(["PENDING_REVIEW", "FLAGGED_FOR_REVIEW", "APPROVED", "REJECTED"]),
+        "decision_reason": _ocr_text(rng, 120),
+        "fraud_score": rng.random(),
+        "risk_score": rng.random(),
+        "document_paths": [f"uploads/{index}/page-{page}.pdf" for page in range(3)],
+        "form_data": {"node1_output": node1, "field_confidence": node1["field_confidence"]},
+        "node1_output": node1,
+        **{f"node{n}_output": {"reasoning": _ocr_text(rng, 1500), "scores": [rng.random() for _ in range(20)]} for n in range(2, 9)},
+        "created_at": created,
+        "updated_at": created,
+    }
+
+
+def project(document, projection):
+    """Python equivalent of a MongoDB inclusion projection, for the offline measurement."""
+    projected = {}
+    for path, include in projection.items():
+        if not include:
+            continue
+        source, target = document, projected
+        parts = path.split(".")
+        for part in parts[:-1]:
+            source = source.get(part) if isinstance(source, dict) else None
+            if source is None:
+                break
+            target = target.setdefault(part, {})
+        else:
+            if isinstance(source, dict) and parts[-1] in source:
+                target[parts[-1]] = source[parts[-1]]
+    return projected
+
+
+def _offline(documents, page_size, repeat):
+    rows = {
+        "full": documents[:page_size],
+        "summary": [project(document, SUMMARY_PROJECTION) for document in documents[:page_size]],
+    }
+    results = {}
+    for label, page in rows.items():
+        encoded = [bson.encode(document) for document in page]
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for raw in encoded:
+                bson.decode(raw)
+            timings.append(time.perf_counter() - start)
+        results[label] = (sum(len(raw) for raw in encoded), statistics.median(timings))
+    return results
+
+
+def _mongo(uri, documents, page_size, repeat):
+    from pymongo import DESCENDING, MongoClient
+
+    client = MongoClient(uri)
+    database = client[f"bench_projection_{uuid.uuid4().hex[:8]}"]
+    try:
+        collection = database["claims"]
+        collection.insert_many(documents)
+        collection.create_index([("created_at", DESCENDING), ("claim_id", DESCENDING)])
+        raw = collection.with_options(codec_options=CodecOptions(document_class=RawBSONDocument))
+        results = {}
+        for label, projection in (("full", {"_id": 0}), ("summary", SUMMARY_PROJECTION)):
+            for typed in (raw, collection):  # warm up both paths
+                list(typed.find({}, projection).sort([("created_at", -1), ("claim_id", -1)]).limit(page_size))
+            page = list(raw.find({}, projection).sort([("created_at", -1), ("claim_id", -1)]).limit(page_size))
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                list(collection.find({}, projection).sort([("created_at", -1), ("claim_id", -1)]).limit(page_size))
+                timings.append(time.perf_counter() - start)
+            results[label] = (sum(len(document.raw) for document in page), statistics.median(timings))
+        return results
+    finally:
+        client.drop_database(database.name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Full documents vs summary projection per list page")
+    parser.add_argument("--page-sizes", type=int, nargs="+", default=[50, 200])
+    parser.add_argument("--claims", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--mongo-uri", default=None, help="measure real round trips against this server")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    documents = [make_claim_document(index, rng) for index in range(max(args.claims, max(args.page_sizes)))]
+    mode = "mongo" if args.mongo_uri else "bson"
+    print(f"mode={mode} claims={len(documents)}")
+    print(f"{'page':>6} {'full KB':>10} {'summary KB':>11} {'full ms':>9} {'summary ms':>11} {'bytes x':>8} {'speedup':>8}")
+    for page_size in args.page_sizes:
+        if args.mongo_uri:
+            results = _mongo(args.mongo_uri, [dict(document) for document in documents], page_size, args.repeat)
+        else:
+            results = _offline(documents, page_size, args.repeat)
+        (full_bytes, full_seconds), (summary_bytes, summary_seconds) = results["full"], results["summary"]
+        print(
+            f"{page_size:>6} {full_bytes / 1024:>10.1f} {summary_bytes / 1024:>11.1f} "
+            f"{full_seconds * 1000:>9.2f} {summary_seconds * 1000:>11.3f} "
+            f"{full_bytes / summary_bytes:>7.0f}x {full_seconds / summary_seconds:>7.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
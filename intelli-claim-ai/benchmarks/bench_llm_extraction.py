@@ -0,0 +1,59 @@
+"""
+Offline benchmark: node 1 LLM wall time with one vs. several Ollama slots.
+
+Runs process_documents against the stub Ollama server from tests/ with a fixed
+per-request latency, so only the scheduling of the per-document extraction
+and reconciliation calls is measured (OCR is replaced by canned text).
+
+Usage:
+    python benchmarks/bench_llm_extraction.py --documents 6 --latency 0.5 --parallel 4
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+sys.path.append(str(ROOT / "tests"))
+
+from app.nodes.node1_extraction import extraction_engine
+from app.nodes.node1_extraction.extractor import process_documents
+from app.services.llm_cache import LlmResponseCache
+from app.services.ollama_client import OllamaClient
+from ollama_stub import OllamaStub
+
+
+def _run(paths, slots, cache_dir, url):
+    # A fresh response cache per run, otherwise the second run never reaches Ollama.
+    extraction_engine.llm_cache = LlmResponseCache(f"{cache_dir}/{slots}.sqlite3", ttl_seconds=3600, max_entries=1000)
+    extraction_engine.ollama_client = OllamaClient(base_url=url, max_in_flight=slots)
+    start = time.perf_counter()
+    process_documents("CLM-BENCH", paths)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent per-document LLM extraction")
+    parser.add_argument("--documents", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.5, help="seconds per stubbed Ollama call")
+    parser.add_argument("--parallel", type=int, default=4, help="OLLAMA_NUM_PARALLEL to emulate")
+    args = parser.parse_args()
+
+    paths = [f"doc_{index}.pdf" for index in range(args.documents)]
+    extraction_engine.extract_text_with_stats = lambda path: (f"INVOICE {path} Total Rs. 1,000", {"pages": 1})
+
+    with OllamaStub(delay=args.latency) as stub, tempfile.TemporaryDirectory() as cache_dir:
+        sequential = _run(paths, 1, cache_dir, stub.url)
+        concurrent = _run(paths, args.parallel, cache_dir, stub.url)
+
+    print(f"{args.documents} documents + reconciliation, {args.latency:.2f}s per call")
+    print(f"sequential (1 slot)     {sequential:6.2f} s")
+    print(f"concurrent ({args.parallel} slots)    {concurrent:6.2f} s")
+    print(f"speedup: {sequential / concurrent:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
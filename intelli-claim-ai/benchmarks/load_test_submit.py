@@ -0,0 +1,99 @@
+"""
+Load test for the claim submission path.
+
+Fires /api/claims/submit at several concurrency levels against a running
+server while probing /api/health, and reports throughput plus health-check
+latency. A flat health latency under load shows the event loop is not blocked.
+
+Usage:
+    uvicorn app.main:app --port 8000
+    python benchmarks/load_test_submit.py --document sample_docs/bill.jpg --levels 1 2 4 8 16
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+def _payload(document_paths):
+    return {
+        "claim_type": "Health",
+        "claim_amount": 0.0,
+        "policy_number": "UNKNOWN",
+        "document_paths": document_paths,
+        "claimer": {"name": "Load Test", "email": "loadtest@example.com"},
+    }
+
+
+async def _probe_health(client, stop, samples):
+    while not stop.is_set():
+        start = time.perf_counter()
+        try:
+            await client.get("/api/health")
+            samples.append((time.perf_counter() - start) * 1000)
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.1)
+
+
+async def _run_level(client, concurrency, requests_per_worker, document_paths):
+    latencies = []
+    errors = 0
+
+    async def worker():
+        nonlocal errors
+        for _ in range(requests_per_worker):
+            start = time.perf_counter()
+            try:
+                response = await client.post("/api/claims/submit", json=_payload(document_paths))
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+            except httpx.HTTPError:
+                errors += 1
+
+    health_samples = []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(_probe_health(client, stop, health_samples))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await probe
+
+    completed = len(latencies)
+    print(
+        f"concurrency={concurrency:<3} completed={completed:<4} errors={errors:<3} "
+        f"throughput={completed / elapsed:6.2f} claims/s  "
+        f"p50={statistics.median(latencies) if latencies else 0:6.2f}s  "
+        f"health_p95={_p95(health_samples):7.1f} ms"
+    )
+
+
+def _p95(samples):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)]
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Claim submission load test")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--document", action="append", required=True, help="Server-side document path")
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--requests-per-worker", type=int, default=2)
+    parser.add_argument("--timeout", type=float, default=600.0)
+    args = parser.parse_args()
+
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout) as client:
+        for level in args.levels:
+            await _run_level(client, level, args.requests_per_worker, args.document)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
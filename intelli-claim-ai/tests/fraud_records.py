@@ -0,0 +1,78 @@
+"""
+Synthetic fraud_classification records for encoder/scoring tests and benchmarks.
+
+Values mirror the insurance fraud dataset the LightGBM model was trained on,
+with a sprinkling of the messy inputs seen in MongoDB (lowercase codes,
+missing fields, NaN, numbers stored as strings).
+"""
+
+import random
+from typing import Any, Dict, List
+
+STATES = ["IN", "OH", "IL", "oh", " in "]
+CSL = ["250/500", "500/1000", "100/300", "250,500"]
+SEX = ["MALE", "FEMALE", "M", "f", None]
+EDUCATION = ["College", "High School", "JD", "MD", "Masters", "PhD", "Associate"]
+OCCUPATION = [
+    "armed-forces", "craft-repair", "exec-managerial", "farming-fishing", "handlers-cleaners",
+    "machine-op-inspct", "other-service", "priv-house-serv", "prof-specialty", "protective-serv",
+    "sales", "tech-support", "transport-moving", "Adm-Clerical", " Sales ",
+]
+HOBBIES = [
+    "basketball", "board-games", "bungie-jumping", "camping", "chess", "cross-fit", "dancing",
+    "exercise", "golf", "hiking", "kayaking", "movies", "paintball", "polo", "reading",
+    "skydiving", "sleeping", "video-games", "yachting", "base-jumping",
+]
+RELATIONSHIP = ["husband", "not-in-family", "other relative", "own-child", "unmarried", "wife", "Wife"]
+SEVERITY = ["Major Damage", "Minor Damage", "Total Loss", "Trivial Damage"]
+AUTHORITIES = ["Ambulance", "Fire", "Other", "Police", "None", ""]
+INCIDENT_STATES = ["NY", "OH", "PA", "SC", "VA", "WV", "NC", "va"]
+CITIES = ["Arlington", "Columbus", "Hillsdale", "Northbend", "Northbrook", "Riverwood", "Springfield"]
+YES_NO = ["YES", "NO", "Yes", "No", "?", None, 1.0, float("nan")]
+
+
+def make_fraud_record(rng: random.Random, index: int = 0) -> Dict[str, Any]:
+    record = {
+        "_id": f"rec-{index}",
+        "policy_number": f"POL-{index:08d}",
+        "claimer_name": f"Claimer {index}",
+        "months_as_customer": rng.randint(0, 480),
+        "age": rng.randint(19, 64),
+        "policy_deductable": rng.choice([500, 1000, 2000]),
+        "policy_annual_premium": round(rng.uniform(400, 2100), 2),
+        "umbrella_limit": rng.choice([0, 0, 0, 4000000, 6000000]),
+        "incident_hour_of_the_day": rng.randint(0, 23),
+        "bodily_injuries": rng.randint(0, 2),
+        "witnesses": rng.randint(0, 3),
+        "total_claim_amount": rng.randint(100, 115000),
+        "days_since_policy": rng.randint(1, 9000),
+        "property_damage": rng.choice(YES_NO),
+        "police_report_available": rng.choice(YES_NO),
+        "policy_state": rng.choice(STATES),
+        "policy_csl": rng.choice(CSL),
+        "insured_sex": rng.choice(SEX),
+        "insured_education_level": rng.choice(EDUCATION),
+        "insured_occupation": rng.choice(OCCUPATION),
+        "insured_hobbies": ", ".join(rng.sample(HOBBIES, rng.randint(1, 3))),
+        "insured_relationship": rng.choice(RELATIONSHIP),
+        "incident_severity": rng.choice(SEVERITY),
+        "authorities_contacted": rng.choice(AUTHORITIES),
+        "incident_state": rng.choice(INCIDENT_STATES),
+        "incident_city": rng.choice(CITIES),
+    }
+    # Messy inputs: dropped fields, NaN, numbers stored as strings.
+    for field in rng.sample(sorted(record), 2):
+        if field not in {"_id", "policy_number", "claimer_name"}:
+            del record[field]
+    if rng.random() < 0.1:
+        record["age"] = float("nan")
+    if rng.random() < 0.1:
+        record["witnesses"] = str(record.get("witnesses", "2"))
+    if rng.random() < 0.05:
+        record["total_claim_amount"] = "n/a"
+    return record
+
+
+def make_fraud_records(count: int, seed: int = 7) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    return [make_fraud_record(rng, index) for index in range(count)]
@@ -0,0 +1,102 @@
+"""
+Minimal stand-in for an Ollama server, for tests and benchmarks that must run offline.
+
+Serves non-streaming ``/api/chat`` and ``/api/generate`` with a fixed JSON
+payload after a configurable delay, and records how many requests were in
+flight at once and which client connections were used, so concurrency limits
+and connection reuse can be asserted.
+
+    with OllamaStub(delay=0.2) as stub:
+        client = OllamaClient(base_url=stub.url)
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+DEFAULT_RESPONSE = {
+    "claimant_name": "Neha Prakash Verma",
+    "aadhaar_id": "1234 5678 9012",
+    "dob": "12/03/1990",
+    "phone": "9876543210",
+    "email": "neha.verma@example.com",
+    "address": "12 MG Road, Pune",
+    "policy_number": "STAR-HEALTH-2024-88997766",
+    "hospital_name": "City Care Hospital",
+    "admission_date": "01/02/2024",
+    "discharge_date": "05/02/2024",
+    "diagnosis": "Appendicitis",
+    "total_amount": 45000.0,
+    "line_items": [],
+}
+
+
+class OllamaStub:
+    def __init__(self, delay: float = 0.0, response: Optional[Dict[str, Any]] = None):
+        self.delay = delay
+        self.response = response if response is not None else DEFAULT_RESPONSE
+        self.requests: List[Dict[str, Any]] = []
+        self.connections: Set[Tuple[str, int]] = set()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "OllamaStub":
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                with stub._lock:
+                    stub.connections.add(self.client_address)
+                body = stub._handle(self.path, payload)
+                data = json.dumps(body).encode()
+                self.send_response(200 if body is not None else 404)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handle(self, path: str, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            self.requests.append({"path": path, **payload})
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+        content = json.dumps(self.response)
+        base = {"model": payload.get("model", ""), "created_at": "2024-01-01T00:00:00Z", "done": True}
+        if path == "/api/chat":
+            return {**base, "message": {"role": "assistant", "content": content}}
+        if path == "/api/generate":
+            return {**base, "response": content}
+        return None
@@ -0,0 +1,122 @@
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import joblib
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.nodes.node4_fraud_detection.batch_scoring import (
+    SCORE_FIELD,
+    BatchFraudScorer,
+    _match_fraud_records,
+    rescore_claims,
+    rescore_fraud_records,
+)
+from fraud_records import make_fraud_records
+from legacy_fraud_preprocess import _preprocess_fraud_data as legacy_preprocess
+
+ROOT = Path(__file__).parent.parent
+MODEL = joblib.load(ROOT / "fraud_lightgbm.pkl")
+FEATURES = joblib.load(ROOT / "fraud_features.pkl")
+
+
+class FakeCollection:
+    """Just enough of a pymongo collection: ``find`` returns every document, writes are recorded."""
+
+    def __init__(self, documents):
+        self.documents = documents
+        self.find_calls = 0
+        self.bulk_writes = []
+
+    def find(self, query=None, projection=None, batch_size=None):
+        self.find_calls += 1
+        return iter(self.documents)
+
+    def bulk_write(self, operations, ordered=True):
+        self.bulk_writes.append(operations)
+        return SimpleNamespace(modified_count=len(operations), upserted_count=0)
+
+
+def test_batch_scores_match_per_record_predictions():
+    records = make_fraud_records(250)
+    predictions, probabilities = BatchFraudScorer(MODEL, FEATURES).score(records)
+
+    for record, prediction, probability in zip(records, predictions, probabilities):
+        frame = legacy_preprocess(record, FEATURES)
+        assert prediction == MODEL.predict(frame)[0]
+        assert np.isclose(probability, MODEL.predict_proba(frame)[0][1])
+
+
+def test_rescore_fraud_records_writes_one_bulk_per_batch():
+    records = make_fraud_records(23)
+    collection = FakeCollection(records)
+
+    stats = rescore_fraud_records(collection, scorer=BatchFraudScorer(MODEL, FEATURES, batch_size=10))
+
+    assert [len(batch) for batch in collection.bulk_writes] == [10, 10, 3]
+    assert stats["scanned"] == stats["scored"] == stats["written"] == 23
+    first = collection.bulk_writes[0][0]._doc["$set"][SCORE_FIELD]
+    assert set(first) == {"prediction", "probability", "confidence", "model_sha256", "scored_at"}
+
+
+def test_rescore_claims_looks_up_by_claimer_name_else_policy_number():
+    records = make_fraud_records(3)
+    claims = [
+        {"_id": 1, "claimer": {"name": records[0]["claimer_name"]}, "policy_number": "unknown"},
+        {"_id": 2, "claimer": {"name": "Somebody Else"}, "policy_number": records[1]["policy_number"]},
+        {"_id": 3, "claimer": None, "policy_number": records[2]["policy_number"]},
+        {"_id": 4, "claimer": None, "policy_number": None},
+    ]
+    claims_collection = FakeCollection(claims)
+    fraud_collection = FakeCollection(records)
+
+    stats = rescore_claims(claims_collection, fraud_collection, scorer=BatchFraudScorer(MODEL, FEATURES, batch_size=50))
+
+    assert fraud_collection.find_calls == 1
+    # Claim 2 has a name, so like fraud_agent it is not retried by policy number.
+    assert stats["scored"] == 2 and stats["unmatched"] == 2
+    assert [op._filter["_id"] for op in claims_collection.bulk_writes[0]] == [1, 3]
+
+
+class FakeFraudRecords:
+    """``find_one`` on one field and ``find`` on an ``$or`` of ``$in`` clauses, in insertion order."""
+
+    def __init__(self, records):
+        self.records = records
+
+    def find_one(self, query):
+        (field, value), = query.items()
+        return next((record for record in self.records if record.get(field) == value), None)
+
+    def find(self, query, projection=None):
+        return [
+            record for record in self.records
+            if any(record.get(field) in clause["$in"] for branch in query["$or"] for field, clause in branch.items())
+        ]
+
+
+def test_batch_matching_mirrors_the_single_claim_lookup():
+    records = make_fraud_records(6)
+    records[4]["claimer_name"] = records[3]["claimer_name"]  # two records share a name
+    records[5]["policy_number"] = records[2]["policy_number"]  # and two share a policy number
+    fraud_records = FakeFraudRecords(records)
+    names = [None, "", "Nobody", records[0]["claimer_name"], records[3]["claimer_name"]]
+    policies = [None, "", "MISSING", records[1]["policy_number"], records[2]["policy_number"], records[0]["policy_number"]]
+    claims = [
+        {"claimer": {"name": name} if name is not None else None, "policy_number": policy}
+        for name in names
+        for policy in policies
+    ]
+
+    def single(claim):
+        # fraud_agent.detect_fraud: claimer name if there is one, else policy number.
+        name = (claim.get("claimer") or {}).get("name")
+        if name:
+            return fraud_records.find_one({"claimer_name": name})
+        if claim.get("policy_number"):
+            return fraud_records.find_one({"policy_number": claim["policy_number"]})
+        return None
+
+    assert _match_fraud_records(fraud_records, claims, {}) == [single(claim) for claim in claims]
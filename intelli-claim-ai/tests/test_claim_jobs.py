@@ -0,0 +1,204 @@
+import sys
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from pymongo.errors import AutoReconnect
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.services import claim_jobs
+from app.services.document_store import DocumentStore
+from app.services.progress_bus import ProgressBus
+
+OPERATORS = {
+    "$lt": lambda value, operand: value is not None and value < operand,
+    "$lte": lambda value, operand: value is not None and value <= operand,
+    "$gte": lambda value, operand: value is not None and value >= operand,
+}
+
+
+def _matches(document, query):
+    for field, condition in query.items():
+        if field == "$or":
+            if not any(_matches(document, branch) for branch in condition):
+                return False
+            continue
+        value = document.get(field)
+        if isinstance(condition, dict):
+            if not all(OPERATORS[op](value, operand) for op, operand in condition.items()):
+                return False
+        elif value != condition:
+            return False
+    return True
+
+
+class FakeJobs:
+    """In-memory ``claim_jobs``: the filters and update operators the queue uses."""
+
+    def __init__(self, jobs=()):
+        self.jobs = {job["_id"]: dict(job) for job in jobs}
+        self.fail_updates = False
+
+    def _apply(self, job, update):
+        job.update(update.get("$set", {}))
+        for field in update.get("$unset", {}):
+            job.pop(field, None)
+        for field, amount in update.get("$inc", {}).items():
+            job[field] = job.get(field, 0) + amount
+        for field, value in update.get("$addToSet", {}).items():
+            if value not in job.setdefault(field, []):
+                job[field].append(value)
+
+    def find(self, query, projection=None):
+        return [dict(job) for job in self.jobs.values() if _matches(job, query)]
+
+    def update_one(self, query, update):
+        if self.fail_updates:
+            raise AutoReconnect("connection reset")
+        matched = [job for job in self.jobs.values() if _matches(job, query)][:1]
+        for job in matched:
+            self._apply(job, update)
+        return SimpleNamespace(matched_count=len(matched), modified_count=len(matched))
+
+    def find_one_and_update(self, query, update, sort=None, return_document=None, upsert=False):
+        candidates = [job for job in self.jobs.values() if _matches(job, query)]
+        for field, _ in sort or []:
+            candidates.sort(key=lambda job: job[field])
+        if not candidates and upsert:
+            job = {**query, **update["$setOnInsert"]}
+            self.jobs[job["_id"]] = job
+            return dict(job)
+        if not candidates:
+            return None
+        self._apply(candidates[0], update)
+        return dict(candidates[0])
+
+
+@pytest.fixture
+def jobs(monkeypatch):
+    store = FakeJobs()
+    monkeypatch.setattr(claim_jobs, "_jobs", lambda: store)
+    monkeypatch.setattr(claim_jobs.progress_bus, "publish", lambda claim_id, event: None)
+    return store
+
+
+def _running(job_id, worker, attempts, lease_expires_at):
+    return {
+        "_id": job_id,
+        "claim_id": f"CLM-{job_id}",
+        "status": claim_jobs.RUNNING,
+        "worker": worker,
+        "attempts": attempts,
+        "lease_expires_at": lease_expires_at,
+        "next_attempt_at": lease_expires_at - timedelta(hours=1),
+    }
+
+
+def test_worker_keeps_looping_when_recording_the_outcome_fails(jobs, monkeypatch):
+    pool = claim_jobs.ClaimJobWorkerPool()
+    pool.poll_seconds = 0.01
+    queued = [{"_id": f"job-{i}", "claim_id": f"CLM-{i}", "worker": "w", "attempts": 1} for i in range(3)]
+    handled = []
+
+    def next_job(worker_id, lease_seconds, max_attempts):
+        if queued:
+            return queued.pop(0)
+        pool._stop.set()
+        return None
+
+    def handler(job, on_event):
+        handled.append(job["_id"])
+        if job["_id"] == "job-1":
+            raise ValueError("bad document")
+        return {"status": "APPROVED"}
+
+    jobs.fail_updates = True
+    pool._handler = handler
+    monkeypatch.setattr(claim_jobs, "_claim_next_job", next_job)
+    worker = threading.Thread(target=pool._run, args=("w",))
+    worker.start()
+    worker.join(5)
+    assert not worker.is_alive()
+    # Completion (job-0) and failure (job-1) writes both raised; the worker carried on.
+    assert handled == ["job-0", "job-1", "job-2"]
+
+
+def test_node_events_extend_the_lease_of_the_owning_worker_only(jobs):
+    old_lease = datetime.utcnow() + timedelta(seconds=5)
+    jobs.jobs["job-1"] = _running("job-1", "w1", 1, old_lease)
+
+    claim_jobs._record_event(dict(jobs.jobs["job-1"]), {"event": "node_finished", "node": "node1"}, 600)
+    assert jobs.jobs["job-1"]["lease_expires_at"] > old_lease + timedelta(seconds=500)
+    assert jobs.jobs["job-1"]["completed_nodes"] == ["node1"]
+
+    # Another worker reclaimed the job: the stale worker neither heartbeats nor finalizes it.
+    jobs.jobs["job-1"]["worker"] = "w2"
+    stale = dict(jobs.jobs["job-1"], worker="w1")
+    lease = jobs.jobs["job-1"]["lease_expires_at"]
+    claim_jobs._record_event(stale, {"event": "node_started", "node": "node2"}, 1200)
+    assert jobs.jobs["job-1"]["lease_expires_at"] == lease
+
+    pool = claim_jobs.ClaimJobWorkerPool()
+    pool._handler = lambda job, on_event: {"status": "APPROVED"}
+    pool._process(stale)
+    assert jobs.jobs["job-1"]["status"] == claim_jobs.RUNNING
+    assert jobs.jobs["job-1"]["worker"] == "w2"
+
+
+def test_expired_lease_on_the_last_attempt_fails_instead_of_retrying(jobs):
+    expired = datetime.utcnow() - timedelta(seconds=1)
+    jobs.jobs["job-1"] = _running("job-1", "dead", 3, expired)
+    jobs.jobs["job-2"] = _running("job-2", "dead", 1, expired)
+
+    reclaimed = claim_jobs._claim_next_job("w1", 60, max_attempts=3)
+    assert reclaimed["_id"] == "job-2"
+    assert reclaimed["attempts"] == 2 and reclaimed["worker"] == "w1"
+    assert jobs.jobs["job-1"]["status"] == claim_jobs.FAILED
+    assert "worker" not in jobs.jobs["job-1"]
+    assert claim_jobs._claim_next_job("w1", 60, max_attempts=3) is None
+
+
+def test_uploads_are_released_once_a_job_fails_for_good(jobs, tmp_path):
+    store = DocumentStore(str(tmp_path))
+    sha = "cd" + "0" * 62
+    part = store.new_part_path()
+    Path(part).write_bytes(b"%PDF-1.4 scan")
+    store.commit_blob(part, sha, ".pdf", 13)
+    added = store.add_refs("CLM-job-1", [(sha, "bill.pdf")])
+
+    pool = claim_jobs.ClaimJobWorkerPool()
+    pool.max_attempts = 2
+    pool._on_failed = lambda job: store.release_refs(job["claim_id"], job["payload"]["upload_refs"])
+
+    def handler(job, on_event):
+        raise AutoReconnect("mongo down")
+
+    pool._handler = handler
+
+    jobs.jobs["job-1"] = _running("job-1", "w1", 1, datetime.utcnow() + timedelta(minutes=5))
+    jobs.jobs["job-1"]["payload"] = {"upload_refs": added}
+    pool._process(dict(jobs.jobs["job-1"]))
+    # A transient failure with attempts left is retried; the uploads are still needed.
+    assert jobs.jobs["job-1"]["status"] == claim_jobs.QUEUED
+    assert store.refcount(sha) == 1
+
+    jobs.jobs["job-1"].update(status=claim_jobs.RUNNING, worker="w1", attempts=2)
+    pool._process(dict(jobs.jobs["job-1"]))
+    assert jobs.jobs["job-1"]["status"] == claim_jobs.FAILED
+    assert store.refcount(sha) == 0
+
+
+def test_requeued_job_does_not_replay_the_failed_attempt(jobs, monkeypatch):
+    bus = ProgressBus()
+    monkeypatch.setattr(claim_jobs, "progress_bus", bus)
+    jobs.jobs["job-1"] = {"_id": "job-1", "claim_id": "CLM-1", "status": claim_jobs.FAILED, "attempts": 3}
+    bus.publish("CLM-1", {"event": "node_started", "node": "node1"})
+    bus.publish("CLM-1", {"event": "claim_failed", "error": "ConnectionError"})
+
+    job = claim_jobs.enqueue_claim_job("CLM-1", {"document_paths": ["a.pdf"]})
+
+    assert job["status"] == claim_jobs.QUEUED and job["attempts"] == 0
+    assert [event["event"] for event in bus.history("CLM-1")] == ["job_queued"]
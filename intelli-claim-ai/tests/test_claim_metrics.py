@@ -0,0 +1,152 @@
+import sys
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.services.claim_metrics import ClaimMetrics
+
+
+def _set_path(document, dotted, value, add=False):
+    *parents, leaf = dotted.split(".")
+    for part in parents:
+        document = document.setdefault(part, {})
+    document[leaf] = document.get(leaf, 0) + value if add else value
+
+
+class FakeMetrics:
+    """In-memory ``claim_metrics``: upserting ``$inc``/``$set``/``$setOnInsert`` on dotted paths."""
+
+    def __init__(self):
+        self.documents = {}
+        self.reads = 0
+
+    def update_one(self, query, update, upsert=False):
+        document_id = query["_id"]
+        document = self.documents.get(document_id)
+        if document is None:
+            document = self.documents[document_id] = {"_id": document_id}
+            for field, value in update.get("$setOnInsert", {}).items():
+                _set_path(document, field, value)
+        for field, value in update.get("$inc", {}).items():
+            _set_path(document, field, value, add=True)
+        for field, value in update.get("$set", {}).items():
+            _set_path(document, field, value)
+
+    def replace_one(self, query, document, upsert=False):
+        self.documents[query["_id"]] = dict(document)
+
+    def find_one(self, query):
+        self.reads += 1
+        return self.documents.get(query["_id"])
+
+    def find(self, query):
+        self.reads += 1
+        bounds = query["_id"]
+        return [document for key, document in self.documents.items() if bounds["$gte"] <= key <= bounds["$lte"]]
+
+
+class FakeClaims:
+    """Answers the rebuild ``$group`` from a list of claims."""
+
+    def __init__(self, claims):
+        self.claims = claims
+
+    def aggregate(self, pipeline, allowDiskUse=False):
+        groups = {}
+        for claim in self.claims:
+            key = (claim.get("status"), claim.get("claim_type"), f"{claim['created_at']:%Y-%m-%d}")
+            row = groups.setdefault(key, {
+                "claims": 0, "fraud_score_sum": 0.0, "fraud_score_count": 0, "claim_amount_sum": 0.0,
+                "processing_minutes_sum": 0.0, "processing_minutes_count": 0,
+            })
+            row["claims"] += 1
+            row["claim_amount_sum"] += claim.get("claim_amount", 0)
+            for field in ("fraud_score", "processing_minutes"):
+                if isinstance(claim.get(field), (int, float)):
+                    row[f"{field}_sum"] += claim[field]
+                    row[f"{field}_count"] += 1
+        return [{"_id": {"status": status, "type": claim_type, "day": day}, **row} for (status, claim_type, day), row in groups.items()]
+
+
+def _claim(claim_type, status, fraud_score, day):
+    return {"claim_type": claim_type, "status": status, "fraud_score": fraud_score, "claim_amount": 1000.0, "created_at": datetime(2026, 10, day, 9)}
+
+
+def test_incremental_rollup_matches_a_full_recount():
+    history = [_claim("Health", "APPROVED", 0.1, 1), _claim("Motor", "FLAGGED_FOR_REVIEW", 0.9, 2)]
+    claims = FakeClaims(list(history))
+    metrics = ClaimMetrics(FakeMetrics(), claims)
+
+    for claim in [_claim("Motor", "PENDING_REVIEW", 0.5, 3), _claim("Property", "FLAGGED_FOR_REVIEW", 0.7, 3)]:
+        claims.claims.append(claim)
+        metrics.record_created(claim)
+    # First read seeds from the claims collection, the increments above included.
+    assert metrics.summary()["total_claims"] == 4
+
+    new_claim = _claim("Health", "PENDING_REVIEW", 0.3, 4)
+    claims.claims.append(new_claim)
+    metrics.record_created(new_claim)
+    metrics.record_reviewed("FLAGGED_FOR_REVIEW", "APPROVED", datetime(2026, 10, 4, 12))
+    claims.claims[1]["status"] = "APPROVED"
+
+    summary = metrics.summary()
+    assert summary["total_claims"] == 5
+    assert summary["approved"] == 2
+    assert summary["flagged"] == 1
+    assert summary["by_type"] == dict(Counter(claim["claim_type"] for claim in claims.claims))
+    assert abs(summary["avg_fraud_score"] - sum(claim["fraud_score"] for claim in claims.claims) / 5) < 1e-9
+
+    recount = ClaimMetrics(FakeMetrics(), claims).summary()
+    assert recount == summary
+
+
+def test_dashboard_and_trend_read_bounded_documents():
+    store = FakeMetrics()
+    metrics = ClaimMetrics(store, FakeClaims([]))
+    metrics.summary()
+    for day in (1, 3, 3):
+        metrics.record_created(_claim("Motor", "PENDING_REVIEW", 0.5, day))
+    metrics.record_reviewed("PENDING_REVIEW", "REJECTED", datetime(2026, 10, 3, 15))
+
+    store.reads = 0
+    assert metrics.summary()["total_claims"] == 3
+    assert store.reads == 1
+
+    trend = metrics.trend(days=3, today=datetime(2026, 10, 3))
+    assert store.reads == 2
+    assert [(row["day"], row["claims"], row["reviews"]) for row in trend] == [
+        ("2026-10-01", 1, 0),
+        ("2026-10-02", 0, 0),
+        ("2026-10-03", 2, 1),
+    ]
+    assert trend[2]["reviewed"] == {"REJECTED": 1}
+
+
+def test_averages_skip_claims_without_the_value_like_avg():
+    scored = [_claim("Health", "APPROVED", 0.2, 1), _claim("Motor", "APPROVED", 0.6, 1)]
+    unscored = _claim("Motor", "PROCESSING", None, 2)
+    del unscored["fraud_score"]
+    scored[0]["processing_minutes"] = 30
+    claims = FakeClaims(scored + [unscored])
+
+    summary = ClaimMetrics(FakeMetrics(), claims).summary()
+    assert summary["total_claims"] == 3
+    assert abs(summary["avg_fraud_score"] - 0.4) < 1e-9
+    assert summary["avg_process_minutes"] == 30
+
+    metrics = ClaimMetrics(FakeMetrics(), FakeClaims([]))
+    metrics.summary()
+    for claim in claims.claims:
+        metrics.record_created(claim)
+    assert metrics.summary() == summary
+
+
+def test_totals_from_an_older_rollup_are_rebuilt():
+    store = FakeMetrics()
+    store.documents["totals"] = {"_id": "totals", "claims": 9, "fraud_score_sum": 4.5, "seeded_at": datetime(2026, 1, 1)}
+    metrics = ClaimMetrics(store, FakeClaims([_claim("Health", "APPROVED", 0.5, 1)]))
+
+    assert metrics.summary()["total_claims"] == 1
+    assert store.documents["totals"]["fraud_score_count"] == 1
@@ -0,0 +1,128 @@
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.services.claim_search import (
+    backfill_search_tokens,
+    claim_search_tokens,
+    query_terms,
+    search_claims,
+    search_fields,
+    start_search_backfill,
+)
+
+
+def _value(document, dotted):
+    for part in dotted.split("."):
+        document = (document or {}).get(part)
+    return document
+
+
+def _matches(document, query):
+    for field, condition in query.items():
+        value = _value(document, field)
+        if isinstance(condition, dict) and "$all" in condition:
+            if not set(condition["$all"]) <= set(value or []):
+                return False
+        elif isinstance(condition, dict) and "$in" in condition:
+            if value not in condition["$in"]:
+                return False
+        elif isinstance(condition, dict) and "$ne" in condition:
+            if value == condition["$ne"]:
+                return False
+        elif value != condition:
+            return False
+    return True
+
+
+class FakeCursor(list):
+    def sort(self, field, direction):
+        return FakeCursor(sorted(self, key=lambda document: document[field], reverse=direction < 0))
+
+    def limit(self, count):
+        return FakeCursor(self[:count])
+
+
+class FakeClaims:
+    """Evaluates the handful of operators claim search uses; records every query."""
+
+    def __init__(self, documents):
+        self.documents = documents
+        self.queries = []
+        self.bulk_writes = []
+
+    def find(self, query, projection=None, batch_size=None):
+        self.queries.append(query)
+        return FakeCursor(document for document in self.documents if _matches(document, query))
+
+    def bulk_write(self, operations, ordered=True):
+        self.bulk_writes.append(operations)
+        for operation in operations:
+            for document in self.documents:
+                if document["_id"] == operation._filter["_id"]:
+                    document.update(operation._doc["$set"])
+        return SimpleNamespace(modified_count=len(operations))
+
+
+def _claim(number, name, email, claim_type="health", status="PENDING_REVIEW", age=0):
+    claim = {
+        "_id": number,
+        "claim_id": f"CLM-{number:05d}",
+        "claimer": {"name": name, "email": email},
+        "claim_type": claim_type,
+        "status": status,
+        "created_at": datetime(2026, 1, 1) - timedelta(minutes=age),
+    }
+    claim.update(search_fields(claim))
+    return claim
+
+
+def test_tokens_are_edge_ngrams_and_queries_never_reach_a_regex():
+    tokens = claim_search_tokens({"claim_id": "CLM-00042", "claimer": {"name": "Anna Kowalski", "email": "a.k@x.io"}})
+    assert {"an", "ann", "anna", "ko", "kowalski", "clm", "00", "00042", "io"} <= set(tokens)
+    assert query_terms("  Kowal.* (anna ") == ["kowal", "anna"]
+    assert query_terms(".*") == []
+
+
+def test_prefix_search_ranks_and_respects_filters():
+    claims = FakeClaims([
+        _claim(1, "Anna Kowalski", "anna.k@example.com", age=3),
+        _claim(2, "Annabel Smith", "bel@example.com", age=1),
+        _claim(3, "Jo Anna", "jo@example.com", status="APPROVED", age=2),
+        _claim(4, "Bob Stone", "bob@example.com", claim_type="motor", age=0),
+    ])
+
+    rows = search_claims(claims, "anna", limit=10)
+    # Exact word "anna" in the email of claim 1 beats exact name hits; a prefix hit (Annabel) comes last.
+    assert [row["claim_id"] for row in rows] == ["CLM-00001", "CLM-00003", "CLM-00002"]
+    assert claims.queries[0]["search_tokens"] == {"$all": ["anna"]}
+
+    assert [row["claim_id"] for row in search_claims(claims, "anna", filters={"status": "APPROVED"})] == ["CLM-00003"]
+    assert [row["claim_id"] for row in search_claims(claims, "bob@exa")] == ["CLM-00004"]
+    assert [row["claim_id"] for row in search_claims(claims, "clm-0000", limit=2)] == ["CLM-00004", "CLM-00002"]
+    assert search_claims(claims, "anna zzz") == []
+
+
+def test_backfill_tokenizes_claims_missing_current_tokens():
+    fresh = _claim(1, "Anna Kowalski", "anna@example.com")
+    legacy = {"_id": 2, "claim_id": "CLM-00002", "claimer": {"name": "Bob Stone", "email": "bob@example.com"}, "claim_type": "motor", "created_at": datetime(2026, 1, 1)}
+    claims = FakeClaims([fresh, legacy])
+
+    stats = backfill_search_tokens(claims, batch_size=10)
+
+    assert stats["scanned"] == stats["written"] == 1
+    assert [row["claim_id"] for row in search_claims(claims, "stone")] == ["CLM-00002"]
+
+
+def test_startup_backfill_runs_in_the_background_and_skips_current_claims():
+    legacy = {"_id": 2, "claim_id": "CLM-00002", "claimer": {"name": "Bob Stone", "email": "bob@example.com"}, "claim_type": "motor", "created_at": datetime(2026, 1, 1)}
+    claims = FakeClaims([_claim(1, "Anna Kowalski", "anna@example.com"), legacy])
+
+    start_search_backfill(claims).join(5)
+    assert [row["claim_id"] for row in search_claims(claims, "stone")] == ["CLM-00002"]
+
+    # A second start (the next boot) finds nothing left to tokenize.
+    assert backfill_search_tokens(claims)["scanned"] == 0
@@ -0,0 +1,71 @@
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.nodes.node1_extraction import extraction_engine
+from app.nodes.node1_extraction.extractor import process_documents
+from app.services.llm_cache import LlmResponseCache
+from app.services.ollama_client import OllamaClient, OllamaUnavailableError
+from ollama_stub import OllamaStub
+
+LLM_DELAY = 0.3
+DOCUMENTS = {
+    "policy.pdf": "POLICY SCHEDULE Policy Number STAR-HEALTH-2024-88997766",
+    "bill.jpg": "FINAL BILL Total Rs. 45,000",
+    "aadhaar.jpg": "AADHAAR 1234 5678 9012",
+    "report.pdf": "DISCHARGE SUMMARY Diagnosis: Appendicitis",
+}
+
+
+def _use_stub(monkeypatch, stub, slots, cache_path):
+    monkeypatch.setattr(extraction_engine, "ollama_client", OllamaClient(base_url=stub.url, max_in_flight=slots))
+    monkeypatch.setattr(extraction_engine, "llm_cache", LlmResponseCache(str(cache_path), ttl_seconds=60, max_entries=100))
+    monkeypatch.setattr(
+        extraction_engine,
+        "extract_text_with_stats",
+        lambda path: (DOCUMENTS[path], {"pages": 1, "text_layer_pages": 1, "ocr_pages": 0, "cache_hit": False}),
+    )
+
+
+def _timed_run():
+    started = time.perf_counter()
+    result = process_documents("CLM-STUB", list(DOCUMENTS))
+    return result, time.perf_counter() - started
+
+
+def test_extractions_and_reconcile_overlap_within_limit(monkeypatch, tmp_path):
+    with OllamaStub(delay=LLM_DELAY) as stub:
+        _use_stub(monkeypatch, stub, slots=1, cache_path=tmp_path / "sequential.sqlite3")
+        _, sequential = _timed_run()
+
+        stub.max_in_flight = 0
+        _use_stub(monkeypatch, stub, slots=3, cache_path=tmp_path / "concurrent.sqlite3")
+        result, concurrent = _timed_run()
+
+    # 4 extractions + 1 reconciliation through 3 slots take two rounds, not five.
+    assert sequential >= 5 * LLM_DELAY
+    assert concurrent < 3 * LLM_DELAY
+    assert stub.max_in_flight == 3
+    assert [doc["file"] for doc in result["documents"]] == list(DOCUMENTS)
+    assert result["extracted_entities"]["policy_number"] == "STAR-HEALTH-2024-88997766"
+
+
+def test_unavailable_ollama_fails_the_claim_instead_of_blank_entities(monkeypatch, tmp_path):
+    with OllamaStub() as stub:
+        _use_stub(monkeypatch, stub, slots=1, cache_path=tmp_path / "open.sqlite3")
+        extraction_engine.ollama_client.breaker.failure_threshold = 1
+        extraction_engine.ollama_client.breaker.reset_seconds = 60
+        extraction_engine.ollama_client.breaker.record_failure()
+
+        with pytest.raises(OllamaUnavailableError):
+            extraction_engine.extract_node_1("bill.jpg", raw_text=DOCUMENTS["bill.jpg"])
+        with pytest.raises(OllamaUnavailableError):
+            extraction_engine.global_reconcile(list(DOCUMENTS.values()))
+        with pytest.raises(OllamaUnavailableError):
+            process_documents("CLM-STUB", list(DOCUMENTS))
+    assert stub.requests == []
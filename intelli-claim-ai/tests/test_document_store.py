@@ -0,0 +1,106 @@
+import os
+import sys
+import time
+from pathlib import Path
+
+from PIL import Image
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.services.document_store import DocumentStore
+from app.utils import file_loader
+
+SHA = "ab" + "0" * 62
+
+
+def _blob(store, content=b"%PDF-1.4 scan", sha=SHA):
+    part = store.new_part_path()
+    Path(part).write_bytes(content)
+    return store.commit_blob(part, sha, ".pdf", len(content))
+
+
+def _age(path, seconds):
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+def test_blobs_are_refcounted_across_claims(tmp_path):
+    store = DocumentStore(str(tmp_path))
+    path, created = _blob(store)
+    again, created_again = _blob(store)
+    assert created and not created_again and path == again
+
+    store.add_refs("CL-1", [(SHA, "bill.pdf")])
+    store.add_refs("CL-1", [(SHA, "bill.pdf")])  # retry of the same submission
+    store.add_refs("CL-2", [(SHA, "bill_copy.pdf")])
+    assert store.refcount(SHA) == 2
+
+    store.release_claim("CL-1")
+    assert store.refcount(SHA) == 1
+    assert store.compact(scratch_retention_seconds=0, orphan_grace_seconds=0)["orphan_blobs"] == 0
+    assert os.path.exists(path)
+
+    store.release_claim("CL-2")
+    assert store.compact(scratch_retention_seconds=0, orphan_grace_seconds=0)["orphan_blobs"] == 1
+    assert not os.path.exists(path)
+
+
+def test_release_refs_keeps_refs_the_claim_already_held(tmp_path):
+    store = DocumentStore(str(tmp_path))
+    other = "cd" + "0" * 62
+    _blob(store)
+    _blob(store, b"%PDF-1.4 discharge", other)
+    assert store.add_refs("CL-1", [(SHA, "bill.pdf")]) == [SHA]
+
+    # A resubmission of CL-1 re-uploads the bill and adds a discharge summary, then fails.
+    added = store.add_refs("CL-1", [(SHA, "bill.pdf"), (other, "discharge.pdf")])
+    assert added == [other]
+    store.release_refs("CL-1", added)
+
+    assert store.refcount(SHA) == 1
+    assert store.refcount(other) == 0
+
+
+def test_scratch_dirs_are_isolated_and_evicted_after_retention(tmp_path):
+    store = DocumentStore(str(tmp_path))
+    first = store.scratch_dir("CL-1")
+    second = store.scratch_dir("CL-1")
+    assert first != second
+    Path(first, "page_0.jpg").write_bytes(b"old")
+    Path(second, "page_0.jpg").write_bytes(b"new")
+    _age(first, 3 * 3600)
+
+    stats = store.compact(scratch_retention_seconds=3600, orphan_grace_seconds=3600)
+
+    assert stats["scratch_dirs"] == 1
+    assert not os.path.exists(first) and os.path.exists(second)
+
+
+def test_unreferenced_uploads_survive_the_grace_period(tmp_path):
+    store = DocumentStore(str(tmp_path))
+    path, _ = _blob(store)
+    stale_part = store.new_part_path()
+    Path(stale_part).write_bytes(b"half written")
+    _age(stale_part, 7200)
+
+    stats = store.compact(scratch_retention_seconds=3600, orphan_grace_seconds=3600)
+
+    assert stats == {"scratch_dirs": 0, "orphan_blobs": 0, "stale_parts": 1, "bytes_freed": 12}
+    assert os.path.exists(path)
+
+
+def test_rasterized_pages_go_to_a_scratch_dir_per_call(tmp_path, monkeypatch):
+    store = DocumentStore(str(tmp_path))
+    monkeypatch.setattr(file_loader, "document_store", store)
+    monkeypatch.setattr(file_loader, "convert_from_path", lambda path, poppler_path=None: [Image.new("RGB", (8, 8)) for _ in range(2)])
+
+    first = file_loader.pdf_to_images("bill.pdf", claim_id="CL-1")
+    second = file_loader.pdf_to_images("bill.pdf", claim_id="CL-1")
+
+    assert [os.path.basename(path) for path in first] == ["page_0.jpg", "page_1.jpg"]
+    assert os.path.dirname(first[0]) != os.path.dirname(second[0])
+    assert all(path.startswith(store.claim_dir("CL-1", create=False)) for path in first + second)
+
+    store.release_claim("CL-1")
+    assert not any(os.path.exists(path) for path in first + second)
@@ -0,0 +1,47 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.core.executors import claim_slots, run_blocking
+
+
+def test_claim_slots_are_created_per_event_loop(monkeypatch):
+    monkeypatch.setenv("CLAIM_MAX_CONCURRENCY", "1")
+
+    async def contend():
+        # Two claims on one slot: the second waits, which binds the semaphore to this loop.
+        async def claim():
+            async with claim_slots():
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(claim(), claim())
+        return claim_slots()
+
+    first = asyncio.run(contend())
+    second = asyncio.run(contend())  # a shared semaphore would be bound to the first, closed loop
+    assert first is not second
+
+
+def test_claims_in_flight_never_exceed_the_configured_limit(monkeypatch):
+    monkeypatch.setenv("CLAIM_MAX_CONCURRENCY", "2")
+    in_flight, peak = 0, 0
+
+    def blocking_node():
+        time.sleep(0.01)
+
+    async def claim():
+        nonlocal in_flight, peak
+        async with claim_slots():
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await run_blocking("io", blocking_node)
+            in_flight -= 1
+
+    async def burst():
+        await asyncio.gather(*(claim() for _ in range(10)))
+
+    asyncio.run(burst())
+    assert peak == 2
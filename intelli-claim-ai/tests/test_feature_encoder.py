@@ -0,0 +1,38 @@
+import sys
+from pathlib import Path
+
+import joblib
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.nodes.node4_fraud_detection.feature_encoder import FraudFeatureEncoder, encoder_for
+from fraud_records import make_fraud_records
+from legacy_fraud_preprocess import _preprocess_fraud_data as legacy_preprocess
+
+FEATURES = joblib.load(Path(__file__).parent.parent / "fraud_features.pkl")
+
+
+def test_batch_matches_legacy_preprocessing_row_for_row():
+    records = make_fraud_records(400)
+    records += [
+        {},
+        {"property_damage": 1, "police_report_available": True, "policy_csl": "250/500"},
+        {"insured_sex": "m", "insured_relationship": "Other Relative", "insured_hobbies": "CHESS,golf ,  polo"},
+        {"age": None, "witnesses": "", "policy_state": 0, "incident_city": float("nan")},
+    ]
+    matrix = FraudFeatureEncoder(FEATURES).encode(records)
+
+    assert matrix.shape == (len(records), len(FEATURES))
+    for row, record in zip(matrix, records):
+        expected = legacy_preprocess(record, FEATURES).to_numpy(dtype=np.float64)[0]
+        np.testing.assert_array_equal(row, expected, err_msg=str(record))
+
+
+def test_encoder_is_rebuilt_only_when_the_features_list_changes():
+    encoder = encoder_for(FEATURES)
+    assert encoder_for(FEATURES) is encoder
+    assert encoder.column_index["incident_city_Springfield"] == FEATURES.index("incident_city_Springfield")
+
+    reloaded = list(FEATURES)  # what the model registry hands out after a file change
+    assert encoder_for(reloaded) is not encoder
@@ -0,0 +1,214 @@
+"""
+Query-plan checks for the hot repository queries. Needs a local mongod
+(MONGO_EXPLAIN_URI, default mongodb://localhost:27017) and is skipped
+without one. Each query runs through the real repository function against a
+scratch database, and its plan must not contain a COLLSCAN.
+"""
+
+import os
+import sys
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+from pymongo import MongoClient
+from pymongo.errors import PyMongoError
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.database.indexes import INDEXES, ensure_indexes, plan_stages
+from app.services.claim_jobs import COMPLETED, FAILED, QUEUED, RUNNING
+from app.services.claim_search import search_fields
+
+EXPLAIN_URI = os.getenv("MONGO_EXPLAIN_URI", "mongodb://localhost:27017")
+
+
+def _local_client():
+    try:
+        client = MongoClient(EXPLAIN_URI, serverSelectionTimeoutMS=500)
+        client.admin.command("ping")
+        return client
+    except PyMongoError:
+        return None
+
+
+client = _local_client()
+needs_mongod = pytest.mark.skipif(client is None, reason="needs a local mongod for explain()")
+
+
+class ExplainRecorder:
+    """Passes calls through to a real collection and keeps every read to explain afterwards."""
+
+    def __init__(self, collection):
+        self.collection = collection
+        self.cursors = []
+        self.pipelines = []
+
+    def __getattr__(self, name):
+        return getattr(self.collection, name)
+
+    def find(self, *args, **kwargs):
+        cursor = self.collection.find(*args, **kwargs)
+        self.cursors.append(cursor)
+        return cursor
+
+    def find_one(self, filter=None, *args, **kwargs):
+        cursor = self.collection.find(filter, *args, **kwargs).limit(1)
+        self.cursors.append(cursor)
+        return next(cursor.clone(), None)
+
+    def find_one_and_update(self, filter, update, sort=None, **kwargs):
+        cursor = self.collection.find(filter).limit(1)
+        if sort:
+            cursor = cursor.sort(sort)
+        self.cursors.append(cursor)
+        return self.collection.find_one_and_update(filter, update, sort=sort, **kwargs)
+
+    def aggregate(self, pipeline, **kwargs):
+        self.pipelines.append(pipeline)
+        return self.collection.aggregate(pipeline, **kwargs)
+
+    def plans(self):
+        plans = [cursor.clone().explain() for cursor in self.cursors]
+        plans.extend(
+            self.collection.database.command("aggregate", self.collection.name, pipeline=pipeline, explain=True)
+            for pipeline in self.pipelines
+        )
+        self.cursors, self.pipelines = [], []
+        return plans
+
+
+@pytest.fixture(scope="module")
+def collections():
+    os.environ.setdefault("MONGO_URI", EXPLAIN_URI)
+    database = client[f"index_plans_{uuid.uuid4().hex[:8]}"]
+    scratch = {name: database[name.replace("_collection", "")] for name in INDEXES}
+    ensure_indexes(scratch)
+
+    now = datetime.utcnow()
+    statuses = ["PENDING_REVIEW", "FLAGGED_FOR_REVIEW", "APPROVED", "REJECTED", "PROCESSING"]
+    claims = [
+        {
+            "claim_id": f"CLM-{i:05d}",
+            "claim_type": ["health", "motor"][i % 2],
+            "status": statuses[i % len(statuses)],
+            "fraud_score": (i % 100) / 100,
+            "claimer": {"name": f"Claimer {i % 40}", "email": f"user{i % 40}@example.com"},
+            "claim_amount": 1000 + i,
+            "created_at": now - timedelta(minutes=i),
+            "updated_at": now - timedelta(minutes=i // 2),
+        }
+        for i in range(500)
+    ]
+    for claim in claims:
+        claim.update(search_fields(claim))
+    scratch["claims_collection"].insert_many(claims)
+    scratch["policies_collection"].insert_many([{"policyNumber": f"MOT{i:08d}"} for i in range(200)])
+    scratch["fraud_classification_collection"].insert_many([
+        {"policy_number": f"MOT{i:08d}", "claimer_name": f"Claimer {i % 40}"} for i in range(200)
+    ])
+    job_statuses = [QUEUED, RUNNING, COMPLETED, FAILED]
+    jobs = []
+    for i in range(100):
+        job = {"_id": f"job-{i}", "claim_id": f"CLM-{i:05d}", "status": job_statuses[i % 4], "attempts": 1, "next_attempt_at": now}
+        if job["status"] == RUNNING:
+            job["lease_expires_at"] = now - timedelta(minutes=1)  # for the reclaim branch of _claim_next_job
+        jobs.append(job)
+    scratch["claim_jobs_collection"].insert_many(jobs)
+    yield {name: ExplainRecorder(collection) for name, collection in scratch.items()}
+    client.drop_database(database.name)
+
+
+def _assert_no_collscan(recorder, label):
+    plans = recorder.plans()
+    assert plans, f"{label} issued no reads"
+    for plan in plans:
+        stages = set(plan_stages(plan))
+        assert stages, f"{label}: no winning plan in explain output"
+        assert "COLLSCAN" not in stages, f"{label} scans the collection: {sorted(stages)}"
+
+
+@needs_mongod
+def test_claim_repository_queries_use_indexes(collections, monkeypatch):
+    from app.database import claim_repository
+
+    claims = collections["claims_collection"]
+    monkeypatch.setattr(claim_repository, "claims_collection", claims)
+
+    hot_queries = {
+        "get_claim_by_id": lambda: claim_repository.get_claim_by_id("CLM-00042"),
+        "list_claims": lambda: claim_repository.list_claims(),
+        "list_claims(email)": lambda: claim_repository.list_claims(claimer_email="user7@example.com"),
+        "list_claims(email, status)": lambda: claim_repository.list_claims(claimer_email="user7@example.com", status="APPROVED"),
+        "list_claims(status)": lambda: claim_repository.list_claims(status="APPROVED"),
+        "list_claims(claim_type)": lambda: claim_repository.list_claims(claim_type="motor"),
+        "list_reviewer_queue": lambda: claim_repository.list_reviewer_queue(),
+        "list_processed_claims": lambda: claim_repository.list_processed_claims(),
+        "get_claimer_stats": lambda: claim_repository.get_claimer_stats("user7@example.com"),
+        "list_claims(search)": lambda: claim_repository.list_claims(search="claimer 7", status="APPROVED"),
+        "search_user_claims": lambda: claim_repository.search_user_claims("user7@exa"),
+        "list_claims(cursor)": lambda: claim_repository.list_claims(
+            status="APPROVED", cursor=claim_repository.CLAIMS_ORDER.encode(claims.find_one({"claim_id": "CLM-00102"}))
+        ),
+        "list_reviewer_queue(cursor)": lambda: claim_repository.list_reviewer_queue(
+            cursor=claim_repository.REVIEWER_QUEUE_ORDER.encode({"fraud_score": 0.8, "claim_id": "CLM-00080"})
+        ),
+        "list_processed_claims(cursor)": lambda: claim_repository.list_processed_claims(
+            cursor=claim_repository.REVIEWER_HISTORY_ORDER.encode(claims.find_one({"claim_id": "CLM-00102"}))
+        ),
+    }
+    for label, run in hot_queries.items():
+        run()
+        _assert_no_collscan(claims, label)
+
+
+@needs_mongod
+def test_policy_fraud_and_job_lookups_use_indexes(collections, monkeypatch):
+    from app.nodes.node3_policy_coverage import policy_fetcher
+    from app.nodes.node4_fraud_detection import mongodb_fraud_classifier
+    from app.services import claim_jobs
+
+    monkeypatch.setattr(policy_fetcher, "policies_collection", collections["policies_collection"])
+    policy_fetcher.fetch_policy("MOT-00000042")
+    _assert_no_collscan(collections["policies_collection"], "fetch_policy")
+
+    fraud_records = collections["fraud_classification_collection"]
+    monkeypatch.setattr(mongodb_fraud_classifier, "fraud_classification_collection", fraud_records)
+    mongodb_fraud_classifier._fetch_fraud_data_by_policy("MOT00000042")
+    _assert_no_collscan(fraud_records, "fraud data by policy")
+    mongodb_fraud_classifier._fetch_fraud_data_by_claimer("Claimer 7")
+    _assert_no_collscan(fraud_records, "fraud data by claimer")
+
+    jobs = collections["claim_jobs_collection"]
+    monkeypatch.setattr(claim_jobs, "_jobs", lambda: jobs)
+    claim_jobs.get_job_for_claim("CLM-00007")
+    _assert_no_collscan(jobs, "get_job_for_claim")
+    claim_jobs._claim_next_job("worker-1", 30, 3)
+    _assert_no_collscan(jobs, "_claim_next_job")
+
+
+def test_plan_stages_reads_winning_plans_only():
+    explain = {
+        "queryPlanner": {
+            "winningPlan": {"stage": "LIMIT", "inputStage": {"stage": "FETCH", "inputStage": {"stage": "IXSCAN"}}},
+            "rejectedPlans": [{"stage": "COLLSCAN"}],
+        },
+        "stages": [{"$cursor": {"queryPlanner": {"winningPlan": {"queryPlan": {"stage": "IXSCAN"}}}}}],
+    }
+    assert list(plan_stages(explain)) == ["LIMIT", "FETCH", "IXSCAN", "IXSCAN"]
+
+
+def test_one_failing_index_does_not_block_the_rest():
+    class FakeCollection:
+        def create_indexes(self, models):
+            names = [model.document["name"] for model in models]
+            if "claim_id_unique" in names:
+                raise PyMongoError("E11000 duplicate key error")
+            return names
+
+    created = ensure_indexes({"claims_collection": FakeCollection()})
+
+    expected = [model.document["name"] for model in INDEXES["claims_collection"] if model.document["name"] != "claim_id_unique"]
+    assert created == {"claims_collection": expected}
+    assert expected
@@ -0,0 +1,59 @@
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.nodes.node1_extraction import extraction_engine
+from app.nodes.node1_extraction.extractor import process_documents
+from app.services.llm_cache import LlmResponseCache
+from app.services.ollama_client import OllamaClient
+from ollama_stub import OllamaStub
+
+
+def test_key_ignores_whitespace_but_tracks_model_and_version():
+    key = LlmResponseCache.make_key("gemma3:4b", "global_reconcile", 1, "Policy  No\nABC-1234 ")
+    assert key == LlmResponseCache.make_key("gemma3:4b", "global_reconcile", 1, "Policy No ABC-1234")
+    assert key != LlmResponseCache.make_key("gemma3:4b", "global_reconcile", 2, "Policy No ABC-1234")
+    assert key != LlmResponseCache.make_key("llama3:8b", "global_reconcile", 1, "Policy No ABC-1234")
+
+
+def test_entries_persist_expire_and_evict(tmp_path):
+    path = str(tmp_path / "llm.sqlite3")
+    cache = LlmResponseCache(path, ttl_seconds=60, max_entries=2)
+    assert cache.put_if_json("a", '{"risk_level": "LOW"}')
+    assert not cache.put_if_json("garbled", "not json")
+    cache.put("b", "{}")
+    cache.get("a")  # a is now more recently used than b
+    cache.put("c", "{}")
+    assert cache.stats()["evictions"] == 1
+    cache.close()
+
+    reopened = LlmResponseCache(path, ttl_seconds=60, max_entries=2)
+    assert reopened.get("a") == '{"risk_level": "LOW"}'
+    assert reopened.get("b") is None
+    assert reopened.stats()["hits"] == 1
+
+    reopened.ttl_seconds = 0
+    time.sleep(0.01)
+    assert reopened.get("c") is None
+    assert reopened.stats()["expired"] == 1
+
+
+def test_rerun_of_same_claim_skips_ollama(monkeypatch, tmp_path):
+    documents = {"policy.pdf": "POLICY Policy Number STAR-HEALTH-2024-88997766", "bill.jpg": "BILL Total Rs. 45,000"}
+    cache = LlmResponseCache(str(tmp_path / "llm.sqlite3"), ttl_seconds=60, max_entries=100)
+    monkeypatch.setattr(extraction_engine, "llm_cache", cache)
+    monkeypatch.setattr(extraction_engine, "extract_text_with_stats", lambda path: (documents[path], {"pages": 1}))
+
+    with OllamaStub() as stub:
+        monkeypatch.setattr(extraction_engine, "ollama_client", OllamaClient(base_url=stub.url))
+        first = process_documents("CLM-1", list(documents))
+        calls_after_first_run = len(stub.requests)
+        second = process_documents("CLM-1", list(documents))
+
+    assert calls_after_first_run == 3
+    assert len(stub.requests) == 3
+    assert second["extracted_entities"] == first["extracted_entities"]
+    assert cache.stats()["hits"] == 3
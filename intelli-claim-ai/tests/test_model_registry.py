@@ -0,0 +1,82 @@
+import os
+import pickle
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.services.model_registry import ModelRegistry
+from app.utils.hashing import hash_file
+
+
+def _write(path, obj):
+    with open(path, "wb") as handle:
+        pickle.dump(obj, handle)
+
+
+def _counting_loader(calls):
+    def load(path):
+        calls.append(path)
+        with open(path, "rb") as handle:
+            return pickle.load(handle)
+    return load
+
+
+def test_loads_once_and_reloads_when_file_changes(tmp_path):
+    path = tmp_path / "model.pkl"
+    _write(path, {"version": 1})
+    calls = []
+    registry = ModelRegistry(check_interval=0)
+    registry.register("model", lambda: path, loader=_counting_loader(calls))
+
+    assert registry.get("model") == {"version": 1}
+    assert registry.get("model") == {"version": 1}
+    assert len(calls) == 1
+
+    replacement = tmp_path / "model.pkl.new"
+    _write(replacement, {"version": 2, "padding": "x" * 64})
+    os.replace(replacement, path)
+
+    assert registry.get("model") == {"version": 2, "padding": "x" * 64}
+    assert len(calls) == 2
+    stats = registry.stats()["model"]
+    assert stats["loads"] == 2
+    assert stats["sha256"] == hash_file(str(path))
+    assert stats["load_seconds"] is not None and stats["size_bytes"] == path.stat().st_size
+
+
+def test_traces_python_allocations_when_enabled(tmp_path, monkeypatch):
+    monkeypatch.setenv("MODEL_TRACE_ALLOCATIONS", "1")
+    path = tmp_path / "model.pkl"
+    _write(path, ["feature_%d" % i for i in range(2000)])
+    registry = ModelRegistry(check_interval=0)
+    registry.register("model", lambda: path, loader=_counting_loader([]))
+    registry.get("model")
+    assert registry.stats()["model"]["python_bytes"] > 0
+
+
+def test_checksum_mismatch_keeps_previous_model(tmp_path):
+    path = tmp_path / "model.pkl"
+    _write(path, {"version": 1})
+    (tmp_path / "model.pkl.sha256").write_text(hash_file(str(path)))
+    registry = ModelRegistry(check_interval=0)
+    registry.register("model", lambda: path, loader=_counting_loader([]))
+    assert registry.get("model") == {"version": 1}
+
+    # Swapped file without an updated sidecar: refused, the verified model keeps serving.
+    _write(path, {"version": "tampered", "padding": "x" * 64})
+    assert registry.get("model") == {"version": 1}
+    stats = registry.stats()["model"]
+    assert stats["errors"] == 1
+    assert "ModelChecksumError" in stats["last_error"]
+
+
+def test_missing_or_empty_file_is_none(tmp_path):
+    path = tmp_path / "model.pkl"
+    registry = ModelRegistry(check_interval=0)
+    registry.register("model", lambda: path, loader=_counting_loader([]))
+    assert registry.get("model") is None
+
+    path.write_bytes(b"")
+    assert registry.get("model") is None
+    assert registry.warm_up() == {"model": False}
@@ -0,0 +1,73 @@
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.nodes.node1_extraction import extraction_engine
+from app.nodes.node1_extraction.ocr_cache import OcrCache
+
+
+def test_cache_key_tracks_content_and_settings(tmp_path):
+    first = tmp_path / "a.jpg"
+    second = tmp_path / "b.jpg"
+    first.write_bytes(b"same bytes")
+    second.write_bytes(b"same bytes")
+
+    settings = {"pipeline": 1}
+    assert OcrCache.make_key(str(first), settings) == OcrCache.make_key(str(second), settings)
+    assert OcrCache.make_key(str(first), settings) != OcrCache.make_key(str(first), {"pipeline": 2})
+
+
+def test_memory_tier_evicts_by_size_and_disk_tier_survives(tmp_path):
+    cache = OcrCache(str(tmp_path / "cache"), max_memory_bytes=1000)
+    cache.put("k1", {"text": "x" * 600})
+    cache.put("k2", {"text": "y" * 600})
+
+    stats = cache.stats()
+    assert stats["memory_entries"] == 1
+    assert stats["evictions"] == 1
+
+    # k1 was evicted from memory but is still on disk.
+    assert cache.get("k1")["text"] == "x" * 600
+    assert cache.stats()["disk_hits"] == 1
+    assert cache.get("missing") is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_extract_text_hybrid_runs_ocr_once_per_content(tmp_path, monkeypatch):
+    monkeypatch.setattr(extraction_engine, "ocr_cache", OcrCache(str(tmp_path / "cache"), 1024 * 1024))
+    calls = []
+
+    def fake_ocr(path):
+        calls.append(path)
+        return "POLICY NO ABC-1234", {"pages": 1, "text_layer_pages": 0, "ocr_pages": 1}
+
+    monkeypatch.setattr(extraction_engine, "_run_ocr", fake_ocr)
+
+    upload = tmp_path / "bill.jpg"
+    duplicate = tmp_path / "bill_copy.jpg"
+    upload.write_bytes(b"scan")
+    duplicate.write_bytes(b"scan")
+
+    assert extraction_engine.extract_text_hybrid(str(upload)) == "POLICY NO ABC-1234"
+    assert extraction_engine.extract_text_hybrid(str(upload)) == "POLICY NO ABC-1234"
+    assert extraction_engine.extract_text_hybrid(str(duplicate)) == "POLICY NO ABC-1234"
+    assert calls == [str(upload)]
+
+
+def test_disk_tier_evicts_least_recently_used_entries_past_its_cap(tmp_path):
+    cache = OcrCache(str(tmp_path / "cache"), max_memory_bytes=0, max_disk_bytes=3000)
+    for i, key in enumerate(["aa1", "bb2", "cc3"]):
+        cache.put(key, {"text": key * 300})
+        past = time.time() - 100 + i
+        os.utime(cache._disk_path(key), (past, past))
+
+    assert cache.get("aa1") is not None  # a disk hit makes aa1 the most recently used
+    cache.put("dd4", {"text": "dd4" * 300})
+
+    assert cache.stats()["disk_evictions"] == 2
+    assert [key for key in ["aa1", "bb2", "cc3", "dd4"] if os.path.exists(cache._disk_path(key))] == ["aa1", "dd4"]
+    assert cache.stats()["disk_bytes"] <= 3000 * 0.9
@@ -0,0 +1,89 @@
+import asyncio
+import socket
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.services.llm_cache import LlmResponseCache
+from app.services.llm_service import LLMService
+from app.services.ollama_client import OllamaClient, OllamaUnavailableError
+from ollama_stub import OllamaStub
+
+
+def _closed_port_url():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}"
+
+
+def test_sync_and_async_calls_reuse_pooled_connections():
+    with OllamaStub() as stub:
+        client = OllamaClient(base_url=stub.url, max_in_flight=2)
+        for _ in range(5):
+            response = client.chat("gemma3:4b", [{"role": "user", "content": "hi"}], call_site="extract_node_1", format="json")
+            assert "policy_number" in response["message"]["content"]
+
+        async def run_async():
+            try:
+                return await client.agenerate("gemma3:4b", "hi", call_site="analyze_claim_context", format="json")
+            finally:
+                await client.aclose()
+
+        assert "policy_number" in asyncio.run(run_async())["response"]
+
+    # Five sync calls over one keep-alive connection, plus the async client's own.
+    assert len(stub.requests) == 6
+    assert len(stub.connections) == 2
+
+
+def test_breaker_opens_after_consecutive_failures_and_fails_fast():
+    client = OllamaClient(base_url=_closed_port_url(), breaker_failures=2, breaker_reset_seconds=60)
+    for _ in range(2):
+        with pytest.raises(Exception):
+            client.generate("gemma3:4b", "hi", call_site="analyze_claim_context")
+    assert client.breaker.state == "open"
+
+    started = time.perf_counter()
+    with pytest.raises(OllamaUnavailableError):
+        client.generate("gemma3:4b", "hi", call_site="analyze_claim_context")
+    assert time.perf_counter() - started < 0.05
+
+
+def test_breaker_closes_after_successful_trial_call():
+    with OllamaStub() as stub:
+        client = OllamaClient(base_url=stub.url, breaker_failures=1, breaker_reset_seconds=0.05)
+        client.breaker.record_failure()
+        assert client.breaker.state == "open"
+        time.sleep(0.06)
+        client.generate("gemma3:4b", "hi", call_site="analyze_claim_context")
+        assert client.breaker.state == "closed"
+
+
+def test_llm_service_uses_shared_client(monkeypatch, tmp_path):
+    monkeypatch.setattr("app.services.llm_service.llm_cache", LlmResponseCache(str(tmp_path / "llm.sqlite3"), 60, 100))
+    with OllamaStub(response={"risk_level": "HIGH", "fraud_indicators": ["Name mismatch"]}) as stub:
+        service = LLMService(client=OllamaClient(base_url=stub.url))
+        analysis = service.analyze_claim_context("Doc: bill\nText: Total Rs. 45,000")
+
+    assert analysis["risk_level"] == "HIGH"
+    assert stub.requests[0]["path"] == "/api/generate"
+    assert stub.requests[0]["format"] == "json"
+
+
+def test_llm_service_propagates_open_breaker(monkeypatch, tmp_path):
+    monkeypatch.setattr("app.services.llm_service.llm_cache", LlmResponseCache(str(tmp_path / "llm.sqlite3"), 60, 100))
+    client = OllamaClient(base_url=_closed_port_url(), breaker_failures=1, breaker_reset_seconds=60)
+    client.breaker.record_failure()
+    service = LLMService(client=client)
+
+    # An open breaker must reach the claim job (which retries), not become an "UNKNOWN" analysis.
+    with pytest.raises(OllamaUnavailableError):
+        service.analyze_claim_context("Doc: bill\nText: Total Rs. 45,000")
+    with pytest.raises(OllamaUnavailableError):
+        service.extract_structured_data("Total Rs. 45,000", "bill")
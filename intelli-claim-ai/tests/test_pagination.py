@@ -0,0 +1,117 @@
+import random
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.database.pagination import InvalidCursorError, KeysetOrder
+
+OPERATORS = {
+    "$eq": lambda value, operand: value == operand,
+    "$lt": lambda value, operand: value is not None and value < operand,
+    "$gte": lambda value, operand: value is not None and value >= operand,
+    "$in": lambda value, operand: value in operand,
+}
+
+
+def _matches(document, query):
+    for field, condition in query.items():
+        if field == "$or":
+            if not any(_matches(document, branch) for branch in condition):
+                return False
+            continue
+        value = document.get(field)
+        if isinstance(condition, dict):
+            if not all(OPERATORS[op](value, operand) for op, operand in condition.items()):
+                return False
+        elif value != condition:
+            return False
+    return True
+
+
+def _page(documents, order, query, cursor, limit):
+    rows = [document for document in documents if _matches(document, order.filter(query, cursor))]
+    for field, direction in reversed(order.sort):
+        # Like MongoDB, null and missing sort below every value.
+        rows.sort(key=lambda document: (document.get(field) is not None, document.get(field)), reverse=direction < 0)
+    return rows[:limit]
+
+
+def _walk(documents, order, query, limit):
+    seen, cursor, pages = [], None, 0
+    while True:
+        rows = _page(documents, order, query, cursor, limit)
+        seen.extend(row["claim_id"] for row in rows)
+        pages += 1
+        cursor = order.next_cursor(rows, limit)
+        if cursor is None:
+            return seen, pages
+
+
+def test_walking_pages_visits_every_row_once_in_order_despite_ties():
+    rng = random.Random(5)
+    start = datetime(2026, 1, 1)
+    documents = [
+        {
+            "claim_id": f"CLM-{i:05d}",
+            "status": rng.choice(["PENDING_REVIEW", "FLAGGED_FOR_REVIEW", "APPROVED"]),
+            # Coarse values so many rows tie on the sort field.
+            "fraud_score": rng.choice([0.6, 0.7, 0.85, 0.9]),
+            "created_at": start + timedelta(seconds=rng.randrange(20)),
+        }
+        for i in range(237)
+    ]
+
+    queue = KeysetOrder("reviewer_queue", "fraud_score")
+    query = {"status": {"$in": ["PENDING_REVIEW", "FLAGGED_FOR_REVIEW"]}, "fraud_score": {"$gte": 0.7}}
+    expected = [row["claim_id"] for row in _page(documents, queue, query, None, len(documents))]
+    seen, pages = _walk(documents, queue, query, limit=10)
+    assert seen == expected
+    assert pages == len(expected) // 10 + 1
+
+    claims = KeysetOrder("claims", "created_at")
+    seen, _ = _walk(documents, claims, {}, limit=25)
+    assert sorted(seen) == sorted(row["claim_id"] for row in documents)
+    assert len(seen) == len(set(seen))
+
+
+def test_cursor_filter_keeps_listing_bounds_in_both_branches():
+    queue = KeysetOrder("reviewer_queue", "fraud_score")
+    cursor = queue.encode({"fraud_score": 0.8, "claim_id": "CLM-00042"})
+    query = queue.filter({"status": {"$in": ["FLAGGED_FOR_REVIEW"]}, "fraud_score": {"$gte": 0.6}}, cursor)
+
+    assert query == {
+        "$or": [
+            {"status": {"$in": ["FLAGGED_FOR_REVIEW"]}, "fraud_score": {"$gte": 0.6, "$lt": 0.8}},
+            {"status": {"$in": ["FLAGGED_FOR_REVIEW"]}, "fraud_score": {"$gte": 0.6, "$eq": None}},
+            {"status": {"$in": ["FLAGGED_FOR_REVIEW"]}, "fraud_score": {"$gte": 0.6, "$eq": 0.8}, "claim_id": {"$lt": "CLM-00042"}},
+        ]
+    }
+    claims = KeysetOrder("claims", "created_at")
+    created = datetime(2026, 3, 1, 12, 30, 5, 123000)
+    assert claims.decode(claims.encode({"created_at": created, "claim_id": "CLM-1"})) == (created, "CLM-1")
+
+
+def test_rows_with_null_or_missing_sort_keys_are_not_skipped():
+    documents = [{"claim_id": f"CLM-{i:05d}", "fraud_score": [0.9, 0.5, None][i % 3]} for i in range(30)]
+    for document in documents[2::6]:
+        del document["fraud_score"]  # legacy rows without the field at all
+
+    queue = KeysetOrder("reviewer_queue", "fraud_score")
+    expected = [row["claim_id"] for row in _page(documents, queue, {}, None, len(documents))]
+    seen, _ = _walk(documents, queue, {}, limit=4)
+
+    assert seen == expected
+    assert expected[-10:] == [row["claim_id"] for row in sorted(documents, key=lambda row: row["claim_id"], reverse=True) if row.get("fraud_score") is None]
+
+
+def test_foreign_or_malformed_cursors_are_rejected():
+    queue = KeysetOrder("reviewer_queue", "fraud_score")
+    history = KeysetOrder("reviewer_history", "updated_at")
+    with pytest.raises(InvalidCursorError):
+        history.filter({}, queue.encode({"fraud_score": 0.8, "claim_id": "CLM-1"}))
+    with pytest.raises(InvalidCursorError):
+        queue.filter({}, "not-a-cursor")
@@ -0,0 +1,94 @@
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import fitz
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.nodes.node1_extraction import pdf_ocr
+
+
+POLICY_TEXT = "Policy Number: STAR-HEALTH-2024-88997766\nInsured: Neha Prakash Verma\nSum Insured: Rs. 5,00,000"
+
+
+def _make_pdf(path):
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), POLICY_TEXT)
+    doc.new_page()  # no text layer, like a scanned page
+    doc.new_page().insert_text((72, 72), POLICY_TEXT)
+    doc.save(str(path))
+    doc.close()
+
+
+def test_text_layer_quality_check():
+    assert pdf_ocr.text_layer_is_usable(POLICY_TEXT)
+    assert not pdf_ocr.text_layer_is_usable("   ")
+    assert not pdf_ocr.text_layer_is_usable("��~~|| ¦¦ ¤¤" * 10)
+
+
+def test_only_pages_without_text_layer_are_ocrd(tmp_path, monkeypatch):
+    pdf_path = tmp_path / "policy.pdf"
+    _make_pdf(pdf_path)
+
+    ocr_requests = []
+
+    def fake_ocr(path, pages, poppler_path=None, tesseract_cmd=None):
+        ocr_requests.append(list(pages))
+        return {page: "SCANNED PAGE" for page in pages}
+
+    monkeypatch.setattr(pdf_ocr, "ocr_pdf_pages", fake_ocr)
+
+    page_texts, stats = pdf_ocr.extract_pdf_text(str(pdf_path))
+
+    assert ocr_requests == [[2]]
+    assert stats == {"pages": 3, "text_layer_pages": 2, "ocr_pages": 1}
+    assert "STAR-HEALTH-2024-88997766" in page_texts[1]
+    assert page_texts[2] == "SCANNED PAGE"
+
+
+def test_pages_ocrd_in_parallel_come_back_in_page_order(monkeypatch):
+    pool = ThreadPoolExecutor(max_workers=4)
+
+    def fake_ocr_page(path, page, poppler_path, tesseract_cmd):
+        time.sleep(0.01 * (5 - page))  # later pages finish first
+        return f"text of page {page}"
+
+    monkeypatch.setenv(pdf_ocr.OCR_PROCESSES_ENV, "4")
+    monkeypatch.setattr(pdf_ocr, "ocr_page", fake_ocr_page)
+    monkeypatch.setattr(pdf_ocr, "_get_pool", lambda: pool)
+    try:
+        texts = pdf_ocr.ocr_pdf_pages("scan.pdf", [1, 2, 3, 4])
+    finally:
+        pool.shutdown()
+
+    assert list(texts.items()) == [(page, f"text of page {page}") for page in (1, 2, 3, 4)]
+
+
+def test_pool_is_sized_from_the_environment(monkeypatch):
+    created = []
+
+    class RecordingPool:
+        def __init__(self, max_workers, mp_context):
+            created.append(max_workers)
+
+        def shutdown(self, wait=True, cancel_futures=False):
+            pass
+
+    monkeypatch.setattr(pdf_ocr, "ProcessPoolExecutor", RecordingPool)
+    monkeypatch.setattr(pdf_ocr, "_pool", None)
+    monkeypatch.setenv(pdf_ocr.OCR_PROCESSES_ENV, "3")
+    assert pdf_ocr._get_pool() is pdf_ocr._get_pool()
+    assert created == [3]
+
+    # One worker (or a single page) is OCR'd inline without starting a pool.
+    pdf_ocr._reset_pool()
+    monkeypatch.setenv(pdf_ocr.OCR_PROCESSES_ENV, "1")
+    monkeypatch.setattr(pdf_ocr, "ocr_page", lambda path, page, poppler_path, tesseract_cmd: f"page {page}")
+    assert pdf_ocr.ocr_pdf_pages("scan.pdf", [1, 2]) == {1: "page 1", 2: "page 2"}
+    assert created == [3]
+
+    monkeypatch.setenv(pdf_ocr.OCR_PROCESSES_ENV, "not-a-number")
+    assert pdf_ocr._worker_count() >= 1
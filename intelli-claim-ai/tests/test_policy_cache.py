@@ -0,0 +1,87 @@
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.services.policy_cache import PolicyCache, policy_request_scope, resolve_policy
+
+
+class CountingLoader:
+    def __init__(self, policies, delay=0.0):
+        self.policies = policies
+        self.delay = delay
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, key):
+        with self._lock:
+            self.calls.append(key)
+        time.sleep(self.delay)
+        # Resolves truncated reads the way the fetcher's prefix lookup does.
+        for number, policy in self.policies.items():
+            if number.startswith(key):
+                return dict(policy)
+        return None
+
+
+def test_concurrent_lookups_share_one_load_and_respect_ttl():
+    loader = CountingLoader({"MOT12345678": {"policyNumber": "MOT12345678", "sumInsured": 500000}}, delay=0.05)
+    cache = PolicyCache(loader=loader, ttl_seconds=0.2, negative_ttl_seconds=0.2)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(cache.get, ["MOT-12345678", "mot 12345678"] * 4))
+
+    assert loader.calls == ["MOT12345678"]
+    assert all(result["sumInsured"] == 500000 for result in results)
+    assert cache.stats()["loads"] == 1
+
+    results[0]["sumInsured"] = 1
+    assert cache.get("MOT12345678")["sumInsured"] == 500000
+
+    time.sleep(0.25)
+    cache.get("MOT12345678")
+    assert len(loader.calls) == 2
+
+
+def test_invalidation_covers_fuzzy_resolved_keys_and_misses():
+    policies = {"MOT12345678": {"policyNumber": "MOT12345678", "sumInsured": 500000}}
+    loader = CountingLoader(policies)
+    cache = PolicyCache(loader=loader, ttl_seconds=60, negative_ttl_seconds=60)
+
+    assert cache.get("MOT1234")["policyNumber"] == "MOT12345678"
+    assert cache.get("MOT12345678") is not None
+    assert cache.get("HLT00000001") is None
+    assert len(loader.calls) == 3
+
+    policies["MOT12345678"] = {"policyNumber": "MOT12345678", "sumInsured": 750000}
+    cache.invalidate("MOT-12345678")
+    assert cache.get("MOT1234")["sumInsured"] == 750000
+    assert cache.get("MOT12345678")["sumInsured"] == 750000
+
+    policies["HLT00000001"] = {"policyNumber": "HLT00000001"}
+    assert cache.get("HLT00000001") is None
+    cache.invalidate_misses()
+    assert cache.get("HLT00000001") is not None
+
+
+def test_request_scope_memoizes_across_threads():
+    loader = CountingLoader({"MOT12345678": {"policyNumber": "MOT12345678"}})
+    cache = PolicyCache(loader=loader, ttl_seconds=0, negative_ttl_seconds=0)
+
+    with policy_request_scope(cache):
+        context = copy_context()
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            first, second = pool.map(lambda number: context.copy().run(resolve_policy, number), ["MOT-12345678", "MOT12345678"])
+        assert first == second
+        assert first is not second
+        first["policyNumber"] = "EDITED"
+        assert resolve_policy("MOT12345678")["policyNumber"] == "MOT12345678"
+    assert loader.calls == ["MOT12345678"]
+
+    with policy_request_scope(cache):
+        resolve_policy("MOT12345678")
+    assert len(loader.calls) == 2
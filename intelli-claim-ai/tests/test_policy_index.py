@@ -0,0 +1,115 @@
+import random
+import sys
+import threading
+from pathlib import Path
+
+from rapidfuzz import fuzz, process
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.services.policy_index import PolicyIndexSync, PolicyNumberIndex
+
+
+def _policy_numbers(count, seed=11):
+    rng = random.Random(seed)
+    return [f"{rng.choice(['MOT', 'HLT', 'STAR'])}-{rng.randrange(10**8):08d}" for _ in range(count)]
+
+
+class FakePolicies:
+    def __init__(self, documents):
+        self.documents = documents
+        self.queries = []
+
+    def find(self, query=None, projection=None):
+        self.queries.append(query)
+        return list(self.documents)
+
+
+def test_exact_prefix_and_fuzzy_lookup():
+    numbers = _policy_numbers(5000) + ["MOT-12345678"]
+    index = PolicyNumberIndex(numbers)
+
+    assert index.lookup("mot 12345678").policy_number == "MOT-12345678"
+    assert index.lookup("mot 12345678").kind == "exact"
+    prefix = index.lookup("MOT1234567")
+    assert prefix.kind == "prefix" and prefix.policy_number == "MOT-12345678"
+
+    misread = index.lookup("M0T12345678")  # OCR read O as 0
+    assert misread.kind == "fuzzy" and misread.policy_number == "MOT-12345678"
+
+    keys = [number.replace("-", "") for number in numbers]
+    for query in ["HLT8412X290", "STAR0000001", "MOT7777777Z"]:
+        expected = process.extractOne(query, keys, scorer=fuzz.token_set_ratio, score_cutoff=85)
+        found = index.fuzzy(query, 85)
+        assert (found.score if found else None) == (round(expected[1], 2) if expected else None)
+
+
+def test_write_through_keeps_index_in_sync():
+    index = PolicyNumberIndex(["HLT-00000001"])
+    index.add("HLT-00000002")
+    index.remove("HLT-00000001")
+
+    assert index.exact("HLT00000001") is None
+    assert index.lookup("HLT00000002").kind == "exact"
+    assert index.fuzzy("HLT00000001", 85).policy_number == "HLT-00000002"
+    assert len(index) == 1
+
+
+def test_sync_loads_once_and_applies_changes_without_rescanning():
+    collection = FakePolicies([{"_id": 1, "policyNumber": "MOT-11111111"}, {"_id": 2, "policyNumber": "MOT-22222222"}])
+    sync = PolicyIndexSync(collection)
+
+    assert sync.lookup("MOT11111112").policy_number == "MOT-11111111"
+    assert sync.lookup("HLT99999999") is None
+    assert collection.queries == [{}]  # one load; misses never go back to the collection
+
+    sync.on_created("MOT-33333333", 3)
+    sync._apply_change({"operationType": "update", "documentKey": {"_id": 1}, "fullDocument": {"policyNumber": "MOT-44444444"}})
+    sync._apply_change({"operationType": "delete", "documentKey": {"_id": 2}})
+
+    assert sync.lookup("MOT33333333").kind == "exact"
+    assert sync.lookup("MOT44444444").kind == "exact"
+    assert sync.index.exact("MOT11111111") is None and sync.index.exact("MOT22222222") is None
+
+
+def test_repository_deletes_and_renames_drop_stale_id_mappings():
+    collection = FakePolicies([{"_id": 1, "policyNumber": "MOT-11111111"}, {"_id": 2, "policyNumber": "MOT-22222222"}])
+    sync = PolicyIndexSync(collection)
+    sync.ensure_loaded()
+
+    sync.on_deleted("MOT-11111111")
+    sync.on_renamed("MOT-22222222", "MOT-33333333")
+    assert sync._numbers_by_id == {2: "MOT-33333333"}
+
+    # A later change event for the renamed document removes its current number, not the old one.
+    sync._apply_change({"operationType": "delete", "documentKey": {"_id": 2}})
+    assert sync.index.exact("MOT33333333") is None
+    assert len(sync.index) == 0
+
+
+def test_repository_hooks_and_sync_thread_can_run_together():
+    sync = PolicyIndexSync(FakePolicies([]))
+    sync.ensure_loaded()
+    errors = []
+
+    def sync_thread():
+        try:
+            for i in range(2000):
+                sync._apply_change({"operationType": "insert", "documentKey": {"_id": i}, "fullDocument": {"policyNumber": f"HLT-{i:08d}"}})
+                sync._apply_change({"operationType": "delete", "documentKey": {"_id": i - 1}})
+        except Exception as exc:  # noqa: BLE001
+            errors.append(exc)
+
+    worker = threading.Thread(target=sync_thread)
+    worker.start()
+    try:
+        while worker.is_alive():
+            sync.on_deleted("MOT-00000000")
+            sync.on_renamed("MOT-00000001", "MOT-00000002")
+    except RuntimeError as exc:
+        errors.append(exc)
+    worker.join()
+
+    assert errors == []
+    assert sync._numbers_by_id == {1999: "HLT-00001999"}
+    assert sync._ids_by_number == {"HLT-00001999": {1999}}
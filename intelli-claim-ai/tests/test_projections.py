@@ -0,0 +1,16 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.database.projections import SUMMARY_PROJECTION, ClaimSummaryRow
+from app.services.claim_search import PROJECTION as SEARCH_PROJECTION
+
+
+def test_summary_projection_matches_the_summary_row():
+    projected_fields = {path.split(".")[0] for path, include in SUMMARY_PROJECTION.items() if include}
+    assert projected_fields == set(ClaimSummaryRow.__annotations__)
+    assert SUMMARY_PROJECTION["_id"] == 0
+    # Keyset cursors are built from the returned rows, and ranking reads the search fields.
+    assert {"created_at", "updated_at", "fraud_score", "claim_id"} <= projected_fields
+    assert {path for path in SEARCH_PROJECTION if path != "_id"} <= set(SUMMARY_PROJECTION)
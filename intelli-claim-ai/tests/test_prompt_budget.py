@@ -0,0 +1,68 @@
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.nodes.node1_extraction.text_cleaner import compact_ocr_text
+from app.services import prompt_budget
+from app.services.prompt_budget import PromptBudgetStats, estimate_tokens, fit_text, fit_texts
+
+BILL = """
+--- Page 1 ---
+CITY CARE HOSPITAL, PUNE
++----------------+---------+
+| Consultation   |  500.00 |
+| Consultation   |  500.00 |
++----------------+---------+
+Patient Name:     Neha   Verma
+============================
+--- Page 2 ---
+CITY CARE HOSPITAL, PUNE
+Thank you for choosing us. We wish you a speedy recovery and good health always.
+Total Amount Payable: Rs. 45,000
+Page 2 of 2
+"""
+
+
+def test_compaction_drops_noise_but_keeps_repeated_line_items():
+    compacted = compact_ocr_text(BILL)
+    lines = compacted.splitlines()
+
+    assert "--- Page" not in compacted and "Page 2 of 2" not in compacted
+    assert "|" not in compacted and "====" not in compacted
+    assert lines.count("CITY CARE HOSPITAL, PUNE") == 1
+    assert lines.count("Consultation 500.00") == 2
+    assert "Patient Name: Neha Verma" in lines
+    assert estimate_tokens(compacted) < estimate_tokens(BILL)
+
+
+def test_budget_keeps_field_lines_in_reading_order(monkeypatch):
+    monkeypatch.setattr(prompt_budget, "prompt_budget_stats", PromptBudgetStats())
+    result = fit_text(BILL, "extract_node_1", max_tokens=15)
+
+    assert result.final_tokens <= 15
+    assert result.text.splitlines() == ["Patient Name: Neha Verma", "Total Amount Payable: Rs. 45,000"]
+    assert result.tokens_saved == result.original_tokens - result.final_tokens > 0
+    assert prompt_budget.prompt_budget_stats.snapshot()["extract_node_1"]["trimmed_calls"] == 1
+
+
+def test_long_document_cannot_crowd_out_short_ones():
+    policy = "Policy Number: STAR-HEALTH-2024-88997766"
+    discharge = "\n".join(f"Day {day}: Medication given as per chart, vitals stable." for day in range(200))
+    result = fit_texts([discharge, policy], "global_reconcile", max_tokens=200)
+
+    assert result.final_tokens <= 200
+    assert result.text.endswith(policy)
+
+
+def test_a_single_line_longer_than_the_budget_is_split_not_dropped():
+    filler = "lorem ipsum dolor sit amet " * 400
+    text = f"{filler}Policy Number: STAR-HEALTH-2024-88997766 Total Amount Payable: Rs. 45,000 {filler}"
+    assert "\n" not in text and estimate_tokens(text) > 1000
+
+    kept = prompt_budget.select_lines(text, 100)
+
+    assert 0 < estimate_tokens(kept) <= 100
+    assert "STAR-HEALTH-2024-88997766" in kept and "Rs. 45,000" in kept
+    assert prompt_budget.select_lines("x" * 5000, 10) == "x" * 39
@@ -0,0 +1,37 @@
+import sys
+from pathlib import Path
+
+from langgraph.graph import END, START, StateGraph
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.core.state_schema import ClaimGraphState, merge_node_output
+
+
+def test_merge_node_output_keeps_both_sides():
+    assert merge_node_output({}, {"a": 1}) == {"a": 1}
+    assert merge_node_output({"a": 1}, {}) == {"a": 1}
+    assert merge_node_output({"a": 1, "b": 1}, {"b": 2}) == {"a": 1, "b": 2}
+
+
+def test_parallel_branches_fan_in_without_overwriting():
+    graph = StateGraph(ClaimGraphState)
+    graph.add_node("node1", lambda state: {"node1_output": {"documents": 2}})
+    graph.add_node("node2", lambda state: {"node2_output": {"valid": True}, "node5_output": {"from_node2": True}})
+    graph.add_node("node3", lambda state: {"node3_output": {"covered": True}, "node5_output": {"from_node3": True}})
+    graph.add_node("node4", lambda state: {"node4_output": {"fraud_score": 0.1}})
+    graph.add_node("node8", lambda state: {"node8_output": {"recoverable": False}})
+    graph.add_node("join", lambda state: {"node7_output": {"seen": sorted(k for k, v in state.items() if v)}})
+    graph.add_edge(START, "node1")
+    for branch in ("node2", "node3", "node4", "node8"):
+        graph.add_edge("node1", branch)
+    graph.add_edge(["node2", "node3", "node4", "node8"], "join")
+    graph.add_edge("join", END)
+
+    state = graph.compile().invoke({"claim_id": "CLM-1", "node1_output": {}, "node5_output": {"seeded": True}})
+
+    # Two branches updated node5_output in the same step; both updates and the seed survive.
+    assert state["node5_output"] == {"seeded": True, "from_node2": True, "from_node3": True}
+    assert state["node7_output"]["seen"] == [
+        "claim_id", "node1_output", "node2_output", "node3_output", "node4_output", "node5_output", "node8_output",
+    ]
@@ -0,0 +1,68 @@
+import asyncio
+import io
+import os
+import sys
+from pathlib import Path
+
+import pytest
+from starlette.datastructures import UploadFile
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.services.document_store import DocumentStore
+from app.services.uploads import UploadRejectedError, UploadSession
+
+PDF_BYTES = b"%PDF-1.7\n" + b"0" * 5000
+
+
+class RecordingFile(io.BytesIO):
+    def __init__(self, data):
+        super().__init__(data)
+        self.read_sizes = []
+
+    def read(self, size=-1):
+        self.read_sizes.append(size)
+        return super().read(size)
+
+
+def _upload(data, filename, declare_size=True):
+    return UploadFile(file=RecordingFile(data), filename=filename, size=len(data) if declare_size else None)
+
+
+def test_identical_uploads_share_one_stored_file(tmp_path):
+    session = UploadSession(DocumentStore(str(tmp_path)), chunk_size=1024)
+    first = asyncio.run(session.store(_upload(PDF_BYTES, "policy.pdf")))
+    second = asyncio.run(session.store(_upload(PDF_BYTES, "policy_copy.pdf")))
+
+    assert first.path == second.path
+    assert not first.deduplicated and second.deduplicated
+    assert Path(first.path).read_bytes() == PDF_BYTES
+    assert os.listdir(tmp_path / "blobs" / first.sha256[:2]) == [f"{first.sha256}.pdf"]
+
+
+def test_file_is_read_in_bounded_chunks(tmp_path):
+    upload = _upload(PDF_BYTES, "policy.pdf")
+    asyncio.run(UploadSession(DocumentStore(str(tmp_path)), chunk_size=1024).store(upload))
+
+    assert max(upload.file.read_sizes) == 1024
+
+
+def test_oversized_and_mislabelled_files_are_rejected_early(tmp_path):
+    session = UploadSession(DocumentStore(str(tmp_path)), max_file_bytes=2048, chunk_size=1024)
+
+    declared = _upload(PDF_BYTES, "big.pdf")
+    with pytest.raises(UploadRejectedError) as exc:
+        asyncio.run(session.store(declared))
+    assert exc.value.status_code == 413
+    assert declared.file.read_sizes == []
+
+    undeclared = _upload(PDF_BYTES, "big.pdf", declare_size=False)
+    with pytest.raises(UploadRejectedError):
+        asyncio.run(session.store(undeclared))
+    assert len(undeclared.file.read_sizes) == 3
+
+    with pytest.raises(UploadRejectedError) as exc:
+        asyncio.run(session.store(_upload(b"MZ\x90\x00" * 10, "scan.jpg")))
+    assert exc.value.status_code == 415
+    assert os.listdir(tmp_path / "incoming") == []
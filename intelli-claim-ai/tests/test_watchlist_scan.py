@@ -0,0 +1,50 @@
+import json
+import random
+import string
+import sys
+from pathlib import Path
+
+from rapidfuzz import fuzz
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.nodes.node4_fraud_detection import watchlist_scan
+from app.nodes.node4_fraud_detection.watchlist_scan import WatchlistIndex, normalize_name, watchlist_hits, watchlist_match
+
+
+def _random_names(count, seed=3):
+    rng = random.Random(seed)
+    first = ["NEHA", "RAJESH", "AMIT", "PRIYA", "JOHN", "MARIA", "AHMED", "OLGA", "RAVI"]
+    last = ["VERMA", "SHARMA", "KUMAR", "PATEL", "SMITH", "KHAN", "GARCIA", "REDDY"]
+    return [
+        f"{rng.choice(first)} {''.join(rng.choice(string.ascii_uppercase) for _ in range(rng.randint(2, 6)))} {rng.choice(last)}"
+        for _ in range(count)
+    ]
+
+
+def test_index_returns_exactly_the_full_scan_hits():
+    names = _random_names(3000) + ["NEHA PRAKASH VERMA", "VERMA NEHA PRAKASH", "NEHA P VERMA"]
+    index = WatchlistIndex(names)
+
+    for query in ["Neha Prakash Verma", "neha prakesh verma", "Verma, Neha", names[10], names[20][:-1]]:
+        canonical = normalize_name(query)
+        expected = sorted(name for name, other in zip(index.names, index.canonical) if fuzz.ratio(canonical, other) > 85)
+        hits = index.search(query, 85)
+        assert sorted(hit.name for hit in hits) == expected
+        assert [hit.score for hit in hits] == sorted((hit.score for hit in hits), reverse=True)
+
+
+def test_reloads_when_a_watchlist_file_changes(tmp_path, monkeypatch):
+    monkeypatch.setenv("WATCHLIST_DIR", str(tmp_path))
+    monkeypatch.setenv("WATCHLIST_RELOAD_CHECK_SECONDS", "0")
+    monkeypatch.setattr(watchlist_scan, "_watchlist_cache", watchlist_scan._WatchlistCache())
+    (tmp_path / "sanctions.txt").write_text("Rajesh Kumar Sharma\n\n", encoding="utf-8")
+
+    assert watchlist_match("RAJESH KUMAR SHARMA") == (True, "RAJESH KUMAR SHARMA")
+    assert watchlist_match("Priya Iyer") == (False, None)
+
+    listed = tmp_path / "pep.json"
+    listed.write_text(json.dumps(["Priya Iyer", "Priya  Iyer.", "Priya Iyre"]), encoding="utf-8")
+    hits = watchlist_hits("priya iyer")
+    assert [hit.name for hit in hits] == ["PRIYA IYER", "PRIYA IYRE"]
+    assert hits[0].score == 100
@@ -0,0 +1,54 @@
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.core.workflow_registry import WorkflowRegistry
+
+
+class CountingBuilder:
+    def __init__(self):
+        self.calls = 0
+        self.fail = False
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        if self.fail:
+            raise ValueError("bad graph config")
+        with self._lock:
+            self.calls += 1
+            return f"graph-{self.calls}", f"async-graph-{self.calls}"
+
+
+def test_graph_is_compiled_once_for_concurrent_callers():
+    builder = CountingBuilder()
+    registry = WorkflowRegistry(builder)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        workflows = list(pool.map(lambda _: registry.get(), range(64)))
+
+    assert builder.calls == 1
+    assert {workflow.version for workflow in workflows} == {1}
+    assert {workflow.graph for workflow in workflows} == {"graph-1"}
+
+
+def test_reload_bumps_the_version_and_swaps_both_graphs():
+    builder = CountingBuilder()
+    registry = WorkflowRegistry(builder)
+    in_flight = registry.get()
+
+    reloaded = registry.reload()
+
+    assert (reloaded.version, reloaded.graph, reloaded.async_graph) == (2, "graph-2", "async-graph-2")
+    assert registry.get() is reloaded
+    # A claim that started before the reload keeps the graph it took.
+    assert (in_flight.version, in_flight.graph) == (1, "graph-1")
+
+    builder.fail = True
+    with pytest.raises(ValueError):
+        registry.reload()
+    assert registry.get() is reloaded